@@ -13,6 +13,10 @@ try:
 except ImportError:
     _STEALTH = None
 
+# Raw text cap per article; the scoring prompt takes a token-budgeted
+# selection of it (scoring/salient.py)
+MAX_ARTICLE_CHARS = 20000
+
 
 def _extension_path() -> str:
     """Find the bypass-paywalls extension directory."""
@@ -184,6 +188,11 @@ class ArticleBrowser:
         self._accept_cookies()
 
         text = self._page.evaluate("""() => {
+            // Collapse spaces but keep one line break between paragraphs
+            const tidy = t => t.trim()
+                .replace(/[ \\t\\u00a0]+/g, ' ')
+                .replace(/ *\\n\\s*/g, '\\n');
+
             // Remove clutter
             for (const sel of ['header', 'footer', 'nav', 'aside',
                                 '[class*="cookie"]', '[class*="paywall"]',
@@ -204,13 +213,13 @@ class ArticleBrowser:
             for (const sel of containers) {
                 const el = document.querySelector(sel);
                 if (el && el.innerText.trim().length > 300) {
-                    return el.innerText.trim().replace(/\\s+/g, ' ');
+                    return tidy(el.innerText);
                 }
             }
             // Fallback: body text
-            return document.body.innerText.trim().replace(/\\s+/g, ' ');
+            return tidy(document.body.innerText);
         }""")
-        return (text or "")[:6000]
+        return (text or "")[:MAX_ARTICLE_CHARS]
 
     def close(self):
         self._context.close()
@@ -4,6 +4,11 @@ Agent-based news curator for Samfundsfag A.
 Two-pass approach:
   1. Skim: LLM looks at all headlines and picks promising ones
   2. Deep-read: Browser opens each candidate; LLM reads full text and scores
+
+By default each site is skimmed and read in turn. In global mode
+(agent.mode: global) all front pages are collected first, skimmed across
+sites with a relevance score, and candidates are read best first until the
+run budget is spent.
 """
 
 import os
@@ -15,27 +20,274 @@ from pathlib import Path
 from rich.console import Console
 
 from samfkurator.agent.browser import ArticleBrowser
+from samfkurator.config import AgentConfig, AIConfig
 from samfkurator.db import Database
 from samfkurator.models import Article
-from samfkurator.scoring.prompt import parse_scoring_response
+from samfkurator.scoring.budget import RunBudget
+from samfkurator.scoring.cache import ResponseCache
+from samfkurator.scoring.prefilter import Prefilter, audited
+from samfkurator.scoring.registry import create_backend
+from samfkurator.scoring.resilience import health_report
+from samfkurator.scoring.salient import SourceBoilerplate
+from samfkurator.scoring.telemetry import CallRecorder
+from samfkurator.scoring.skim import (
+    SKIM_CACHE_TTL_DAYS,
+    rank_headlines,
+    skim_headlines,
+)
 
 LOG_PATH = Path(os.environ.get("SCRAPING_LOG_PATH", "./scraping.log"))
 
 
-def _create_backend(backend_name: str):
-    """Instantiate the chosen AI backend."""
-    if backend_name == "gemini":
-        from samfkurator.scoring.gemini_backend import GeminiBackend
-        return GeminiBackend()
-    elif backend_name == "deepseek":
-        from samfkurator.scoring.deepseek_backend import DeepSeekBackend
-        return DeepSeekBackend()
-    elif backend_name == "claude":
-        from samfkurator.scoring.claude_backend import ClaudeBackend
-        return ClaudeBackend()
-    else:
-        from samfkurator.scoring.ollama_backend import OllamaBackend
-        return OllamaBackend()
+def _collect_headlines(
+    browser: ArticleBrowser,
+    site: dict,
+    console: Console,
+    log_lines: list[str],
+    run_date: str,
+) -> list[dict]:
+    """Front-page headlines tagged with their site; logs empty or failed
+    front pages."""
+    name, url = site["name"], site["url"]
+    try:
+        headlines = browser.get_headlines(url)
+    except Exception as e:
+        console.print(f"  [red]Kunne ikke hente {url}: {e}[/red]")
+        log_lines.append(
+            f"{run_date} | {name} {url} | FEJL: {e}"
+        )
+        return []
+
+    if not headlines:
+        console.print(f"  [dim]Ingen overskrifter fundet på {name}[/dim]")
+        log_lines.append(
+            f"{run_date} | {name} {url} | 0 overskrifter | 0 kandidater | 0 gemt"
+        )
+        return []
+
+    for h in headlines:
+        h["source"] = name
+        h["site_url"] = url
+        h["language"] = site.get("language", "da")
+    return headlines
+
+
+def _filter_candidates(
+    candidates: list[dict],
+    db: Database,
+    console: Console,
+    prefilter: Prefilter | None,
+    prefilter_audit_rate: float,
+) -> list[dict]:
+    """Drop already-scored or batch-pending candidates and, with a
+    prefilter, those below its threshold (except an audit share)."""
+    candidates = [
+        c for c in candidates
+        if not db.has_score(c["url"]) and not db.is_batch_pending(c["url"])
+    ]
+    if prefilter is not None:
+        before = len(candidates)
+        candidates = [
+            c for c in candidates
+            if prefilter.passes(Article(
+                url=c["url"], title=c["title"], source_name=c["source"],
+                summary=c.get("teaser", ""),
+            ))
+            or audited(c["url"], prefilter_audit_rate)
+        ]
+        console.print(
+            f"  [dim]Forfilter: {before - len(candidates)} "
+            "kandidater sprunget over[/dim]"
+        )
+    return candidates
+
+
+def _read_candidates(
+    browser: ArticleBrowser, candidates: list[dict], console: Console
+) -> list[Article]:
+    """Open each candidate in the browser, with polite delays between."""
+    articles: list[Article] = []
+    for i, candidate in enumerate(candidates):
+        art_url = candidate["url"]
+        title = candidate["title"]
+
+        # Random delay between articles (skip before first)
+        if i > 0:
+            delay = random.uniform(4.0, 10.0)
+            console.print(f"  [dim]Venter {delay:.1f}s...[/dim]")
+            time.sleep(delay)
+
+        console.print(f"  [dim]Læser:[/dim] {title[:70]}...")
+
+        try:
+            full_text = browser.read_article(art_url)
+        except Exception as e:
+            console.print(f"    [yellow]Kunne ikke læse: {e}[/yellow]")
+            continue
+
+        if len(full_text) < 200:
+            console.print("    [dim]For lidt tekst - springer over[/dim]")
+            continue
+
+        now = datetime.now()
+        articles.append(Article(
+            url=art_url,
+            title=title,
+            source_name=candidate["source"],
+            summary=candidate.get("teaser", ""),
+            full_text=full_text,
+            language=candidate["language"],
+            has_paywall=False,  # bypass-paywalls handles it
+            published=now,
+            fetched_at=now,
+        ))
+    return articles
+
+
+def _score_and_save(
+    backend,
+    articles: list[Article],
+    db: Database,
+    console: Console,
+    min_score: int,
+    batch_queue: list[Article] | None,
+) -> list[Article]:
+    """Score articles (or queue them for batch scoring); save and return
+    those at or above min_score."""
+    if batch_queue is not None:
+        batch_queue.extend(articles)
+        console.print(
+            f"  [dim]{len(articles)} artikler sat i kø til batch-scoring[/dim]"
+        )
+        return []
+
+    saved: list[Article] = []
+    for article, result in backend.score_many(articles):
+        if result is None:
+            console.print(
+                f"    [yellow]Scoring fejlede:[/yellow] {article.title[:60]}"
+            )
+            continue
+
+        score = result.overall_score
+        discipline = result.primary_discipline
+
+        if score >= min_score:
+            db.save_article(article)
+            db.save_score(result)
+            saved.append(article)
+            console.print(
+                f"    [green]✓ Score {score}/10 [{discipline}][/green] "
+                f"{article.title[:50]} — gemmes"
+            )
+        else:
+            console.print(
+                f"    [dim]✗ Score {score}/10 {article.title[:50]} "
+                "— ikke relevant nok[/dim]"
+            )
+    return saved
+
+
+def _run_global(
+    agent_sites: list[dict],
+    browser: ArticleBrowser,
+    backend,
+    db: Database,
+    console: Console,
+    log_lines: list[str],
+    run_date: str,
+    backend_name: str,
+    min_score: int,
+    batch_queue: list[Article] | None,
+    prefilter: Prefilter | None,
+    prefilter_audit_rate: float,
+    skim_cache_ttl_days: int,
+    skim_batch_tokens: int,
+    budget: RunBudget,
+) -> int:
+    """Global mode: collect every front page, skim across sites with
+    relevance scores, then read and score candidates best first until
+    `budget` is spent. Returns number of articles saved."""
+    # By URL: a story linked from several front pages is read once, from
+    # the first site that had it
+    headlines: dict[str, dict] = {}
+    for i, site in enumerate(agent_sites):
+        if i > 0:
+            site_delay = random.uniform(15.0, 30.0)
+            console.print(f"  [dim]Pause mellem sites: {site_delay:.0f}s[/dim]")
+            time.sleep(site_delay)
+        console.print(f"\n[bold cyan]Henter forside: {site['name']}...[/bold cyan]")
+        site_headlines = _collect_headlines(browser, site, console, log_lines, run_date)
+        console.print(f"  Fandt {len(site_headlines)} overskrifter")
+        for h in site_headlines:
+            headlines.setdefault(h["url"], h)
+    if not headlines:
+        return 0
+
+    console.print(
+        f"\n[bold]Skimmer {len(headlines)} overskrifter på tværs af sites...[/bold]"
+    )
+    ranked, sent = rank_headlines(
+        list(headlines.values()), backend, db,
+        backend_name=backend_name,
+        ttl_days=skim_cache_ttl_days,
+        batch_tokens=skim_batch_tokens,
+    )
+    console.print(
+        f"  [dim]{len(headlines) - sent} overskrifter kendt fra tidligere "
+        f"kørsler, {sent} sendt til LLM[/dim]"
+    )
+    relevance = {h["url"]: r for h, r in ranked}
+    candidates = _filter_candidates(
+        [h for h, _ in ranked], db, console, prefilter, prefilter_audit_rate
+    )
+    console.print(f"  [green]{len(candidates)} kandidater i alt[/green]")
+
+    # Read in rank order, in groups the backend can score at once, and
+    # stop starting new groups when the budget is spent
+    group_size = max(1, backend.max_concurrency) * max(1, backend.pack_size)
+    saved: list[Article] = []
+    done = 0
+    stopped = None
+    while done < len(candidates):
+        stopped = budget.exhausted(backend)
+        if stopped:
+            break
+        group = candidates[done:done + group_size]
+        console.print(
+            f"\n[bold cyan]Læser kandidat {done + 1}-{done + len(group)} "
+            f"(relevans {relevance[group[0]['url']]}-{relevance[group[-1]['url']]})"
+            "[/bold cyan]"
+        )
+        articles = _read_candidates(browser, group, console)
+        saved += _score_and_save(
+            backend, articles, db, console, min_score, batch_queue
+        )
+        done += len(group)
+
+    if stopped:
+        console.print(
+            f"[yellow]Budget brugt ({stopped}): {len(candidates) - done} "
+            "kandidater ikke læst[/yellow]"
+        )
+    log_lines.append(
+        f"{run_date} | BUDGET | {budget.summary(backend)} | "
+        f"{done}/{len(candidates)} kandidater læst"
+        + (f" | stoppet: {stopped}" if stopped else "")
+    )
+
+    for site in agent_sites:
+        site_headlines = [h for h in headlines if h["site_url"] == site["url"]]
+        if not site_headlines:
+            continue
+        n_candidates = sum(c["site_url"] == site["url"] for c in candidates)
+        n_saved = sum(
+            h["url"] in {a.url for a in saved} for h in site_headlines
+        )
+        log_lines.append(
+            f"{run_date} | {site['name']} {site['url']} | {len(site_headlines)} overskrifter | {n_candidates} kandidater | {n_saved} gemt"
+        )
+    return len(saved)
 
 
 def run_agent(
@@ -48,6 +300,15 @@ def run_agent(
     headless: bool = True,
     executable_path: str | None = None,
     user_data_dir: str = "/tmp/samfkurator-browser-profile",
+    ai_config: AIConfig | None = None,
+    batch_queue: list[Article] | None = None,
+    llm_cache: ResponseCache | None = None,
+    prefilter: Prefilter | None = None,
+    prefilter_audit_rate: float = 0.0,
+    skim_cache_ttl_days: int = SKIM_CACHE_TTL_DAYS,
+    agent_config: AgentConfig | None = None,
+    telemetry: CallRecorder | None = None,
+    boilerplate: SourceBoilerplate | None = None,
 ) -> int:
     """
     Run the agent on a list of news sites.
@@ -56,6 +317,23 @@ def run_agent(
 
     headless=False + executable_path → lokal Brave/Chrome (omgår Cloudflare IP-blokering)
 
+    batch_queue: if given, read articles are appended here for batch
+    scoring (see scoring/batch.py) instead of being scored now.
+
+    llm_cache: response cache shared with the caller (None = always call
+    the LLM).
+
+    prefilter: local relevance model; skim candidates below its threshold
+    are not read or scored (except a `prefilter_audit_rate` share).
+
+    skim_cache_ttl_days: how long a stored skim decision is reused for an
+    unchanged headline (see scoring/skim.py).
+
+    agent_config: "per_site" (default) or "global" mode and the run budget
+    for global mode (see config.AgentConfig).
+
+    telemetry: records every LLM call in llm_calls (see scoring/telemetry.py).
+
     Returns number of articles saved.
     """
     if console is None:
@@ -69,138 +347,105 @@ def run_agent(
         )
         time.sleep(delay)
 
-    backend = _create_backend(backend_name)
+    backend = create_backend(
+        backend_name, ai_config, llm_cache, telemetry, boilerplate
+    )
+    backend.warm_up()
+    if backend.cascade:
+        backend.cascade.fast.warm_up()
     saved = 0
     run_date = datetime.now().strftime("%Y-%m-%d %H:%M")
     log_lines: list[str] = []
+    agent = agent_config or AgentConfig()
+    budget = RunBudget(
+        agent.budget_minutes * 60, agent.budget_calls, agent.budget_tokens
+    ).start(backend)
 
     with ArticleBrowser(
         headless=headless,
         executable_path=executable_path,
         user_data_dir=user_data_dir,
     ) as browser:
-        for site in agent_sites:
-            name = site["name"]
-            url = site["url"]
-            language = site.get("language", "da")
-
-            console.print(f"\n[bold cyan]Skimmer {name}...[/bold cyan]")
-
-            # ── Pass 1: Skim headlines ────────────────────────────────────────
-            try:
-                headlines = browser.get_headlines(url)
-            except Exception as e:
-                console.print(f"  [red]Kunne ikke hente {url}: {e}[/red]")
-                log_lines.append(
-                    f"{run_date} | {name} {url} | FEJL: {e}"
-                )
-                continue
-
-            if not headlines:
-                console.print(f"  [dim]Ingen overskrifter fundet på {name}[/dim]")
-                log_lines.append(
-                    f"{run_date} | {name} {url} | 0 overskrifter | 0 kandidater | 0 gemt"
-                )
-                continue
-
-            console.print(f"  Fandt {len(headlines)} overskrifter. Filtrerer med LLM...")
+        if agent.mode == "global":
+            saved = _run_global(
+                agent_sites, browser, backend, db, console, log_lines, run_date,
+                backend_name=backend_name,
+                min_score=min_score,
+                batch_queue=batch_queue,
+                prefilter=prefilter,
+                prefilter_audit_rate=prefilter_audit_rate,
+                skim_cache_ttl_days=skim_cache_ttl_days,
+                skim_batch_tokens=agent.skim_batch_tokens,
+                budget=budget,
+            )
+        else:
+            for site in agent_sites:
+                name = site["name"]
+                url = site["url"]
 
-            # LLM picks which headlines are worth reading
-            if hasattr(backend, "skim"):
-                try:
-                    indices = backend.skim(headlines)
-                except Exception:
-                    indices = list(range(len(headlines)))
-            else:
-                indices = list(range(len(headlines)))
+                console.print(f"\n[bold cyan]Skimmer {name}...[/bold cyan]")
 
-            candidates = [headlines[i] for i in indices if i < len(headlines)]
-            # Filter already-scored
-            candidates = [c for c in candidates if not db.has_score(c["url"])]
+                # ── Pass 1: Skim headlines ────────────────────────────────────
+                headlines = _collect_headlines(browser, site, console, log_lines, run_date)
+                if not headlines:
+                    continue
 
-            console.print(
-                f"  [green]{len(candidates)} kandidater valgt[/green] "
-                f"(af {len(headlines)} overskrifter)"
-            )
+                console.print(f"  Fandt {len(headlines)} overskrifter. Filtrerer med LLM...")
 
-            if not candidates:
-                log_lines.append(
-                    f"{run_date} | {name} {url} | {len(headlines)} overskrifter | 0 kandidater | 0 gemt"
+                # LLM picks which headlines are worth reading; headlines seen on
+                # an earlier run keep their decision
+                indices, sent = skim_headlines(
+                    headlines, backend, db, name,
+                    backend_name=backend_name, ttl_days=skim_cache_ttl_days,
+                )
+                console.print(
+                    f"  [dim]{len(headlines) - sent} overskrifter kendt fra "
+                    f"tidligere kørsler, {sent} sendt til LLM[/dim]"
                 )
-                continue
-
-            # ── Pass 2: Deep-read each candidate ─────────────────────────────
-            site_saved = 0
-            for i, candidate in enumerate(candidates):
-                art_url = candidate["url"]
-                title = candidate["title"]
-
-                # Random delay between articles (skip before first)
-                if i > 0:
-                    delay = random.uniform(4.0, 10.0)
-                    console.print(f"  [dim]Venter {delay:.1f}s...[/dim]")
-                    time.sleep(delay)
-
-                console.print(f"  [dim]Læser:[/dim] {title[:70]}...")
-
-                try:
-                    full_text = browser.read_article(art_url)
-                except Exception as e:
-                    console.print(f"    [yellow]Kunne ikke læse: {e}[/yellow]")
-                    continue
-
-                if len(full_text) < 200:
-                    console.print("    [dim]For lidt tekst - springer over[/dim]")
-                    continue
 
-                now = datetime.now()
-                article = Article(
-                    url=art_url,
-                    title=title,
-                    source_name=name,
-                    summary=candidate.get("teaser", ""),
-                    full_text=full_text,
-                    language=language,
-                    has_paywall=False,  # bypass-paywalls handles it
-                    published=now,
-                    fetched_at=now,
+                candidates = _filter_candidates(
+                    [headlines[i] for i in indices if i < len(headlines)],
+                    db, console, prefilter, prefilter_audit_rate,
                 )
 
-                result = backend.score_article(article)
+                console.print(
+                    f"  [green]{len(candidates)} kandidater valgt[/green] "
+                    f"(af {len(headlines)} overskrifter)"
+                )
 
-                if result is None:
-                    console.print("    [yellow]Scoring fejlede[/yellow]")
+                if not candidates:
+                    log_lines.append(
+                        f"{run_date} | {name} {url} | {len(headlines)} overskrifter | 0 kandidater | 0 gemt"
+                    )
                     continue
 
-                score = result.overall_score
-                discipline = result.primary_discipline
+                # ── Pass 2: Deep-read each candidate ─────────────────────────
+                # The browser reads serially; scoring then runs concurrently
+                articles = _read_candidates(browser, candidates, console)
+                site_saved = len(_score_and_save(
+                    backend, articles, db, console, min_score, batch_queue
+                ))
+                saved += site_saved
 
-                if score >= min_score:
-                    db.save_article(article)
-                    db.save_score(result)
-                    saved += 1
-                    site_saved += 1
-                    console.print(
-                        f"    [green]✓ Score {score}/10 [{discipline}][/green] — gemmes"
-                    )
-                else:
-                    console.print(
-                        f"    [dim]✗ Score {score}/10 — ikke relevant nok[/dim]"
-                    )
-
-            log_lines.append(
-                f"{run_date} | {name} {url} | {len(headlines)} overskrifter | {len(candidates)} kandidater | {site_saved} gemt"
-            )
+                log_lines.append(
+                    f"{run_date} | {name} {url} | {len(headlines)} overskrifter | {len(candidates)} kandidater | {site_saved} gemt"
+                )
 
-            # Pause between sites
-            site_delay = random.uniform(15.0, 30.0)
-            console.print(f"  [dim]Pause mellem sites: {site_delay:.0f}s[/dim]")
-            time.sleep(site_delay)
+                # Pause between sites
+                site_delay = random.uniform(15.0, 30.0)
+                console.print(f"  [dim]Pause mellem sites: {site_delay:.0f}s[/dim]")
+                time.sleep(site_delay)
 
     # Write log
     log_lines.append(
         f"{run_date} | TOTAL | {saved} artikler gemt i alt"
     )
+    log_lines.append(f"{run_date} | TOKENS | {backend.usage.summary()}")
+    log_lines += [f"{run_date} | BACKEND | {line}" for line in health_report(backend)]
+    if backend.cascade:
+        log_lines.append(f"{run_date} | KASKADE | {backend.cascade.stats.summary()}")
+    if telemetry:
+        log_lines.append(f"{run_date} | LLM-KALD | {telemetry.summary()}")
     try:
         LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
         with LOG_PATH.open("a", encoding="utf-8") as f:
@@ -212,4 +457,9 @@ def run_agent(
     console.print(
         f"\n[bold green]Agent færdig. {saved} artikler gemt.[/bold green]"
     )
+    console.print(f"[dim]Tokens: {backend.usage.summary()}[/dim]")
+    for line in health_report(backend):
+        console.print(f"[dim]Backend {line}[/dim]")
+    if backend.cascade:
+        console.print(f"[dim]Kaskade: {backend.cascade.stats.summary()}[/dim]")
     return saved
@@ -1,41 +1,191 @@
 import argparse
 
 from rich.console import Console
-from rich.progress import Progress
 
 from samfkurator.config import load_config
-from samfkurator.db import Database
-from samfkurator.output.daily import display_daily, select_daily
-from samfkurator.output.export import export_csv, export_json
-from samfkurator.output.terminal import display_results
-from samfkurator.sources.extractors import extract_full_text
-from samfkurator.sources.rss import fetch_all_sources
-
-
-def _create_backend(config, backend_name: str):
-    """Create the appropriate AI scoring backend."""
-    if backend_name == "claude":
-        from samfkurator.scoring.claude_backend import ClaudeBackend
-
-        return ClaudeBackend(config.ai.claude.model)
-    else:
-        from samfkurator.scoring.ollama_backend import OllamaBackend
-
-        return OllamaBackend(
-            config.ai.ollama.base_url,
-            config.ai.ollama.model,
-            config.ai.ollama.temperature,
+from samfkurator.db import SYNC_COLUMNS, Database
+from samfkurator.scoring.registry import BACKEND_NAMES
+
+# Everything else is imported where it is used: `daily --cached`, `stats`
+# and `web` never touch feedparser, trafilatura or rich.progress, and cron
+# starts these commands many times a day (scripts/check_importtime.py)
+
+
+def _deadline(value):
+    """argparse type for --deadline: "HH:MM"."""
+    from samfkurator.scoring.budget import time_of_day
+
+    try:
+        time_of_day(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def _open_llm_cache(args, config):
+    """Open the LLM response cache unless disabled by config or --no-llm-cache."""
+    if not config.scoring.llm_cache or getattr(args, "no_llm_cache", False):
+        return None
+    from samfkurator.scoring.cache import ResponseCache
+
+    return ResponseCache(
+        config.database.path,
+        ttl_days=config.scoring.llm_cache_ttl_days,
+        max_entries=config.scoring.llm_cache_max_entries,
+    )
+
+
+def _open_telemetry(config):
+    """Open the per-call LLM log (table llm_calls) unless disabled in config."""
+    if not config.scoring.telemetry:
+        return None
+    from samfkurator.scoring.telemetry import CallRecorder
+
+    return CallRecorder(config.database.path, prices=config.ai.prices)
+
+
+def _load_prefilter(config, console):
+    """Load the trained pre-filter if enabled in config (else None)."""
+    if not config.scoring.prefilter:
+        return None
+    from samfkurator.scoring.prefilter import Prefilter
+
+    model = Prefilter.load(config.scoring.prefilter_path)
+    if model is None:
+        console.print(
+            "[yellow]Forfilter slået til, men ingen model fundet – kør "
+            "samfkurator train-prefilter[/yellow]"
         )
+    return model
 
 
-def _fetch_and_score(args, config, db, console):
-    """Fetch new articles and score them."""
-    # 1. Fetch RSS feeds
+def _update_prefilter(model, config, db, console):
+    """Train the pre-filter further on scores that arrived this run."""
+    from samfkurator.scoring.prefilter import update
+
+    report = update(model, db)
+    if report:
+        model.save(config.scoring.prefilter_path)
+        console.print(
+            f"[dim]Forfilter opdateret med {report['examples']} nye scores "
+            f"(recall før opdatering: {report['recall']})[/dim]"
+        )
+
+
+def _train_prefilter(args, config, db, console):
+    from rich.table import Table
+
+    from samfkurator.scoring.prefilter import Prefilter, train, update
+
+    path = config.scoring.prefilter_path
+    min_score = config.scoring.min_score_to_display
+    skim_negatives = not args.no_skim_negatives
+
+    model = Prefilter.load(path) if args.incremental else None
+    if args.incremental and model is None:
+        console.print("[yellow]Ingen eksisterende model – træner forfra.[/yellow]")
+    try:
+        if model:
+            if not update(model, db, args.epochs or 3, skim_negatives):
+                console.print("[dim]Ingen nye scores siden sidste træning.[/dim]")
+                return
+        else:
+            model = train(
+                db,
+                min_score,
+                target_recall=args.target_recall
+                or config.scoring.prefilter_target_recall,
+                epochs=args.epochs or 10,
+                skim_negatives=skim_negatives,
+            )
+    except ValueError as e:
+        console.print(f"[red bold]{e}[/red bold]")
+        return
+    model.save(path)
+
+    report = model.report
+    validation = report.get("validation", {})
+    table = Table(title=f"Forfilter ({report['mode']}) – score ≥ {min_score}")
+    table.add_column("Mål")
+    table.add_column("Værdi", justify="right")
+    table.add_row("Træningseksempler", str(report["train_examples"]))
+    table.add_row("Evalueret på", f"{validation.get('examples', 0)} nyeste")
+    table.add_row("Tærskel", f"{model.threshold:.3f}")
+    table.add_row("Recall", str(validation.get("recall")))
+    table.add_row("Præcision", str(validation.get("precision")))
+    table.add_row(
+        "LLM-kald sparet",
+        f"{validation.get('llm_calls_saved', 0)} "
+        f"({validation.get('llm_calls_saved_share') or 0:.0%})",
+    )
+    table.add_row("Relevante tabt", str(validation.get("relevant_missed", 0)))
+    console.print(table)
+    console.print(f"[dim]Gemt i {path}[/dim]")
+    if not config.scoring.prefilter:
+        console.print(
+            "[dim]Slå forfilteret til med scoring.prefilter: true i config.yaml[/dim]"
+        )
+
+
+def _show_stats(args, config, console):
+    from datetime import datetime, timedelta
+
+    from samfkurator.output.stats import display_stats
+    from samfkurator.scoring.telemetry import call_stats
+
+    since = "" if args.run else (
+        datetime.now() - timedelta(days=args.days)
+    ).isoformat()
+    stats = call_stats(config.database.path, since, args.run)
+    display_stats(stats, console, args.runs)
+
+
+def _collect_batches(args, config, db, console, boilerplate=None):
+    """Collect finished batch jobs; return the batch provider (or None)."""
+    from samfkurator.scoring.batch import collect_batches, create_batch_provider
+
+    backend_name = args.backend or config.ai.backend
+    try:
+        provider = create_batch_provider(backend_name, config.ai, boilerplate)
+    except ValueError as e:
+        console.print(f"[red bold]{e}[/red bold]")
+        return None
+
+    console.print(f"[bold]Henter færdige batch-jobs ({backend_name})...[/bold]")
+    stats = collect_batches(db, provider, backend_name)
+    console.print(
+        f"[green]{stats['jobs']} batch-jobs færdige: {stats['scored']} scoret[/green]"
+        + (f", {stats['dropped']} under min-score" if stats["dropped"] else "")
+        + (f" [yellow]({stats['failed']} fejlede)[/yellow]" if stats["failed"] else "")
+        + (f" [dim]· {stats['pending']} jobs kører stadig[/dim]" if stats["pending"] else "")
+    )
+    return provider
+
+
+def _submit_batch(provider, db, backend_name, articles, console, min_score=0):
+    from samfkurator.scoring.batch import submit_batch
+
+    job_id = submit_batch(db, provider, backend_name, articles, min_score)
+    if job_id:
+        console.print(
+            f"Sendt {len(articles)} artikler som batch-job [bold]{job_id}[/bold] "
+            "[dim](resultater hentes ved næste kørsel med --batch)[/dim]"
+        )
+
+
+def _fetch_articles(config, db, console, save_validators=True):
+    """Articles from the RSS feeds and the BeautifulSoup scrape sources.
+
+    Without `save_validators` sitemaps are fetched unconditionally and their
+    ETag/Last-Modified aren't stored, so the next run still sees them as
+    changed (for `estimate`)."""
+    from samfkurator.sources.rss import fetch_all_sources
+
     console.print("[bold]Henter nyheder fra RSS feeds...[/bold]")
     all_sources = config.get_all_sources()
     articles = fetch_all_sources(all_sources, config.scraping.max_articles_per_feed)
 
-    # 1b. Old BeautifulSoup scraper (fallback if scrape_sources configured)
+    # Old BeautifulSoup scraper (fallback if scrape_sources configured)
     if config.scrape_sources:
         from samfkurator.sources.scraper import scrape_all_sources
 
@@ -44,8 +194,120 @@ def _fetch_and_score(args, config, db, console):
             config.scrape_sources,
             max_per_site=config.scraping.max_articles_per_feed,
             delay=config.scraping.request_delay_seconds,
+            db=db if save_validators else None,
         )
         articles.extend(scraped)
+    return articles
+
+
+def _new_articles(articles, db):
+    """Articles not yet scored, waiting in a batch job or queued."""
+    return [
+        a for a in articles
+        if not db.has_score(a.url)
+        and not db.is_batch_pending(a.url)
+        and not db.is_queued(a.url)
+    ]
+
+
+def _estimate(args, config, db, console):
+    """Project the next run's calls, tokens, cost and time (no LLM calls)."""
+    from datetime import datetime, timedelta
+
+    from samfkurator.output.estimate import display_estimate
+    from samfkurator.scoring.estimate import Estimator
+    from samfkurator.scoring.queue import queued_articles
+
+    if args.format == "json":
+        # Keep stdout for the JSON document
+        console = Console(stderr=True)
+    articles = _fetch_articles(config, db, console, save_validators=False)
+    new_articles = _new_articles(articles, db)
+    backend_name = args.backend or config.ai.backend
+    now = datetime.now()
+    estimator = Estimator(
+        db, config.database.path, config.ai, backend_name,
+        since=(now - timedelta(days=args.days)).isoformat(),
+    )
+    estimate = estimator.run(
+        queued_articles(db),
+        new_articles,
+        skim=config.scoring.skim_feeds and not args.no_skim,
+        fetch_full_text=not args.no_fetch and config.scraping.fetch_full_text,
+        ttl_since=(
+            now - timedelta(days=config.scoring.skim_cache_ttl_days)
+        ).isoformat(),
+    )
+
+    notes = []
+    if config.agent_sources:
+        notes.append(
+            f"Agent-kilder ({len(config.agent_sources)}) er ikke medregnet "
+            "(kræver browseren)."
+        )
+    if config.scoring.prefilter:
+        notes.append("Forfilteret er ikke medregnet; det sparer dybe læsninger.")
+    if config.ai.cascade.enabled:
+        notes.append("Kaskaden er ikke medregnet; tallene er for den fulde model.")
+    if args.format == "json":
+        import json
+
+        print(json.dumps(
+            {**estimate, "notes": notes}, indent=2, ensure_ascii=False
+        ))
+        return
+    display_estimate(estimate, notes, console)
+
+
+def _run_budget(args, config):
+    """Per-run scoring budget from config.scoring, overridden by flags."""
+    from samfkurator.scoring.budget import RunBudget, parse_deadline
+
+    scoring = config.scoring
+    max_tokens = getattr(args, "max_tokens", None)
+    max_cost = getattr(args, "max_cost", None)
+    deadline = getattr(args, "deadline", None)
+    return RunBudget(
+        max_seconds=scoring.budget_minutes * 60,
+        max_tokens=scoring.budget_tokens if max_tokens is None else max_tokens,
+        max_cost=scoring.budget_cost_usd if max_cost is None else max_cost,
+        deadline=parse_deadline(scoring.deadline if deadline is None else deadline),
+        prices=config.ai.prices,
+    )
+
+
+def _fetch_and_score(args, config, db, console):
+    """Fetch new articles and score them."""
+    llm_cache = _open_llm_cache(args, config)
+    telemetry = _open_telemetry(config)
+    try:
+        _fetch_and_score_with(args, config, db, console, llm_cache, telemetry)
+    finally:
+        if llm_cache:
+            console.print(f"[dim]LLM-cache: {llm_cache.summary()}[/dim]")
+            llm_cache.close()
+        if telemetry:
+            console.print(f"[dim]LLM-kald: {telemetry.summary()}[/dim]")
+            telemetry.close()
+
+
+def _fetch_and_score_with(args, config, db, console, llm_cache, telemetry=None):
+    from rich.progress import Progress
+
+    from samfkurator.scoring.registry import create_backend
+    from samfkurator.scoring.salient import SourceBoilerplate
+    from samfkurator.sources.extractors import extract_full_text
+
+    # Repeated paragraphs per source, from the articles stored before this run
+    boilerplate = SourceBoilerplate(config.database.path)
+    batch_provider = None
+    if getattr(args, "batch", False):
+        batch_provider = _collect_batches(args, config, db, console, boilerplate)
+        if batch_provider is None:
+            return
+
+    # 1. Fetch RSS feeds and scrape sources
+    articles = _fetch_articles(config, db, console)
 
     # 1c. Agent browser (to-trins: skim + deep-read med bypass-paywalls)
     if config.agent_sources:
@@ -55,6 +317,7 @@ def _fetch_and_score(args, config, db, console):
             f"[bold]Agent browser starter ({backend_name})...[/bold]"
         )
         no_jitter = getattr(args, "no_jitter", False)
+        batch_queue = [] if batch_provider else None
         run_agent(
             [{"name": s.name, "url": s.url, "language": s.language}
              for s in config.agent_sources],
@@ -63,19 +326,92 @@ def _fetch_and_score(args, config, db, console):
             console=console,
             min_score=config.scoring.min_score_to_display,
             jitter_minutes=0 if no_jitter else 20,
+            ai_config=config.ai,
+            batch_queue=batch_queue,
+            llm_cache=llm_cache,
+            prefilter=_load_prefilter(config, console),
+            prefilter_audit_rate=config.scoring.prefilter_audit_rate,
+            skim_cache_ttl_days=config.scoring.skim_cache_ttl_days,
+            agent_config=config.agent,
+            telemetry=telemetry,
+            boilerplate=boilerplate,
         )
+        if batch_queue:
+            _submit_batch(
+                batch_provider, db, backend_name, batch_queue, console,
+                min_score=config.scoring.min_score_to_display,
+            )
 
-    # 2. Filter already-scored articles
-    new_articles = [a for a in articles if not db.has_score(a.url)]
+    # 2. Filter already-scored and already-queued articles
+    new_articles = _new_articles(articles, db)
+    queued = 0 if batch_provider else db.queue_size()
     console.print(
         f"Fandt [bold]{len(articles)}[/bold] artikler, "
         f"[bold]{len(new_articles)}[/bold] nye."
+        + (f" [dim]({queued} venter i køen)[/dim]" if queued else "")
     )
 
-    if not new_articles:
+    if not new_articles and not queued:
         console.print("[dim]Ingen nye artikler at score.[/dim]")
         return
 
+    backend_name = args.backend or config.ai.backend
+    backend = create_backend(
+        backend_name, config.ai, llm_cache, telemetry, boilerplate
+    )
+
+    if (
+        backend_name == "ollama"
+        and backend.fallback is None
+        and not backend.is_available()
+    ):
+        console.print(
+            "[red bold]Ollama er ikke tilgængelig![/red bold]\n"
+            "[dim]Start Ollama med: ollama serve\n"
+            "Eller brug: samfkurator daily --backend claude[/dim]"
+        )
+        return
+    backend.warm_up()
+    if backend.cascade:
+        backend.cascade.fast.warm_up()
+
+    # 2a. Local pre-filter - skip articles the model deems irrelevant
+    prefilter = _load_prefilter(config, console)
+    if prefilter and new_articles:
+        from samfkurator.scoring.prefilter import filter_articles
+
+        kept = filter_articles(
+            new_articles, prefilter, config.scoring.prefilter_audit_rate
+        )
+        console.print(
+            f"Forfilter: [green]{len(kept)} videre[/green], "
+            f"{len(new_articles) - len(kept)} sprunget over"
+        )
+        new_articles = kept
+
+    # 2b. Skim headlines per source - only selected items are fetched/scored
+    if (
+        new_articles
+        and config.scoring.skim_feeds
+        and not getattr(args, "no_skim", False)
+    ):
+        from samfkurator.scoring.skim import skim_articles
+
+        console.print("Skimmer overskrifter...")
+        skimmed = skim_articles(
+            new_articles,
+            backend,
+            db,
+            backend_name=backend_name,
+            audit_rate=config.scoring.skim_audit_rate,
+            ttl_days=config.scoring.skim_cache_ttl_days,
+        )
+        console.print(
+            f"[green]{len(skimmed)} kandidater valgt[/green] "
+            f"(af {len(new_articles)} nye)"
+        )
+        new_articles = skimmed
+
     # 3. Extract full text (optional)
     if not args.no_fetch and config.scraping.fetch_full_text:
         with Progress(console=console) as progress:
@@ -90,41 +426,91 @@ def _fetch_and_score(args, config, db, console):
                 progress.update(task, advance=1)
 
     # 4. Score with LLM
-    backend_name = args.backend or config.ai.backend
-    backend = _create_backend(config, backend_name)
+    if batch_provider:
+        if new_articles:
+            _submit_batch(batch_provider, db, backend_name, new_articles, console)
+        return
 
-    if backend_name == "ollama" and not backend.is_available():
-        console.print(
-            "[red bold]Ollama er ikke tilgængelig![/red bold]\n"
-            "[dim]Start Ollama med: ollama serve\n"
-            "Eller brug: samfkurator daily --backend claude[/dim]"
+    # 4a. Queue the new articles and rank the whole queue by predicted value
+    from samfkurator.scoring.queue import prioritize
+
+    for article in new_articles:
+        db.save_article(article)
+    db.enqueue([a.url for a in new_articles])
+    db.prune_queue(
+        config.scoring.queue_max_age_days, config.scoring.queue_max_attempts
+    )
+    ranked = [
+        a for a, _ in prioritize(
+            db, config.scoring.min_score_to_display, config.daily
         )
+    ]
+    if not ranked:
+        console.print("[dim]Ingen artikler i køen.[/dim]")
         return
 
     console.print(
         f"Scorer artikler med [bold]{backend_name}[/bold]..."
     )
 
+    # 4b. Score in queue order, in groups the backend can score at once,
+    # and stop starting new groups when the run budget is spent
+    budget = _run_budget(args, config).start(backend)
+    group_size = max(1, backend.max_concurrency) * max(1, backend.pack_size)
     scored = 0
     failed = 0
+    done = 0
+    stopped = None
     with Progress(console=console) as progress:
-        task = progress.add_task(
-            "Scorer artikler...", total=len(new_articles)
-        )
-        for article in new_articles:
-            db.save_article(article)
-            result = backend.score_article(article)
-            if result:
-                db.save_score(result)
-                scored += 1
-            else:
-                failed += 1
-            progress.update(task, advance=1)
+        task = progress.add_task("Scorer artikler...", total=len(ranked))
+        while done < len(ranked):
+            stopped = budget.exhausted(backend)
+            if stopped:
+                break
+            group = ranked[done:done + group_size]
+            # Results arrive in completion order and are saved immediately
+            for article, result in backend.score_many(group):
+                if result:
+                    db.save_score(result)
+                    db.dequeue(article.url)
+                    scored += 1
+                else:
+                    db.record_queue_failure(article.url)
+                    failed += 1
+                progress.update(task, advance=1)
+            done += len(group)
 
     console.print(
         f"[green]Scoret {scored} artikler.[/green]"
         + (f" [yellow]({failed} fejlede)[/yellow]" if failed else "")
     )
+    if stopped:
+        console.print(
+            f"[yellow]Budget brugt ({stopped}): {db.queue_size()} artikler "
+            "venter i køen til næste kørsel[/yellow]"
+        )
+    if stopped or any(
+        (budget.max_seconds, budget.max_tokens, budget.max_cost, budget.deadline)
+    ):
+        console.print(f"[dim]Budget: {budget.summary(backend)}[/dim]")
+
+    console.print(f"[dim]Tokens: {backend.usage.summary()}[/dim]")
+    from samfkurator.scoring.resilience import health_report
+
+    for line in health_report(backend):
+        console.print(f"[dim]Backend {line}[/dim]")
+    if backend.cascade:
+        console.print(f"[dim]Kaskade: {backend.cascade.stats.summary()}[/dim]")
+
+    if prefilter:
+        _update_prefilter(prefilter, config, db, console)
+
+    recall = db.get_skim_recall(config.scoring.min_score_to_display)
+    if recall["recall"] is not None and recall["audited_scored"]:
+        console.print(
+            f"[dim]Skim-recall (estimat): {recall['recall']:.0%} "
+            f"({recall['audited_scored']} stikprøve-artikler scoret)[/dim]"
+        )
 
 
 def main():
@@ -141,13 +527,17 @@ def main():
         "--count", type=int, help="Antal artikler (default: 10)"
     )
     daily_parser.add_argument(
-        "--backend", choices=["ollama", "claude", "gemini", "deepseek"],
+        "--backend", choices=BACKEND_NAMES,
         help="AI backend (overrides config)",
     )
     daily_parser.add_argument(
         "--no-fetch", action="store_true",
         help="Spring fuld tekst-ekstraktion over",
     )
+    daily_parser.add_argument(
+        "--no-skim", action="store_true",
+        help="Scor alle nye artikler uden overskrift-skim",
+    )
     daily_parser.add_argument(
         "--cached", action="store_true",
         help="Vis kun tidligere scorede artikler (ingen ny hentning)",
@@ -156,6 +546,26 @@ def main():
         "--no-jitter", action="store_true",
         help="Spring startup-forsinkelse over (til manuel kørsel)",
     )
+    daily_parser.add_argument(
+        "--no-llm-cache", action="store_true",
+        help="Spørg altid LLM'en (ignorér cachede svar)",
+    )
+    daily_parser.add_argument(
+        "--batch", action="store_true",
+        help="Scor via udbyderens batch-API; resultater hentes ved næste kørsel",
+    )
+    daily_parser.add_argument(
+        "--max-tokens", type=int,
+        help="Stop scoring efter så mange tokens; resten venter i køen",
+    )
+    daily_parser.add_argument(
+        "--max-cost", type=float,
+        help="Stop scoring ved denne anslåede pris i USD",
+    )
+    daily_parser.add_argument(
+        "--deadline", type=_deadline,
+        help="Stop scoring på dette klokkeslæt (HH:MM)",
+    )
 
     # All command - show all scored articles
     all_parser = subparsers.add_parser(
@@ -168,13 +578,21 @@ def main():
         "--limit", type=int, default=50, help="Max antal resultater"
     )
     all_parser.add_argument(
-        "--backend", choices=["ollama", "claude"],
+        "--backend", choices=BACKEND_NAMES,
         help="AI backend (overrides config)",
     )
     all_parser.add_argument(
         "--no-fetch", action="store_true",
         help="Spring fuld tekst-ekstraktion over",
     )
+    all_parser.add_argument(
+        "--no-skim", action="store_true",
+        help="Scor alle nye artikler uden overskrift-skim",
+    )
+    all_parser.add_argument(
+        "--no-llm-cache", action="store_true",
+        help="Spørg altid LLM'en (ignorér cachede svar)",
+    )
     all_parser.add_argument(
         "--format", choices=["terminal", "json", "csv"],
         default="terminal", help="Output-format",
@@ -190,18 +608,77 @@ def main():
         help="Lokal Brave-agent til sider blokeret på serveren (Berlingske, Weekendavisen...)",
     )
     local_parser.add_argument(
-        "--backend", choices=["ollama", "claude", "gemini", "deepseek"],
+        "--backend", choices=BACKEND_NAMES,
         help="AI backend (overrides config)",
     )
     local_parser.add_argument(
         "--no-fetch", action="store_true",
         help="Spring fuld tekst-ekstraktion over",
     )
+    local_parser.add_argument(
+        "--no-llm-cache", action="store_true",
+        help="Spørg altid LLM'en (ignorér cachede svar)",
+    )
     local_parser.add_argument(
         "--sync", action="store_true",
         help="Træk serverens DB ned inden kørsel og push tilbage bagefter",
     )
 
+    # Train-prefilter command - local relevance model from the scored archive
+    train_parser = subparsers.add_parser(
+        "train-prefilter", help="Træn lokal forfilter-model på scorede artikler"
+    )
+    train_parser.add_argument(
+        "--incremental", action="store_true",
+        help="Træn videre på scores siden sidste træning",
+    )
+    train_parser.add_argument(
+        "--target-recall", type=float,
+        help="Andel af relevante artikler tærsklen skal beholde (default: config)",
+    )
+    train_parser.add_argument("--epochs", type=int, help="Antal gennemløb")
+    train_parser.add_argument(
+        "--no-skim-negatives", action="store_true",
+        help="Brug ikke skim-fravalgte overskrifter som negative eksempler",
+    )
+
+    # Estimate command - projected calls, tokens, cost and time
+    estimate_parser = subparsers.add_parser(
+        "estimate", help="Anslå kald, tokens, pris og tid for næste kørsel"
+    )
+    estimate_parser.add_argument(
+        "--backend", choices=BACKEND_NAMES,
+        help="AI backend (overrides config)",
+    )
+    estimate_parser.add_argument(
+        "--no-fetch", action="store_true",
+        help="Regn uden fuld tekst-ekstraktion",
+    )
+    estimate_parser.add_argument(
+        "--no-skim", action="store_true",
+        help="Regn uden overskrift-skim",
+    )
+    estimate_parser.add_argument(
+        "--days", type=int, default=30,
+        help="Dages historik for latens og output (default: 30)",
+    )
+    estimate_parser.add_argument(
+        "--format", choices=["terminal", "json"], default="terminal",
+        help="Output-format",
+    )
+
+    # Stats command - LLM call telemetry
+    stats_parser = subparsers.add_parser(
+        "stats", help="Latens, tokens og pris for LLM-kald"
+    )
+    stats_parser.add_argument(
+        "--days", type=int, default=7, help="Antal dage tilbage (default: 7)"
+    )
+    stats_parser.add_argument("--run", help="Kun én kørsel (kørsels-ID)")
+    stats_parser.add_argument(
+        "--runs", type=int, default=5, help="Antal kørsler i oversigten"
+    )
+
     # Web command
     web_parser = subparsers.add_parser(
         "web", help="Start webserver med sortérbar tabel"
@@ -214,7 +691,11 @@ def main():
     )
 
     args = parser.parse_args()
-    config = load_config()
+    try:
+        config = load_config()
+    except ValueError as e:
+        Console().print(f"[red bold]Fejl i config.yaml: {e}[/red bold]")
+        raise SystemExit(2)
 
     # Handle web command before database
     if args.command == "web":
@@ -241,6 +722,18 @@ def main():
         args.cached = False
 
     try:
+        if args.command == "train-prefilter":
+            _train_prefilter(args, config, db, console)
+            return
+
+        if args.command == "stats":
+            _show_stats(args, config, console)
+            return
+
+        if args.command == "estimate":
+            _estimate(args, config, db, console)
+            return
+
         if args.command == "local":
             if not config.local_sources:
                 console.print(
@@ -250,6 +743,7 @@ def main():
 
             import os
             from samfkurator.agent.curator import run_agent
+            from samfkurator.scoring.salient import SourceBoilerplate
 
             backend_name = getattr(args, "backend", None) or config.ai.backend
             exe = config.local_browser.executable_path or None
@@ -293,6 +787,8 @@ def main():
                     db.close()
                     db = Database(local_db_path)
 
+            llm_cache = _open_llm_cache(args, config)
+            telemetry = _open_telemetry(config)
             run_agent(
                 [{"name": s.name, "url": s.url, "language": s.language}
                  for s in config.local_sources],
@@ -304,7 +800,21 @@ def main():
                 headless=False,            # synligt browservindue
                 executable_path=exe,
                 user_data_dir=udir,
+                ai_config=config.ai,
+                llm_cache=llm_cache,
+                prefilter=_load_prefilter(config, console),
+                prefilter_audit_rate=config.scoring.prefilter_audit_rate,
+                skim_cache_ttl_days=config.scoring.skim_cache_ttl_days,
+                agent_config=config.agent,
+                telemetry=telemetry,
+                boilerplate=SourceBoilerplate(local_db_path),
             )
+            if llm_cache:
+                console.print(f"[dim]LLM-cache: {llm_cache.summary()}[/dim]")
+                llm_cache.close()
+            if telemetry:
+                console.print(f"[dim]LLM-kald: {telemetry.summary()}[/dim]")
+                telemetry.close()
 
             # Sync: merge-push (undgår konflikter ved samtidige server-writes)
             # Strategi: hent frisk server-DB, tilføj kun nye lokale rækker
@@ -327,15 +837,17 @@ def main():
                         f"{pull_result.stderr.strip()}[/yellow]"
                     )
                 else:
+                    # Serverens DB kan mangle nyere kolonner (fx scores.tier)
+                    Database(fresh_path).close()
                     # SQLite ATTACH merge: kopier kun rækker der ikke allerede er på server
                     conn = sqlite3.connect(fresh_path)
                     conn.execute("ATTACH DATABASE ? AS local", [local_db_path])
-                    conn.execute(
-                        "INSERT OR IGNORE INTO articles SELECT * FROM local.articles"
-                    )
-                    conn.execute(
-                        "INSERT OR IGNORE INTO scores SELECT * FROM local.scores"
-                    )
+                    for table, columns in SYNC_COLUMNS.items():
+                        cols = ", ".join(columns)
+                        conn.execute(
+                            f"INSERT OR IGNORE INTO {table} ({cols}) "
+                            f"SELECT {cols} FROM local.{table}"
+                        )
                     conn.commit()
                     conn.close()
 
@@ -355,12 +867,16 @@ def main():
                     _os.unlink(fresh_path)
 
             # Vis dagens resultater inkl. det der lige er hentet
+            from samfkurator.output.daily import display_daily, select_daily
+
             rows = db.get_todays_scored_articles(config.scoring.min_score_to_display)
             if rows:
                 daily_rows = select_daily(rows, config.daily)
                 display_daily(daily_rows, console)
 
         elif args.command == "daily":
+            from samfkurator.output.daily import display_daily, select_daily
+
             if not args.cached:
                 _fetch_and_score(args, config, db, console)
 
@@ -387,11 +903,17 @@ def main():
 
             fmt = args.format
             if fmt == "terminal":
+                from samfkurator.output.terminal import display_results
+
                 display_results(rows, console)
             elif fmt == "json":
+                from samfkurator.output.export import export_json
+
                 filepath = export_json(rows, config.output.export_path)
                 console.print(f"Eksporteret til [bold]{filepath}[/bold]")
             elif fmt == "csv":
+                from samfkurator.output.export import export_csv
+
                 filepath = export_csv(rows, config.output.export_path)
                 console.print(f"Eksporteret til [bold]{filepath}[/bold]")
 
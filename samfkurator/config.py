@@ -1,4 +1,5 @@
 import os
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -18,31 +19,140 @@ class OllamaConfig:
     model: str = "llama3:8b"
     base_url: str = "http://localhost:11434"
     temperature: float = 0.3
+    # Concurrency / rate limits for score_many (0 = unlimited)
+    max_concurrency: int = 1
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    # Packed scoring: articles per request (1 = one at a time); K is also
+    # bounded by the model's context window in tokens
+    pack_size: int = 1
+    # Tokens of article text per deep-read prompt, picked by curriculum
+    # term density (see scoring/salient.py)
+    text_budget_tokens: int = 450
+    context_window: int = 8192
+    # Throughput mode (see OllamaBackend): how long the server keeps the
+    # model loaded after a call, num_ctx (0 = size to the prompts, capped
+    # at context_window) and loading the model before the first article
+    keep_alive: str = "30m"
+    num_ctx: int = 0
+    warm_up: bool = True
 
 
 @dataclass
 class ClaudeConfig:
     model: str = "claude-haiku-4-5-20251001"
+    # Messages API endpoint (empty = the SDK default or ANTHROPIC_BASE_URL)
+    base_url: str = ""
+    # cache_control breakpoint after the shared curriculum system prompt
+    prompt_cache: bool = True
+    max_concurrency: int = 4
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    pack_size: int = 1
+    text_budget_tokens: int = 450
+    context_window: int = 200000
 
 
 @dataclass
 class GeminiConfig:
     model: str = "gemini-2.0-flash"
+    # Lifetime of the cached-content entry for the system prompts (0 = off)
+    cache_ttl_seconds: int = 3600
+    max_concurrency: int = 4
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    pack_size: int = 1
+    text_budget_tokens: int = 450
+    context_window: int = 1000000
 
 
 @dataclass
 class DeepSeekConfig:
     model: str = "deepseek-chat"
+    base_url: str = "https://api.deepseek.com"
+    # OpenAI-style batch endpoint for --batch (empty = base_url)
+    batch_base_url: str = ""
+    max_concurrency: int = 4
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    pack_size: int = 1
+    text_budget_tokens: int = 450
+    context_window: int = 64000
+
+
+@dataclass
+class ResilienceConfig:
+    """Retries and circuit breaker applied to every scoring backend."""
+
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    # Consecutive failures before the backend is skipped for reset_seconds
+    breaker_failures: int = 5
+    breaker_reset_seconds: float = 120.0
+
+
+@dataclass
+class HttpConfig:
+    """Pooled HTTP client shared by all backends of one provider."""
+
+    timeout_seconds: float = 120.0
+    connect_timeout_seconds: float = 10.0
+    # A local model on a CPU can take minutes per answer
+    ollama_timeout_seconds: float = 300.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_seconds: float = 60.0
+
+
+@dataclass
+class CascadeConfig:
+    """Fast tier in front of the configured backend (scoring/cascade.py)."""
+
+    enabled: bool = False
+    # Backend and model of the fast tier ("" = the backend's own model),
+    # e.g. ollama with a small model or gemini with a flash-lite model
+    backend: str = "ollama"
+    model: str = ""
+    # Fast overall scores below accept_below or above accept_above are
+    # kept; the rest go to the configured backend
+    accept_below: int = 4
+    accept_above: int = 7
+    # Per primary discipline, e.g. {"metode": {"accept_above": 8}}
+    thresholds: dict = field(default_factory=dict)
+    # Escalate when overall and the best discipline score differ by more
+    max_discipline_gap: int = 3
+    # Share of kept fast scores also read by the configured backend, to
+    # measure agreement
+    validation_rate: float = 0.05
 
 
 @dataclass
 class AIConfig:
     backend: str = "gemini"
+    # Backends tried in order when the one before is unavailable,
+    # e.g. ["gemini", "ollama"] behind deepseek
+    fallback_chain: list[str] = field(default_factory=list)
+    resilience: ResilienceConfig = field(default_factory=ResilienceConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
+    cascade: CascadeConfig = field(default_factory=CascadeConfig)
+    # Curriculum sections given in full per deep-read prompt, picked from
+    # the article text (scoring/curriculum.py); 0 = the whole curriculum
+    curriculum_sections: int = 0
+    # USD per million tokens by model-name prefix, merged over
+    # scoring/telemetry.DEFAULT_PRICES: {"model": {"input", "output", "cached"}}
+    prices: dict = field(default_factory=dict)
     ollama: OllamaConfig = field(default_factory=OllamaConfig)
     claude: ClaudeConfig = field(default_factory=ClaudeConfig)
     gemini: GeminiConfig = field(default_factory=GeminiConfig)
     deepseek: DeepSeekConfig = field(default_factory=DeepSeekConfig)
 
+    def backend_config(self, name: str):
+        """Return the settings block for a backend name."""
+        if name in ("ollama", "claude", "gemini", "deepseek"):
+            return getattr(self, name)
+        return self.ollama
+
 
 @dataclass
 class ScrapingConfig:
@@ -56,6 +166,41 @@ class ScrapingConfig:
 @dataclass
 class ScoringConfig:
     min_score_to_display: int = 4
+    # Skim RSS/scrape headlines per source before full-text + deep scoring
+    skim_feeds: bool = True
+    # Share of skim-rejected articles deep-scored anyway to measure recall
+    skim_audit_rate: float = 0.1
+    # Skim decisions are reused while a headline's URL and title are unchanged
+    skim_cache_ttl_days: int = 7
+    # Persistent LLM response cache (table llm_cache in the database)
+    llm_cache: bool = True
+    llm_cache_ttl_days: int = 30
+    llm_cache_max_entries: int = 20000
+    # Log every LLM call (latency, tokens, cost) in table llm_calls;
+    # see `samfkurator stats`
+    telemetry: bool = True
+    # Local pre-filter (train with `samfkurator train-prefilter`): articles
+    # below its calibrated threshold skip the LLM, except an audit share
+    prefilter: bool = False
+    prefilter_path: str = "./prefilter.json"
+    prefilter_target_recall: float = 0.95
+    prefilter_audit_rate: float = 0.05
+    # Articles wait in table score_queue until deep-scored, best predicted
+    # value first (scoring/queue.py); older or repeatedly failing ones drop out
+    queue_max_age_days: int = 3
+    queue_max_attempts: int = 3
+    # Per-run budget for deep scoring; the rest stays queued. 0/"" = none
+    budget_tokens: int = 0
+    budget_cost_usd: float = 0.0
+    budget_minutes: float = 0
+    # Stop starting new work at this local time ("HH:MM", next occurrence)
+    deadline: str = ""
+
+    def __post_init__(self):
+        if self.deadline:
+            from samfkurator.scoring.budget import time_of_day
+
+            time_of_day(self.deadline)
 
 
 @dataclass
@@ -85,6 +230,20 @@ class AgentSourceConfig:
     language: str = "da"
 
 
+@dataclass
+class AgentConfig:
+    # "per_site": skim and read one front page at a time. "global": collect
+    # all front pages, skim across sites with relevance scores and read the
+    # best candidates first until the run budget is spent.
+    mode: str = "per_site"
+    # Headline tokens per cross-site skim call
+    skim_batch_tokens: int = 3000
+    # Run budget for global mode (0 = unlimited)
+    budget_minutes: float = 0
+    budget_calls: int = 0
+    budget_tokens: int = 0
+
+
 @dataclass
 class LocalBrowserConfig:
     executable_path: str = "/snap/brave/current/opt/brave.com/brave/brave"
@@ -104,6 +263,9 @@ class ScrapeSourceConfig:
     paywall: bool = True
     language: str = "da"
     sections: list[str] = field(default_factory=list)
+    # Google News sitemap: explicit URL, otherwise discovered via robots.txt
+    sitemap: str = ""
+    use_sitemap: bool = True
 
 
 @dataclass
@@ -114,6 +276,7 @@ class Config:
     scrape_sources: list[ScrapeSourceConfig] = field(default_factory=list)
     agent_sources: list[AgentSourceConfig] = field(default_factory=list)
     local_sources: list[AgentSourceConfig] = field(default_factory=list)
+    agent: AgentConfig = field(default_factory=AgentConfig)
     local_browser: LocalBrowserConfig = field(default_factory=LocalBrowserConfig)
     sync: SyncConfig = field(default_factory=SyncConfig)
     scraping: ScrapingConfig = field(default_factory=ScrapingConfig)
@@ -126,18 +289,22 @@ class Config:
         return self.sources_danish + self.sources_international
 
 
+def find_config() -> str | None:
+    """config.yaml in the current directory, then the project root."""
+    candidates = [
+        Path("config.yaml"),
+        Path(__file__).parent.parent / "config.yaml",
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
 def load_config(path: str | None = None) -> Config:
     """Load configuration from config.yaml."""
     if path is None:
-        # Look for config.yaml in the current directory, then project root
-        candidates = [
-            Path("config.yaml"),
-            Path(__file__).parent.parent / "config.yaml",
-        ]
-        for candidate in candidates:
-            if candidate.exists():
-                path = str(candidate)
-                break
+        path = find_config()
 
     if path is None or not Path(path).exists():
         return Config()
@@ -156,6 +323,12 @@ def load_config(path: str | None = None) -> Config:
         claude=ClaudeConfig(**ai_raw.get("claude", {})),
         gemini=GeminiConfig(**ai_raw.get("gemini", {})),
         deepseek=DeepSeekConfig(**ai_raw.get("deepseek", {})),
+        fallback_chain=ai_raw.get("fallback_chain", []),
+        resilience=ResilienceConfig(**ai_raw.get("resilience", {})),
+        http=HttpConfig(**ai_raw.get("http", {})),
+        cascade=CascadeConfig(**ai_raw.get("cascade", {})),
+        curriculum_sections=ai_raw.get("curriculum_sections", 0),
+        prices=ai_raw.get("prices") or {},
     )
 
     # Parse sources
@@ -181,6 +354,7 @@ def load_config(path: str | None = None) -> Config:
     local_sources = [
         AgentSourceConfig(**s) for s in raw.get("local_sources", [])
     ]
+    agent = AgentConfig(**raw.get("agent", {}))
     local_browser = LocalBrowserConfig(**raw.get("local_browser", {}))
     sync = SyncConfig(**raw.get("sync", {}))
 
@@ -200,6 +374,7 @@ def load_config(path: str | None = None) -> Config:
         scrape_sources=scrape_sources,
         agent_sources=agent_sources,
         local_sources=local_sources,
+        agent=agent,
         local_browser=local_browser,
         sync=sync,
         scraping=scraping,
@@ -208,3 +383,28 @@ def load_config(path: str | None = None) -> Config:
         output=output,
         database=database,
     )
+
+
+class ConfigFile:
+    """A config.yaml parsed once and again only when its mtime changes, for
+    long-running processes (the web app). Thread-safe."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or find_config()
+        self._mtime = None
+        self._config = None
+        self._lock = threading.Lock()
+
+    def _stat(self) -> int | None:
+        try:
+            return os.stat(self.path).st_mtime_ns if self.path else None
+        except FileNotFoundError:
+            return None
+
+    def get(self) -> Config:
+        mtime = self._stat()
+        with self._lock:
+            if self._config is None or mtime != self._mtime:
+                self._config = load_config(self.path)
+                self._mtime = mtime
+            return self._config
@@ -1,5 +1,6 @@
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 
 from samfkurator.models import Article, DisciplineScore, ScoringResult
 
@@ -29,13 +30,79 @@ CREATE TABLE IF NOT EXISTS scores (
     quote TEXT,
     concepts TEXT,
     backend_used TEXT,
-    scored_at TEXT
+    scored_at TEXT,
+    tier TEXT
+);
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS skim_decisions (
+    url TEXT PRIMARY KEY,
+    source_name TEXT,
+    title TEXT,
+    selected INTEGER NOT NULL,
+    audited INTEGER DEFAULT 0,
+    audit_rate REAL DEFAULT 0,
+    backend_used TEXT,
+    decided_at TEXT,
+    title_hash TEXT,
+    prompt_version TEXT,
+    relevance INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    job_id TEXT PRIMARY KEY,
+    backend TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    n_requests INTEGER,
+    submitted_at TEXT,
+    finished_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS batch_items (
+    job_id TEXT NOT NULL REFERENCES batch_jobs(job_id),
+    position INTEGER NOT NULL,
+    article_url TEXT NOT NULL,
+    min_score INTEGER DEFAULT 0,
+    PRIMARY KEY (job_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS score_queue (
+    url TEXT PRIMARY KEY REFERENCES articles(url),
+    priority REAL DEFAULT 0,
+    attempts INTEGER DEFAULT 0,
+    enqueued_at TEXT
 );
 """
 
+# Tables `local --sync` merges into the server's database, by column name
+# so the two schemas only have to share these columns
+SYNC_COLUMNS = {
+    "articles": (
+        "url", "title", "source_name", "summary", "full_text", "published",
+        "language", "has_paywall", "fetched_at",
+    ),
+    "scores": (
+        "article_url", "overall_score", "sociologi", "politik", "okonomi",
+        "international_politik", "metode", "primary_discipline", "explanation",
+        "quote", "concepts", "backend_used", "scored_at", "tier",
+    ),
+}
+
 
 class Database:
-    def __init__(self, path: str = "./samfkurator.db"):
+    def __init__(self, path: str = "./samfkurator.db", read_only: bool = False):
+        if read_only:
+            # For readers of an existing database (the web app): no schema
+            # setup, and any write fails
+            uri = Path(path).resolve().as_uri() + "?mode=ro"
+            self.db = sqlite3.connect(uri, uri=True)
+            return
         self.db = sqlite3.connect(path)
         self.db.executescript(CREATE_TABLES)
         self._migrate()
@@ -45,6 +112,10 @@ class Database:
         for table, col, coltype in [
             ("scores", "quote", "TEXT"),
             ("scores", "concepts", "TEXT"),
+            ("scores", "tier", "TEXT"),
+            ("skim_decisions", "title_hash", "TEXT"),
+            ("skim_decisions", "prompt_version", "TEXT"),
+            ("skim_decisions", "relevance", "INTEGER"),
         ]:
             try:
                 self.db.execute(f"ALTER TABLE {table} ADD COLUMN {col} {coltype}")
@@ -84,8 +155,8 @@ class Database:
             """INSERT OR REPLACE INTO scores
                (article_url, overall_score, sociologi, politik, okonomi,
                 international_politik, metode, primary_discipline, explanation,
-                quote, concepts, backend_used, scored_at)
-               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+                quote, concepts, backend_used, scored_at, tier)
+               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
             (
                 result.article_url,
                 result.overall_score,
@@ -100,10 +171,280 @@ class Database:
                 result.concepts,
                 result.backend_used,
                 datetime.now().isoformat(),
+                result.tier or None,
+            ),
+        )
+        self.db.commit()
+
+    def get_http_validators(self, url: str) -> tuple[str | None, str | None]:
+        """Return (etag, last_modified) from the last fetch of url."""
+        row = self.db.execute(
+            "SELECT etag, last_modified FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def save_http_validators(
+        self, url: str, etag: str | None, last_modified: str | None
+    ) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO http_cache VALUES (?,?,?,?)",
+            (url, etag, last_modified, datetime.now().isoformat()),
+        )
+        self.db.commit()
+
+    def save_skim_decision(
+        self,
+        article: Article,
+        selected: bool,
+        audited: bool = False,
+        audit_rate: float = 0.0,
+        backend: str = "",
+        title_hash: str = "",
+        prompt_version: str = "",
+        relevance: int | None = None,
+    ) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO skim_decisions VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+            (
+                article.url,
+                article.source_name,
+                article.title,
+                int(selected),
+                int(audited),
+                audit_rate,
+                backend,
+                datetime.now().isoformat(),
+                title_hash,
+                prompt_version,
+                relevance,
             ),
         )
         self.db.commit()
 
+    def get_skim_decisions(
+        self, source_name: str, urls: list[str], since: str
+    ) -> dict[str, tuple[str, str, bool, int | None]]:
+        """Return {url: (title_hash, prompt_version, selected, relevance)}
+        for skim decisions on `source_name` made after `since`."""
+        decisions = {}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            rows = self.db.execute(
+                f"""SELECT url, title_hash, prompt_version, selected, relevance
+                    FROM skim_decisions
+                    WHERE source_name = ? AND decided_at > ?
+                      AND url IN ({",".join("?" * len(chunk))})""",
+                (source_name, since, *chunk),
+            ).fetchall()
+            for url, title_hash, version, selected, relevance in rows:
+                decisions[url] = (title_hash, version, bool(selected), relevance)
+        return decisions
+
+    def get_skim_recall(self, min_score: int = 5) -> dict:
+        """Estimate skim recall from deep-scored skim decisions.
+
+        Relevant articles the skim rejected are only seen through the audit
+        sample, so each one counts 1/audit_rate.
+        """
+        row = self.db.execute(
+            """
+            SELECT
+                SUM(CASE WHEN d.selected = 1 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN d.selected = 0 AND d.audited = 1
+                         AND d.audit_rate > 0 THEN 1.0 / d.audit_rate
+                         ELSE 0 END),
+                SUM(CASE WHEN d.audited = 1 THEN 1 ELSE 0 END)
+            FROM skim_decisions d JOIN scores s ON d.url = s.article_url
+            WHERE s.overall_score >= ?
+            """,
+            (min_score,),
+        ).fetchone()
+        audited_total = self.db.execute(
+            """SELECT COUNT(*) FROM skim_decisions d
+               JOIN scores s ON d.url = s.article_url
+               WHERE d.audited = 1"""
+        ).fetchone()[0]
+        kept_relevant = row[0] or 0
+        missed_relevant = row[1] or 0.0
+        total = kept_relevant + missed_relevant
+        return {
+            "recall": kept_relevant / total if total else None,
+            "relevant_selected": kept_relevant,
+            "relevant_missed_estimate": missed_relevant,
+            "audited_scored": audited_total,
+            "audited_relevant": row[2] or 0,
+        }
+
+    def get_skim_selection_rate(self, since: str = "") -> float | None:
+        """Share of skimmed headlines kept for deep scoring (selected or
+        audited) since `since`; None without decisions."""
+        kept, total = self.db.execute(
+            """SELECT SUM(CASE WHEN selected = 1 OR audited = 1 THEN 1 ELSE 0 END),
+                      COUNT(*)
+               FROM skim_decisions WHERE decided_at > ?""",
+            (since,),
+        ).fetchone()
+        return kept / total if total else None
+
+    def get_mean_text_length(self) -> float | None:
+        """Mean length in characters of stored full texts."""
+        return self.db.execute(
+            "SELECT AVG(length(full_text)) FROM articles WHERE length(full_text) > 200"
+        ).fetchone()[0]
+
+    def get_prefilter_training_rows(self, since: str = "") -> list[tuple]:
+        """Return (title, summary, source_name, overall_score, scored_at)
+        for scores newer than `since`, oldest first."""
+        return self.db.execute(
+            """SELECT a.title, a.summary, a.source_name, s.overall_score,
+                      s.scored_at
+               FROM articles a JOIN scores s ON a.url = s.article_url
+               WHERE s.scored_at > ?
+               ORDER BY s.scored_at""",
+            (since,),
+        ).fetchall()
+
+    def get_skim_rejections(self, since: str = "") -> list[tuple]:
+        """Return (title, source_name, decided_at) for unscored skim
+        rejections newer than `since`, oldest first."""
+        return self.db.execute(
+            """SELECT d.title, d.source_name, d.decided_at
+               FROM skim_decisions d
+               LEFT JOIN scores s ON d.url = s.article_url
+               WHERE d.selected = 0 AND s.article_url IS NULL
+                 AND d.decided_at > ?
+               ORDER BY d.decided_at""",
+            (since,),
+        ).fetchall()
+
+    def delete_article(self, url: str) -> None:
+        self.db.execute("DELETE FROM articles WHERE url = ?", (url,))
+        self.db.commit()
+
+    def save_batch_job(
+        self, job_id: str, backend: str, urls: list[str], min_score: int = 0
+    ) -> None:
+        self.db.execute(
+            "INSERT INTO batch_jobs VALUES (?,?,?,?,?,?)",
+            (job_id, backend, "pending", len(urls),
+             datetime.now().isoformat(), None),
+        )
+        self.db.executemany(
+            "INSERT INTO batch_items VALUES (?,?,?,?)",
+            [(job_id, i, url, min_score) for i, url in enumerate(urls)],
+        )
+        self.db.commit()
+
+    def get_open_batch_jobs(self, backend: str) -> list[str]:
+        return [
+            row[0] for row in self.db.execute(
+                """SELECT job_id FROM batch_jobs
+                   WHERE backend = ? AND status = 'pending'
+                   ORDER BY submitted_at""",
+                (backend,),
+            )
+        ]
+
+    def get_batch_items(self, job_id: str) -> list[tuple]:
+        """Return (position, article_url, min_score) for a batch job."""
+        return self.db.execute(
+            """SELECT position, article_url, min_score FROM batch_items
+               WHERE job_id = ? ORDER BY position""",
+            (job_id,),
+        ).fetchall()
+
+    def finish_batch_job(self, job_id: str, status: str) -> None:
+        self.db.execute(
+            "UPDATE batch_jobs SET status = ?, finished_at = ? WHERE job_id = ?",
+            (status, datetime.now().isoformat(), job_id),
+        )
+        self.db.commit()
+
+    def is_batch_pending(self, url: str) -> bool:
+        """True if the article sits in a batch job that hasn't finished."""
+        cur = self.db.execute(
+            """SELECT 1 FROM batch_items i JOIN batch_jobs j
+               ON i.job_id = j.job_id
+               WHERE i.article_url = ? AND j.status = 'pending'""",
+            (url,),
+        )
+        return cur.fetchone() is not None
+
+    def enqueue(self, urls: list[str]) -> int:
+        """Queue saved articles for deep scoring; returns how many were new."""
+        before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO score_queue VALUES (?,?,?,?)",
+            [(url, 0.0, 0, datetime.now().isoformat()) for url in urls],
+        )
+        self.db.commit()
+        return self.db.total_changes - before
+
+    def is_queued(self, url: str) -> bool:
+        cur = self.db.execute("SELECT 1 FROM score_queue WHERE url = ?", (url,))
+        return cur.fetchone() is not None
+
+    def dequeue(self, url: str) -> None:
+        self.db.execute("DELETE FROM score_queue WHERE url = ?", (url,))
+        self.db.commit()
+
+    def record_queue_failure(self, url: str) -> None:
+        self.db.execute(
+            "UPDATE score_queue SET attempts = attempts + 1 WHERE url = ?", (url,)
+        )
+        self.db.commit()
+
+    def prune_queue(self, max_age_days: int, max_attempts: int) -> int:
+        """Drop queued articles that are scored, stale or keep failing."""
+        since = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        cur = self.db.execute(
+            """DELETE FROM score_queue
+               WHERE enqueued_at < ? OR attempts >= ?
+                  OR url IN (SELECT article_url FROM scores)""",
+            (since, max_attempts),
+        )
+        self.db.commit()
+        return cur.rowcount
+
+    def get_queue(self) -> list[tuple]:
+        """Return (url, title, source_name, summary, full_text, published,
+        language, has_paywall, enqueued_at, selected, audited, relevance)
+        for queued articles, highest priority first. The last three come
+        from the article's skim decision and are None without one."""
+        return self.db.execute(
+            """SELECT a.url, a.title, a.source_name, a.summary, a.full_text,
+                      a.published, a.language, a.has_paywall, q.enqueued_at,
+                      d.selected, d.audited, d.relevance
+               FROM score_queue q JOIN articles a ON q.url = a.url
+               LEFT JOIN skim_decisions d ON q.url = d.url
+               ORDER BY q.priority DESC, q.enqueued_at"""
+        ).fetchall()
+
+    def set_queue_priorities(self, priorities: dict[str, float]) -> None:
+        self.db.executemany(
+            "UPDATE score_queue SET priority = ? WHERE url = ?",
+            [(p, url) for url, p in priorities.items()],
+        )
+        self.db.commit()
+
+    def queue_size(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM score_queue").fetchone()[0]
+
+    def get_source_hit_rates(
+        self, min_score: int = 5
+    ) -> dict[str, tuple[int, int]]:
+        """Return {source_name: (articles scoring >= min_score, scored)}."""
+        rows = self.db.execute(
+            """SELECT a.source_name,
+                      SUM(CASE WHEN s.overall_score >= ? THEN 1 ELSE 0 END),
+                      COUNT(*)
+               FROM articles a JOIN scores s ON a.url = s.article_url
+               GROUP BY a.source_name""",
+            (min_score,),
+        ).fetchall()
+        return {source: (hits, total) for source, hits, total in rows}
+
     def get_scored_articles(
         self, min_score: int = 1, limit: int = 50
     ) -> list[tuple]:
@@ -43,3 +43,5 @@ class ScoringResult:
     concepts: str = ""
     scored_at: Optional[datetime] = None
     backend_used: str = "ollama"
+    # Cascade tier that produced the score ("fast"/"full"; "" = no cascade)
+    tier: str = ""
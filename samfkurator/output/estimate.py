@@ -0,0 +1,61 @@
+from rich.console import Console
+from rich.table import Table
+
+PHASE_NAMES = {
+    "skim": "Skim",
+    "score": "Dyb læsning",
+    "packed": "Dyb læsning (pakket)",
+}
+
+
+def _duration(seconds: float) -> str:
+    seconds = round(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds // 3600} t {seconds % 3600 // 60:02d} min"
+
+
+def display_estimate(
+    estimate: dict, notes: list[str], console: Console | None = None
+):
+    """Display a run projection (see scoring/estimate.Estimator.run)."""
+    console = console or Console()
+    console.print(
+        f"[bold]Estimat for {estimate['backend']} / {estimate['model']}[/bold]: "
+        f"{estimate['new']} nye artikler, {estimate['queued']} i køen"
+    )
+    basis = (
+        f"{estimate['history_calls']} tidligere kald"
+        if estimate["history_calls"] else "ingen historik – standardværdier"
+    )
+    if estimate["skim_selection"] is not None:
+        basis += f" · skim beholder {estimate['skim_selection']:.0%}"
+    console.print(f"[dim]Grundlag: {basis}[/dim]")
+
+    table = Table(title_justify="left")
+    table.add_column("Fase")
+    table.add_column("Kald", justify="right")
+    table.add_column("Artikler", justify="right")
+    table.add_column("Input", justify="right")
+    table.add_column("Cachet", justify="right")
+    table.add_column("Output", justify="right")
+    table.add_column("Pris $", justify="right")
+    table.add_column("Tid", justify="right")
+    for phase in estimate["phases"] + [estimate["total"]]:
+        total = phase["phase"] == "total"
+        table.add_row(
+            "[bold]I alt[/bold]" if total else PHASE_NAMES[phase["phase"]],
+            str(phase["calls"]),
+            str(phase["articles"]) if phase["articles"] else "-",
+            f"{phase['input_tokens']:,}",
+            f"{phase['cached_tokens']:,}",
+            f"{phase['output_tokens']:,}",
+            f"{phase['cost_usd']:.4f}",
+            _duration(phase["seconds"]),
+            end_section=phase is estimate["phases"][-1],
+        )
+    console.print(table)
+    for note in notes:
+        console.print(f"[dim]{note}[/dim]")
@@ -0,0 +1,71 @@
+from rich.console import Console
+from rich.table import Table
+
+
+def _ms(value: int | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value / 1000:.1f}s" if value >= 1000 else f"{value}ms"
+
+
+def _table(title: str, label: str, groups: dict) -> Table:
+    table = Table(title=title, title_justify="left")
+    table.add_column(label, width=28)
+    table.add_column("Kald", justify="right")
+    table.add_column("Fejl", justify="right")
+    table.add_column("Parse-fejl", justify="right")
+    table.add_column("Reddet", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p90", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Input", justify="right")
+    table.add_column("Cachet", justify="right")
+    table.add_column("Output", justify="right")
+    table.add_column("Pris $", justify="right")
+
+    for key, agg in groups.items():
+        latency = agg["latency_ms"]
+        table.add_row(
+            key,
+            str(agg["calls"]),
+            f"[red]{agg['errors']}[/red]" if agg["errors"] else "0",
+            f"[yellow]{agg['parse_failures']}[/yellow]" if agg["parse_failures"] else "0",
+            str(agg["repaired"]),
+            _ms(latency["p50"]),
+            _ms(latency["p90"]),
+            _ms(latency["p99"]),
+            f"{agg['input_tokens']:,}",
+            f"{agg['cached_tokens']:,}",
+            f"{agg['output_tokens']:,}",
+            f"{agg['cost_usd']:.4f}",
+        )
+    return table
+
+
+def display_stats(stats: dict, console: Console | None = None, runs: int = 5):
+    """Display LLM call telemetry (see scoring/telemetry.call_stats)."""
+    console = console or Console()
+    total = stats["total"]
+    if not total["calls"]:
+        console.print("[dim]Ingen LLM-kald logget i perioden.[/dim]")
+        return
+
+    latency = total["latency_ms"]
+    console.print(
+        f"[bold]{total['calls']} LLM-kald[/bold] · "
+        f"latens p50 {_ms(latency['p50'])} / p90 {_ms(latency['p90'])} / "
+        f"p99 {_ms(latency['p99'])} · "
+        f"{total['input_tokens']:,} input ({total['cached_tokens']:,} cachet) · "
+        f"{total['output_tokens']:,} output · [bold]ca. ${total['cost_usd']:.4f}[/bold]"
+    )
+    console.print(
+        "[dim]Udfald: "
+        + ", ".join(f"{k} {v}" for k, v in sorted(stats["outcomes"].items()))
+        + "[/dim]"
+    )
+    console.print(_table("Pr. backend / model", "Backend / model", stats["by_backend"]))
+    console.print(_table("Pr. kaldtype", "Type", stats["by_kind"]))
+    console.print(_table("Pr. kilde", "Kilde", stats["by_source"]))
+
+    recent = dict(list(stats["runs"].items())[:runs])
+    console.print(_table(f"Seneste {len(recent)} kørsler", "Kørsel", recent))
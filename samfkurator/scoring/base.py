@@ -0,0 +1,589 @@
+"""Shared behaviour for scoring backends."""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Iterator
+
+from samfkurator.models import Article, DisciplineScore, ScoringResult
+from samfkurator.scoring.cache import ResponseCache
+from samfkurator.scoring.cascade import Cascade
+from samfkurator.scoring.curriculum import system_for
+from samfkurator.scoring.engine import (
+    PACKED_OUTPUT_TOKENS,
+    SCORE_OUTPUT_TOKENS,
+    RateLimiter,
+    estimate_tokens,
+    score_many,
+)
+from samfkurator.scoring.resilience import (
+    BackendHealth,
+    BackendUnavailable,
+    CircuitBreaker,
+    RetryPolicy,
+    call_with_retries,
+    classify,
+)
+from samfkurator.scoring.salient import (
+    DEFAULT_TEXT_BUDGET,
+    SourceBoilerplate,
+    TextSelector,
+)
+from samfkurator.scoring.telemetry import (
+    OK,
+    PARSED,
+    PARTIAL,
+    REPAIRED,
+    UNPARSED,
+    CallRecorder,
+)
+from samfkurator.scoring.prompt import (
+    DEEP_READ_SYSTEM_PROMPT,
+    SKIM_SYSTEM_PROMPT,
+    build_deep_read_prompt,
+    build_fix_prompt,
+    build_packed_prompt,
+    build_ranked_skim_prompt,
+    build_skim_prompt,
+    deep_read_template,
+    parse_packed_scoring_response,
+    parse_ranked_skim_response,
+    parse_scoring_details,
+)
+
+# Request kinds passed to BaseBackend._complete
+SCORE = "score"
+SKIM = "skim"
+PACKED = "packed"
+# Follow-up asking for the required fields a score answer lacked
+FIX = "fix"
+FIX_OUTPUT_TOKENS = 200
+
+_USAGE_INIT_LOCK = threading.Lock()
+
+
+def _source_of(headlines: list[dict]) -> str:
+    """The headlines' common source, or "" for a mixed batch."""
+    sources = {h.get("source", "") for h in headlines}
+    return sources.pop() if len(sources) == 1 else ""
+
+
+@dataclass
+class Usage:
+    """Token usage accumulated over a run. Thread-safe."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    # Input tokens served from the provider's prompt cache
+    cached_tokens: int = 0
+    # Input tokens written to the prompt cache (Anthropic bills these extra)
+    cache_write_tokens: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+    # Tokens of the calling thread's latest call, for per-call telemetry
+    _last: threading.local = field(
+        default_factory=threading.local, repr=False, compare=False
+    )
+
+    def add(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> None:
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens or 0
+            self.output_tokens += output_tokens or 0
+            self.cached_tokens += cached_tokens or 0
+            self.cache_write_tokens += cache_write_tokens or 0
+        self._last.tokens = (
+            input_tokens or 0, output_tokens or 0, cached_tokens or 0
+        )
+
+    def take_last(self) -> tuple[int, int, int]:
+        """(input, output, cached) of this thread's latest add(), then reset."""
+        tokens = getattr(self._last, "tokens", (0, 0, 0))
+        self._last.tokens = (0, 0, 0)
+        return tokens
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} kald · {self.input_tokens:,} input-tokens "
+            f"({self.cached_tokens:,} fra prompt-cache, {self.cache_hit_rate:.0%}) · "
+            f"{self.output_tokens:,} output-tokens"
+        )
+
+
+class BaseBackend:
+    """Base class for scoring backends.
+
+    Subclasses implement `_complete` (one provider call returning the raw
+    answer); this class builds the prompts, parses answers, checks the
+    response cache, retries and fails over (scoring/resilience.py) and adds
+    concurrent `score_many` within the configured limits.
+    """
+
+    name: str = ""
+    model: str = ""
+    max_concurrency: int = 1
+    limiter: RateLimiter | None = None
+    cache: ResponseCache | None = None
+    # Articles per scoring request (1 = one at a time) and the model's
+    # context window, which bounds how many fit (see engine.pack_articles)
+    pack_size: int = 1
+    context_window: int = 8192
+    # Tokens of article text per deep-read prompt (see scoring/salient.py)
+    text_budget: int = DEFAULT_TEXT_BUDGET
+    # Repeated paragraphs per source, from the stored articles
+    boilerplate: SourceBoilerplate | None = None
+    # Curriculum sections in full per deep-read prompt (scoring/curriculum.py;
+    # 0 = the whole curriculum)
+    curriculum_sections: int = 0
+    retry_policy: RetryPolicy = RetryPolicy()
+    # Next backend in ai.fallback_chain, used when this one is unavailable
+    fallback: "BaseBackend | None" = None
+    # Per-call rows in llm_calls (scoring/telemetry.py); None = not recorded
+    telemetry: CallRecorder | None = None
+    # Fast tier that reads every article first (scoring/cascade.py)
+    cascade: Cascade | None = None
+
+    def _lazy(self, attr: str, factory):
+        # Per-instance state without requiring subclasses to call super().__init__
+        with _USAGE_INIT_LOCK:
+            if attr not in self.__dict__:
+                self.__dict__[attr] = factory()
+        return self.__dict__[attr]
+
+    @property
+    def usage(self) -> Usage:
+        return self._lazy("_usage", Usage)
+
+    @property
+    def text_selector(self) -> TextSelector:
+        return self._lazy("_text_selector", lambda: TextSelector(self.boilerplate))
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._lazy("_breaker", CircuitBreaker)
+
+    @property
+    def health(self) -> BackendHealth:
+        return self._lazy("_health", BackendHealth)
+
+    def chain(self) -> list["BaseBackend"]:
+        """This backend followed by its fallbacks and the cascade's fast tier."""
+        backends, backend = [], self
+        while backend is not None and backend not in backends:
+            backends.append(backend)
+            backend = backend.fallback
+        if self.cascade is not None and self.cascade.fast not in backends:
+            backends.append(self.cascade.fast)
+        return backends
+
+    def set_limits(
+        self,
+        max_concurrency: int = 1,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        if requests_per_minute or tokens_per_minute:
+            self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        else:
+            self.limiter = None
+
+    def set_cache(self, cache: ResponseCache | None) -> None:
+        self.cache = cache
+
+    def set_packing(self, pack_size: int = 1, context_window: int = 8192) -> None:
+        self.pack_size = max(1, pack_size)
+        self.context_window = context_window
+
+    def set_resilience(
+        self,
+        policy: RetryPolicy,
+        breaker: CircuitBreaker,
+        fallback: "BaseBackend | None" = None,
+    ) -> None:
+        self.retry_policy = policy
+        self.__dict__["_breaker"] = breaker
+        self.fallback = fallback
+
+    def set_telemetry(self, recorder: CallRecorder | None) -> None:
+        self.telemetry = recorder
+
+    def set_cascade(self, cascade: Cascade | None) -> None:
+        self.cascade = cascade
+
+    def set_text_budget(self, tokens: int) -> None:
+        self.text_budget = tokens or DEFAULT_TEXT_BUDGET
+
+    def set_boilerplate(self, boilerplate: SourceBoilerplate | None) -> None:
+        self.boilerplate = boilerplate
+        self.__dict__.pop("_text_selector", None)
+
+    def set_curriculum(self, sections: int = 0) -> None:
+        self.curriculum_sections = max(0, sections)
+
+    def _article_text(self, article: Article) -> str:
+        return self.text_selector.scoring_text(article, self.text_budget)
+
+    def _complete(
+        self, kind: str, system: str, prompt: str, max_tokens: int = 0
+    ) -> str:
+        """Send one prompt to the provider and return the raw answer text.
+
+        `kind` is SCORE, SKIM, PACKED or FIX and selects temperature and the
+        default output limit; `max_tokens` overrides the limit. Errors
+        propagate; callers turn them into a failed result.
+        """
+        raise NotImplementedError
+
+    def _call(
+        self,
+        kind: str,
+        system: str,
+        prompt: str,
+        max_tokens: int = 0,
+        source: str = "",
+    ) -> str:
+        """`_complete` under this backend's rate limiter, retries and breaker.
+
+        Raises BackendUnavailable when the backend is down or keeps
+        rate-limiting; other errors propagate from `_complete`. With
+        telemetry, every attempt is recorded; the caller reports how the
+        successful answer parsed with `_parsed`.
+        """
+        def attempt() -> str:
+            if self.limiter is not None:
+                self.limiter.acquire(
+                    estimate_tokens(system)
+                    + estimate_tokens(prompt)
+                    + (max_tokens or SCORE_OUTPUT_TOKENS)
+                )
+            if self.telemetry is None:
+                return self._complete(kind, system, prompt, max_tokens)
+            self.usage.take_last()
+            start = time.perf_counter()
+            try:
+                raw = self._complete(kind, system, prompt, max_tokens)
+            except Exception as exc:
+                self._record(kind, source, start, classify(exc)[0], error=str(exc))
+                raise
+            self._record(kind, source, start, OK)
+            return raw
+
+        try:
+            return call_with_retries(
+                attempt, self.retry_policy, self.breaker, self.health
+            )
+        except BackendUnavailable as exc:
+            if self.telemetry is not None and exc.__cause__ is None:
+                self.telemetry.record(
+                    self.name, self.model, kind, 0, "short_circuited",
+                    source=source, error=str(exc),
+                )
+            raise
+
+    def _record(
+        self, kind: str, source: str, start: float, outcome: str, error: str = ""
+    ) -> None:
+        input_tokens, output_tokens, cached_tokens = self.usage.take_last()
+        self.telemetry.record(
+            self.name, self.model, kind,
+            round((time.perf_counter() - start) * 1000), outcome,
+            source=source, input_tokens=input_tokens,
+            output_tokens=output_tokens, cached_tokens=cached_tokens,
+            error=error,
+        )
+
+    def _parsed(self, status: str) -> None:
+        """Parse status (PARSED/PARTIAL/UNPARSED) of this thread's last call."""
+        if self.telemetry is not None:
+            self.telemetry.set_parse_status(status)
+
+    def _score_prompt(
+        self, article: Article, text: str | None = None
+    ) -> tuple[str, str]:
+        """(system, prompt) for deep-reading one article."""
+        if text is None:
+            text = self._article_text(article)
+        return self._deep_read_system([text]), build_deep_read_prompt(
+            article.title, text, article.source_name, article.language
+        )
+
+    def _cache_key(
+        self, article: Article, system: str, text: str
+    ) -> tuple[str, str]:
+        """(prompt, text) the response cache keys a deep read on: the system
+        prompt and the template the text goes into, and the text itself
+        (title included), whatever URL or source it came from."""
+        return f"{system}\n\n{deep_read_template(article.language)}", text
+
+    def _deep_read_system(self, texts: list[str]) -> str:
+        if not self.curriculum_sections:
+            return DEEP_READ_SYSTEM_PROMPT
+        return system_for(texts, self.curriculum_sections)
+
+    def _cached_score(
+        self, article: Article, key: tuple[str, str]
+    ) -> ScoringResult | None:
+        if not self.cache:
+            return None
+        hit = self.cache.get(self.name, self.model, *key)
+        if not hit or not hit[1]:
+            return None
+        # Same text may have been scored under another URL
+        parsed = dict(hit[1], article_url=article.url)
+        parsed["disciplines"] = DisciplineScore(**parsed["disciplines"])
+        return ScoringResult(**parsed)
+
+    def _cache_score(
+        self, key: tuple[str, str], raw: str, result: ScoringResult
+    ) -> None:
+        if self.cache:
+            self.cache.put(self.name, self.model, *key, raw, asdict(result))
+
+    def score_article(self, article: Article) -> ScoringResult | None:
+        if self.cascade is not None:
+            return self.cascade.score(article, self._read)
+        return self._read(article)
+
+    def _read(self, article: Article) -> ScoringResult | None:
+        """Deep-read one article with this backend's model."""
+        text = self._article_text(article)
+        system, prompt = self._score_prompt(article, text)
+        key = self._cache_key(article, system, text)
+        cached = self._cached_score(article, key)
+        if cached:
+            return cached
+
+        try:
+            raw = self._call(SCORE, system, prompt, source=article.source_name)
+        except BackendUnavailable:
+            if self.fallback is None:
+                return None
+            self.health.count(fallbacks=1)
+            return self.fallback.score_article(article)
+        except Exception:
+            return None
+        parsed = parse_scoring_details(raw, article.url, self.name)
+        if parsed.result:
+            self._parsed(REPAIRED if parsed.repaired else PARSED)
+            self._cache_score(key, raw, parsed.result)
+            return parsed.result
+        self._parsed(PARTIAL if parsed.data else UNPARSED)
+        if parsed.data:
+            return self._complete_missing(
+                article, system, prompt, parsed.data, parsed.missing
+            )
+        return None
+
+    def _complete_missing(
+        self,
+        article: Article,
+        system: str,
+        prompt: str,
+        partial: dict,
+        missing: list[str],
+    ) -> ScoringResult | None:
+        """One follow-up call for the required fields a salvaged answer lacks.
+
+        Not cached: the merged result belongs to two answers.
+        """
+        try:
+            raw = self._call(
+                FIX, system,
+                build_fix_prompt(prompt, partial, missing),
+                max_tokens=FIX_OUTPUT_TOKENS, source=article.source_name,
+            )
+        except Exception:
+            return None
+        extra = parse_scoring_details(raw, article.url, self.name).data
+        kept = {k: v for k, v in partial.items() if k not in missing}
+        merged = parse_scoring_details(
+            json.dumps({**extra, **kept}), article.url, self.name
+        )
+        self._parsed(REPAIRED if merged.result else UNPARSED)
+        return merged.result
+
+    def score(self, article: Article) -> ScoringResult | None:
+        """Score one article (scoring/registry.ScoringBackend protocol)."""
+        return self.score_article(article)
+
+    def score_packed(
+        self, articles: list[Article]
+    ) -> list[tuple[Article, ScoringResult | None]]:
+        """Score several articles with one request.
+
+        Articles missing from the answer (malformed element, truncated
+        array, failed request) are retried one at a time.
+        """
+        if self.cascade is not None:
+            return self.cascade.score_packed(articles, self._read_packed)
+        return self._read_packed(articles)
+
+    def _read_packed(
+        self, articles: list[Article]
+    ) -> list[tuple[Article, ScoringResult | None]]:
+        done: dict[str, ScoringResult] = {}
+        texts = {a.url: self._article_text(a) for a in articles}
+        keys = {
+            a.url: self._cache_key(
+                a, self._score_prompt(a, texts[a.url])[0], texts[a.url]
+            )
+            for a in articles
+        }
+        for article in articles:
+            cached = self._cached_score(article, keys[article.url])
+            if cached:
+                done[article.url] = cached
+        todo = [a for a in articles if a.url not in done]
+
+        if len(todo) > 1:
+            ids = {f"{i + 1}": a for i, a in enumerate(todo)}
+            prompt = build_packed_prompt([
+                {
+                    "id": article_id,
+                    "title": a.title,
+                    "text": texts[a.url],
+                    "source": a.source_name,
+                    "language": a.language,
+                }
+                for article_id, a in ids.items()
+            ])
+            sources = {a.source_name for a in todo}
+            system = self._deep_read_system([texts[a.url] for a in todo])
+            try:
+                raw = self._call(
+                    PACKED, system, prompt,
+                    max_tokens=PACKED_OUTPUT_TOKENS * len(todo),
+                    source=sources.pop() if len(sources) == 1 else "",
+                )
+            except BackendUnavailable:
+                if self.fallback is None:
+                    return [(a, done.get(a.url)) for a in articles]
+                self.health.count(fallbacks=1)
+                return [
+                    (a, done[a.url]) for a in articles if a.url in done
+                ] + self.fallback.score_packed(todo)
+            except Exception:
+                raw = ""
+            results = parse_packed_scoring_response(
+                raw, {i: a.url for i, a in ids.items()}, self.name
+            )
+            if raw:
+                self._parsed(
+                    PARSED if len(results) == len(todo)
+                    else PARTIAL if results else UNPARSED
+                )
+            for article in todo:
+                result = results.get(article.url)
+                if result:
+                    done[article.url] = result
+                    # Cached under the single-article key, so a later
+                    # one-at-a-time run reuses it too
+                    self._cache_score(keys[article.url], raw, result)
+
+        return [
+            (a, done[a.url] if a.url in done else self._read(a))
+            for a in articles
+        ]
+
+    def skim(self, headlines: list[dict]) -> list[int] | None:
+        """
+        Given a list of {title, teaser, url} dicts, return indices of
+        headlines worth reading in full (0-indexed), or None if the LLM
+        call failed.
+        """
+        system = SKIM_SYSTEM_PROMPT
+        prompt = build_skim_prompt(headlines)
+        if self.cache:
+            hit = self.cache.get(self.name, self.model, system, prompt)
+            if hit and hit[1] is not None:
+                return hit[1]
+
+        try:
+            raw = self._call(SKIM, system, prompt, source=_source_of(headlines))
+        except BackendUnavailable:
+            if self.fallback is None:
+                return None
+            self.health.count(fallbacks=1)
+            return self.fallback.skim(headlines)
+        except Exception:
+            return None
+        try:
+            text = raw.strip()
+            if text.startswith("```"):
+                text = text.split("\n", 1)[1].rsplit("```", 1)[0]
+            data = json.loads(text)
+            indices = [int(i) for i in data.get("relevant_indices", [])]
+        except Exception:
+            self._parsed(UNPARSED)
+            return None
+        self._parsed(PARSED)
+        if self.cache:
+            self.cache.put(self.name, self.model, system, prompt, raw, indices)
+        return indices
+
+    def skim_ranked(self, headlines: list[dict]) -> dict[int, int] | None:
+        """
+        Given {title, teaser, url, source} dicts from several sites, return
+        {index: relevance 1-10} for headlines worth reading, or None if the
+        LLM call failed.
+        """
+        system = SKIM_SYSTEM_PROMPT
+        prompt = build_ranked_skim_prompt(headlines)
+        if self.cache:
+            hit = self.cache.get(self.name, self.model, system, prompt)
+            if hit and hit[1] is not None:
+                return {int(i): r for i, r in hit[1]}
+
+        try:
+            raw = self._call(
+                SKIM, system, prompt, max_tokens=50 + 15 * len(headlines),
+                source=_source_of(headlines),
+            )
+        except BackendUnavailable:
+            if self.fallback is None:
+                return None
+            self.health.count(fallbacks=1)
+            return self.fallback.skim_ranked(headlines)
+        except Exception:
+            return None
+        try:
+            ratings = parse_ranked_skim_response(raw, len(headlines))
+        except Exception:
+            self._parsed(UNPARSED)
+            return None
+        self._parsed(PARSED)
+        if self.cache:
+            self.cache.put(
+                self.name, self.model, system, prompt, raw, sorted(ratings.items())
+            )
+        return ratings
+
+    def warm_up(self) -> None:
+        """Prepare for a run (load a local model). Default: nothing."""
+
+    def is_available(self) -> bool:
+        return True
+
+    def score_many(
+        self, articles: list[Article]
+    ) -> Iterator[tuple[Article, ScoringResult | None]]:
+        """Score articles concurrently; yields results in completion order.
+
+        The rate limiter is applied per provider call in `_call`, so cache
+        hits and fallbacks don't count against this backend's quota.
+        """
+        return score_many(self, articles, self.max_concurrency)
@@ -0,0 +1,320 @@
+"""Provider batch-API scoring for the nightly run.
+
+Instead of one synchronous call per article, all pending deep-read prompts
+are submitted as one batch job (Anthropic Message Batches, Gemini batch
+mode, or an OpenAI-style batch file). Job IDs are stored in the database and
+the results are collected into `scores` on a later invocation.
+"""
+
+import json
+import os
+
+from samfkurator.config import AIConfig
+from samfkurator.db import Database
+from samfkurator.models import Article
+from samfkurator.scoring.prompt import (
+    DEEP_READ_SYSTEM_PROMPT,
+    build_deep_read_prompt,
+    parse_scoring_response,
+)
+from samfkurator.scoring.salient import DEFAULT_TEXT_BUDGET, TextSelector
+
+# Job states as stored in batch_jobs.status
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+def _custom_id(position: int) -> str:
+    # Anthropic only allows [a-zA-Z0-9_-]{1,64}, so URLs can't be IDs
+    return f"a{position}"
+
+
+class _BatchProvider:
+    # Article text selection, as the live backend's (see set_text)
+    text_budget: int = DEFAULT_TEXT_BUDGET
+    selector: TextSelector = TextSelector()
+
+    def set_text(self, budget_tokens: int, boilerplate=None) -> None:
+        self.text_budget = budget_tokens or DEFAULT_TEXT_BUDGET
+        self.selector = TextSelector(boilerplate)
+
+    def _deep_read_prompt(self, article: Article) -> str:
+        return build_deep_read_prompt(
+            article.title,
+            self.selector.scoring_text(article, self.text_budget),
+            article.source_name,
+            article.language,
+        )
+
+
+class AnthropicBatchProvider(_BatchProvider):
+    """Anthropic Message Batches API."""
+
+    def __init__(self, model: str, http_client=None):
+        from anthropic import Anthropic
+
+        self.model = model
+        self.client = Anthropic(http_client=http_client)
+
+    def submit(self, articles: list[Article]) -> str:
+        batch = self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": _custom_id(i),
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": 400,
+                        "system": [{
+                            "type": "text",
+                            "text": DEEP_READ_SYSTEM_PROMPT,
+                            "cache_control": {"type": "ephemeral"},
+                        }],
+                        "messages": [
+                            {"role": "user", "content": self._deep_read_prompt(a)}
+                        ],
+                    },
+                }
+                for i, a in enumerate(articles)
+            ]
+        )
+        return batch.id
+
+    def poll(self, job_id: str) -> str:
+        batch = self.client.messages.batches.retrieve(job_id)
+        return DONE if batch.processing_status == "ended" else PENDING
+
+    def results(self, job_id: str) -> dict[str, str]:
+        out = {}
+        for entry in self.client.messages.batches.results(job_id):
+            if entry.result.type == "succeeded":
+                out[entry.custom_id] = entry.result.message.content[0].text
+        return out
+
+
+class GeminiBatchProvider(_BatchProvider):
+    """Gemini batch mode with inlined requests (results keep input order)."""
+
+    FAILED_STATES = {
+        "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+    }
+
+    def __init__(self, model: str, http_client=None):
+        from google import genai
+        from google.genai import types
+
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY environment variable not set")
+        self.model = model
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(httpx_client=http_client)
+            if http_client is not None else None,
+        )
+
+    def submit(self, articles: list[Article]) -> str:
+        requests = [
+            {
+                "contents": [
+                    {"role": "user", "parts": [{"text": self._deep_read_prompt(a)}]}
+                ],
+                "config": {
+                    "system_instruction": {
+                        "parts": [{"text": DEEP_READ_SYSTEM_PROMPT}]
+                    },
+                    "response_mime_type": "application/json",
+                    "temperature": 0.2,
+                    "max_output_tokens": 500,
+                },
+            }
+            for a in articles
+        ]
+        job = self.client.batches.create(
+            model=self.model,
+            src=requests,
+            config={"display_name": "samfkurator-deep-read"},
+        )
+        return job.name
+
+    def poll(self, job_id: str) -> str:
+        state = self.client.batches.get(name=job_id).state.name
+        if state == "JOB_STATE_SUCCEEDED":
+            return DONE
+        if state in self.FAILED_STATES:
+            return FAILED
+        return PENDING
+
+    def results(self, job_id: str) -> dict[str, str]:
+        job = self.client.batches.get(name=job_id)
+        out = {}
+        for i, item in enumerate(job.dest.inlined_responses or []):
+            if item.response is not None:
+                out[_custom_id(i)] = item.response.text
+        return out
+
+
+class OpenAIBatchProvider(_BatchProvider):
+    """OpenAI-style batch file (/v1/files + /v1/batches).
+
+    Works against any endpoint implementing the OpenAI batch API, including
+    samfkurator.testing.batch_server for offline tests.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        base_url: str,
+        api_key_env: str = "DEEPSEEK_API_KEY",
+        http_client=None,
+    ):
+        from openai import OpenAI
+
+        api_key = os.environ.get(api_key_env)
+        if not api_key:
+            raise ValueError(f"{api_key_env} environment variable not set")
+        self.model = model
+        self.client = OpenAI(
+            api_key=api_key, base_url=base_url, http_client=http_client
+        )
+
+    def submit(self, articles: list[Article]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": _custom_id(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": DEEP_READ_SYSTEM_PROMPT},
+                        {"role": "user", "content": self._deep_read_prompt(a)},
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "temperature": 0.2,
+                    "max_tokens": 500,
+                },
+            }, ensure_ascii=False)
+            for i, a in enumerate(articles)
+        ]
+        upload = self.client.files.create(
+            file=("samfkurator-batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def poll(self, job_id: str) -> str:
+        status = self.client.batches.retrieve(job_id).status
+        if status == "completed":
+            return DONE
+        if status in ("failed", "expired", "cancelled"):
+            return FAILED
+        return PENDING
+
+    def results(self, job_id: str) -> dict[str, str]:
+        batch = self.client.batches.retrieve(job_id)
+        if not batch.output_file_id:
+            return {}
+        content = self.client.files.content(batch.output_file_id).text
+        out = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            choices = response.get("body", {}).get("choices", [])
+            if choices:
+                out[item["custom_id"]] = choices[0]["message"]["content"]
+        return out
+
+
+def create_batch_provider(backend_name: str, ai: AIConfig, boilerplate=None):
+    """Batch provider for a backend name (ollama has no batch API).
+
+    Uses the provider's pooled client from scoring/registry.py, and selects
+    article text like the live backend: its text_budget_tokens and the
+    repeated-paragraph index `boilerplate` (scoring/salient.py).
+    """
+    from samfkurator.scoring.registry import http_client
+
+    if backend_name == "claude":
+        provider = AnthropicBatchProvider(
+            ai.claude.model, http_client("claude", ai.http)
+        )
+    elif backend_name == "gemini":
+        provider = GeminiBatchProvider(
+            ai.gemini.model, http_client("gemini", ai.http)
+        )
+    elif backend_name == "deepseek":
+        provider = OpenAIBatchProvider(
+            ai.deepseek.model,
+            ai.deepseek.batch_base_url or ai.deepseek.base_url,
+            http_client=http_client("deepseek", ai.http),
+        )
+    else:
+        raise ValueError(f"Batch-scoring understøttes ikke for {backend_name}")
+    provider.set_text(ai.backend_config(backend_name).text_budget_tokens, boilerplate)
+    return provider
+
+
+def submit_batch(
+    db: Database,
+    provider,
+    backend_name: str,
+    articles: list[Article],
+    min_score: int = 0,
+) -> str | None:
+    """Save articles as pending and submit them as one batch job.
+
+    Results scoring below `min_score` are dropped at collection time (the
+    agent only keeps relevant articles).
+    """
+    articles = [a for a in articles if not db.is_batch_pending(a.url)]
+    if not articles:
+        return None
+    for article in articles:
+        db.save_article(article)
+    job_id = provider.submit(articles)
+    db.save_batch_job(
+        job_id, backend_name, [a.url for a in articles], min_score
+    )
+    return job_id
+
+
+def collect_batches(db: Database, provider, backend_name: str) -> dict:
+    """Poll open jobs for this backend and save finished results.
+
+    Returns counters: jobs finished, scored, dropped (below min_score),
+    failed (no or unparseable answer) and still pending jobs.
+    """
+    stats = {"jobs": 0, "scored": 0, "dropped": 0, "failed": 0, "pending": 0}
+    for job_id in db.get_open_batch_jobs(backend_name):
+        status = provider.poll(job_id)
+        if status == PENDING:
+            stats["pending"] += 1
+            continue
+
+        results = provider.results(job_id) if status == DONE else {}
+        for position, url, min_score in db.get_batch_items(job_id):
+            raw = results.get(_custom_id(position))
+            result = (
+                parse_scoring_response(raw, url, backend_name) if raw else None
+            )
+            if result is None:
+                stats["failed"] += 1
+            elif result.overall_score < min_score:
+                db.delete_article(url)
+                stats["dropped"] += 1
+            else:
+                db.save_score(result)
+                stats["scored"] += 1
+        db.finish_batch_job(job_id, status)
+        stats["jobs"] += 1
+    return stats
@@ -0,0 +1,109 @@
+"""Per-run limits on wall time, LLM calls, tokens, cost and a deadline.
+
+Used by the agent's global mode and the feed pipeline's scoring queue:
+work is started in rank order, and the run stops starting new work once
+any limit is reached. Calls, tokens and cost are counted over the backend
+and its fallbacks (and cascade tier); cost is estimated from each
+backend's model with scoring/telemetry.py's prices.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from samfkurator.scoring.telemetry import DEFAULT_PRICES, estimate_cost
+
+
+def time_of_day(value: str) -> tuple[int, int]:
+    """(hour, minute) of "HH:MM"; ValueError with a message for the user."""
+    hour, sep, minute = value.strip().partition(":")
+    if (
+        sep and hour.isdigit() and minute.isdigit() and len(minute) == 2
+        and int(hour) < 24 and int(minute) < 60
+    ):
+        return int(hour), int(minute)
+    raise ValueError(f"Ugyldigt klokkeslæt {value!r}: brug HH:MM, fx 06:45")
+
+
+def parse_deadline(value: str, now: datetime | None = None) -> datetime | None:
+    """The next time of day "HH:MM" after `now` (None for "")."""
+    if not value:
+        return None
+    now = now or datetime.now()
+    hour, minute = time_of_day(value)
+    deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline
+
+
+@dataclass
+class RunBudget:
+    """A limit of 0 means unlimited."""
+
+    max_seconds: float = 0.0
+    max_calls: int = 0
+    max_tokens: int = 0
+    max_cost: float = 0.0
+    # Wall-clock time by which the run must stop starting work
+    deadline: datetime | None = None
+    # USD per million tokens by model prefix, merged over DEFAULT_PRICES
+    prices: dict = field(default_factory=dict)
+    _started: float = field(default=0.0, repr=False)
+    _base_calls: int = field(default=0, repr=False)
+    _base_tokens: int = field(default=0, repr=False)
+    _base_cost: float = field(default=0.0, repr=False)
+
+    def _totals(self, backend) -> tuple[int, int, float]:
+        calls = tokens = 0
+        cost = 0.0
+        prices = {**DEFAULT_PRICES, **self.prices}
+        for b in backend.chain():
+            usage = b.usage
+            calls += usage.calls
+            tokens += usage.input_tokens + usage.output_tokens
+            cost += estimate_cost(
+                b.model, usage.input_tokens, usage.output_tokens,
+                usage.cached_tokens, prices,
+            )
+        return calls, tokens, cost
+
+    def start(self, backend) -> "RunBudget":
+        """Count from now and from the backend's current usage."""
+        self._started = time.monotonic()
+        self._base_calls, self._base_tokens, self._base_cost = self._totals(backend)
+        return self
+
+    def spent(self, backend) -> dict:
+        calls, tokens, cost = self._totals(backend)
+        return {
+            "seconds": round(time.monotonic() - self._started, 1),
+            "calls": calls - self._base_calls,
+            "tokens": tokens - self._base_tokens,
+            "cost_usd": round(cost - self._base_cost, 4),
+        }
+
+    def exhausted(self, backend) -> str | None:
+        """Name of the first limit reached, or None."""
+        spent = self.spent(backend)
+        if self.max_seconds and spent["seconds"] >= self.max_seconds:
+            return "tid"
+        if self.deadline and datetime.now() >= self.deadline:
+            return "deadline"
+        if self.max_calls and spent["calls"] >= self.max_calls:
+            return "kald"
+        if self.max_tokens and spent["tokens"] >= self.max_tokens:
+            return "tokens"
+        if self.max_cost and spent["cost_usd"] >= self.max_cost:
+            return "omkostning"
+        return None
+
+    def summary(self, backend) -> str:
+        spent = self.spent(backend)
+        return (
+            f"{spent['seconds']:.0f}/{self.max_seconds or '∞'} s · "
+            f"{spent['calls']}/{self.max_calls or '∞'} kald · "
+            f"{spent['tokens']:,}/{self.max_tokens or '∞'} tokens · "
+            f"${spent['cost_usd']:.4f}/{self.max_cost or '∞'}"
+            + (f" · deadline {self.deadline:%H:%M}" if self.deadline else "")
+        )
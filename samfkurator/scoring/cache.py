@@ -0,0 +1,167 @@
+"""Persistent LLM response cache.
+
+Answers are keyed by (backend, model, prompt hash, text hash). For a deep
+read the prompt part is the system prompt and the template the article is
+rendered into, and the text part the article text itself, so a crashed run,
+a `--no-jitter` re-run or the same text under another URL or source never
+pays for the same call twice. A skim's text part is its list of headlines.
+Entries expire after `ttl_days` and the least recently used are evicted
+beyond `max_entries`.
+
+The cache keeps its own SQLite connection: backends call it from the
+score_many worker threads, which the main Database connection doesn't allow.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    backend TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    raw TEXT NOT NULL,
+    parsed TEXT,
+    created_at TEXT NOT NULL,
+    last_used TEXT NOT NULL,
+    hits INTEGER DEFAULT 0,
+    PRIMARY KEY (backend, model, prompt_hash, text_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+"""
+
+# Run eviction after this many writes (and once on open)
+EVICT_EVERY = 200
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Raw + parsed LLM answers in SQLite. Thread-safe."""
+
+    def __init__(
+        self,
+        path: str = "./samfkurator.db",
+        ttl_days: int = 30,
+        max_entries: int = 20000,
+    ):
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(CREATE_TABLE)
+        self.evict()
+
+    def get(
+        self, backend: str, model: str, prompt: str, text: str
+    ) -> tuple[str, object] | None:
+        """Return (raw, parsed) for a cached answer, or None on a miss."""
+        key = (backend, model, content_hash(prompt), content_hash(text))
+        now = datetime.now()
+        with self._lock:
+            row = self.db.execute(
+                """SELECT raw, parsed, created_at FROM llm_cache
+                   WHERE backend = ? AND model = ? AND prompt_hash = ?
+                     AND text_hash = ?""",
+                key,
+            ).fetchone()
+            if row is None or self._expired(row[2], now):
+                self.misses += 1
+                return None
+            self.db.execute(
+                """UPDATE llm_cache SET hits = hits + 1, last_used = ?
+                   WHERE backend = ? AND model = ? AND prompt_hash = ?
+                     AND text_hash = ?""",
+                (now.isoformat(), *key),
+            )
+            self.db.commit()
+            self.hits += 1
+        return row[0], json.loads(row[1]) if row[1] else None
+
+    def put(
+        self,
+        backend: str,
+        model: str,
+        prompt: str,
+        text: str,
+        raw: str,
+        parsed: object = None,
+    ) -> None:
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?,?,?,?,?,?,?,?,0)",
+                (
+                    backend,
+                    model,
+                    content_hash(prompt),
+                    content_hash(text),
+                    raw,
+                    json.dumps(parsed, ensure_ascii=False)
+                    if parsed is not None else None,
+                    now,
+                    now,
+                ),
+            )
+            self.db.commit()
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict()
+
+    def _expired(self, created_at: str, now: datetime) -> bool:
+        if not self.ttl_days:
+            return False
+        return datetime.fromisoformat(created_at) < now - timedelta(
+            days=self.ttl_days
+        )
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to max_entries. Returns rows removed."""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        removed = 0
+        if self.ttl_days:
+            cutoff = datetime.now() - timedelta(days=self.ttl_days)
+            removed += self.db.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?",
+                (cutoff.isoformat(),),
+            ).rowcount
+        if self.max_entries:
+            removed += self.db.execute(
+                """DELETE FROM llm_cache WHERE rowid IN (
+                       SELECT rowid FROM llm_cache ORDER BY last_used DESC
+                       LIMIT -1 OFFSET ?)""",
+                (self.max_entries,),
+            ).rowcount
+        self.db.commit()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.db.execute("DELETE FROM llm_cache")
+            self.db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits · {self.misses} misses "
+            f"({self.hit_rate:.0%} fra LLM-cache)"
+        )
+
+    def close(self) -> None:
+        self.db.close()
@@ -0,0 +1,220 @@
+"""Cheap-to-expensive model cascade for deep reads.
+
+Most articles are clearly irrelevant or clearly relevant; only the middle
+band needs the strong model. With a cascade the configured backend (the
+full tier) gets a fast tier in front of it - a small Ollama model or a
+flash model. Every article is read by the fast tier first, and its score
+is kept when it is a confident extreme: below `accept_below` or above
+`accept_above` for the article's primary discipline. Borderline scores
+and low-confidence answers (failed, or an overall score that disagrees
+with the discipline scores by more than `max_discipline_gap`) are read
+again by the full tier.
+
+A `validation_rate` share of the accepted fast scores is read by the full
+tier as well, which keeps the full score and measures how often the fast
+tier would have decided the same way. Each saved score records the tier
+that produced it (scores.tier).
+"""
+
+import random
+import threading
+from dataclasses import dataclass, field
+
+from samfkurator.models import Article, ScoringResult
+
+# Tier that produced a score (ScoringResult.tier, scores.tier)
+FAST = "fast"
+FULL = "full"
+
+# Why a fast score was escalated
+BORDERLINE = "borderline"
+LOW_CONFIDENCE = "low_confidence"
+FAILED = "failed"
+
+
+@dataclass
+class CascadeStats:
+    """Cascade decisions over a run. Thread-safe."""
+
+    scored: int = 0
+    accepted: int = 0
+    borderline: int = 0
+    low_confidence: int = 0
+    failed: int = 0
+    # Accepted fast scores also read by the full tier
+    validated: int = 0
+    # ... where the full score fell in the same accepted band
+    agreed: int = 0
+    # ... where the two overall scores were at most one apart
+    within_one: int = 0
+    abs_diff: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def count(self, **increments: int) -> None:
+        with self._lock:
+            for name, n in increments.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    @property
+    def escalated(self) -> int:
+        return self.borderline + self.low_confidence + self.failed
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.scored if self.scored else 0.0
+
+    @property
+    def agreement(self) -> float | None:
+        return self.agreed / self.validated if self.validated else None
+
+    def as_dict(self) -> dict:
+        return {
+            **{k: v for k, v in self.__dict__.items() if not k.startswith("_")},
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalation_rate, 3),
+            "agreement": (
+                round(self.agreement, 3) if self.agreement is not None else None
+            ),
+            "mean_abs_diff": (
+                round(self.abs_diff / self.validated, 2) if self.validated else None
+            ),
+        }
+
+    def summary(self) -> str:
+        agreement = (
+            f"{self.agreement:.0%} enige ({self.validated} kontrolleret)"
+            if self.agreement is not None else "ingen kontrol"
+        )
+        return (
+            f"{self.accepted}/{self.scored} afgjort af hurtig model · "
+            f"{self.escalated} eskaleret ({self.escalation_rate:.0%}: "
+            f"{self.borderline} grænsetilfælde, {self.low_confidence} usikre, "
+            f"{self.failed} fejlede) · {agreement}"
+        )
+
+
+class Cascade:
+    """The fast tier in front of a backend (see BaseBackend.set_cascade)."""
+
+    def __init__(
+        self,
+        fast,
+        accept_below: int = 4,
+        accept_above: int = 7,
+        thresholds: dict | None = None,
+        max_discipline_gap: int = 3,
+        validation_rate: float = 0.0,
+    ):
+        self.fast = fast
+        self.accept_below = accept_below
+        self.accept_above = accept_above
+        self.thresholds = thresholds or {}
+        self.max_discipline_gap = max_discipline_gap
+        self.validation_rate = validation_rate
+        self.stats = CascadeStats()
+
+    def bounds(self, discipline: str) -> tuple[int, int]:
+        """(accept_below, accept_above) for a primary discipline."""
+        own = self.thresholds.get(discipline) or {}
+        return (
+            own.get("accept_below", self.accept_below),
+            own.get("accept_above", self.accept_above),
+        )
+
+    def _accepted_band(self, score: int, discipline: str) -> str | None:
+        below, above = self.bounds(discipline)
+        if score < below:
+            return "low"
+        if score > above:
+            return "high"
+        return None
+
+    def decide(self, result: ScoringResult | None) -> str | None:
+        """None to keep a fast result, else why it goes to the full tier."""
+        if result is None or result.backend_used != self.fast.name:
+            # Failed, or answered by a fallback rather than the fast model
+            return FAILED
+        best = max(vars(result.disciplines).values())
+        if abs(result.overall_score - best) > self.max_discipline_gap:
+            return LOW_CONFIDENCE
+        if self._accepted_band(result.overall_score, result.primary_discipline):
+            return None
+        return BORDERLINE
+
+    def _validate(self, fast: ScoringResult, full: ScoringResult | None) -> None:
+        if full is None:
+            return
+        band = self._accepted_band(fast.overall_score, fast.primary_discipline)
+        diff = abs(fast.overall_score - full.overall_score)
+        self.stats.count(
+            validated=1,
+            agreed=int(
+                self._accepted_band(full.overall_score, fast.primary_discipline)
+                == band
+            ),
+            within_one=int(diff <= 1),
+            abs_diff=diff,
+        )
+
+    def _decision(self, result: ScoringResult | None) -> str | None:
+        reason = self.decide(result)
+        self.stats.count(scored=1, **{reason or "accepted": 1})
+        return reason
+
+    def _settle(
+        self, fast: ScoringResult | None, full: ScoringResult | None
+    ) -> ScoringResult | None:
+        """The result to keep once the full tier has (or hasn't) read it.
+
+        `fast` is the accepted fast result when the full read was a
+        validation, else None.
+        """
+        if full is not None:
+            full.tier = FULL
+        if fast is None:
+            return full
+        self._validate(fast, full)
+        if full is not None:
+            return full
+        fast.tier = FAST
+        return fast
+
+    def score(self, article: Article, read_full) -> ScoringResult | None:
+        """Score one article; `read_full(article)` is the full tier."""
+        fast = self.fast.score_article(article)
+        if self._decision(fast) is not None:
+            return self._settle(None, read_full(article))
+        if random.random() < self.validation_rate:
+            return self._settle(fast, read_full(article))
+        fast.tier = FAST
+        return fast
+
+    def score_packed(
+        self, articles: list[Article], read_full
+    ) -> list[tuple[Article, ScoringResult | None]]:
+        """Score a group; `read_full(articles)` is the full tier's packed read.
+
+        Escalated and validated articles go to the full tier as one group.
+        """
+        if self.fast.pack_size > 1:
+            fast = self.fast.score_packed(articles)
+        else:
+            fast = [(a, self.fast.score_article(a)) for a in articles]
+        done, escalate = [], []
+        for article, result in fast:
+            if self._decision(result) is not None:
+                escalate.append((article, None))
+            elif random.random() < self.validation_rate:
+                escalate.append((article, result))
+            else:
+                result.tier = FAST
+                done.append((article, result))
+        if escalate:
+            full = {a.url: r for a, r in read_full([a for a, _ in escalate])}
+            done += [
+                (article, self._settle(accepted, full.get(article.url)))
+                for article, accepted in escalate
+            ]
+        return done
@@ -1,34 +1,57 @@
 from anthropic import Anthropic
 
-from samfkurator.models import Article, ScoringResult
-from samfkurator.scoring.prompt import (
-    SYSTEM_PROMPT,
-    build_scoring_prompt,
-    parse_scoring_response,
-)
+from samfkurator.scoring.base import SKIM, BaseBackend
 
 
-class ClaudeBackend:
-    def __init__(self, model: str = "claude-sonnet-4-20250514"):
+class ClaudeBackend(BaseBackend):
+    name = "claude"
+
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        prompt_cache: bool = True,
+        http_client=None,
+        base_url: str = "",
+    ):
         self.model = model
-        self.client = Anthropic()
-
-    def score_article(self, article: Article) -> ScoringResult | None:
-        prompt = build_scoring_prompt(
-            article.title,
-            article.scoring_text,
-            article.source_name,
-            article.language,
+        self.prompt_cache = prompt_cache
+        # Retries are handled by BaseBackend._call (scoring/resilience.py);
+        # http_client is the shared pool from scoring/registry.py
+        self.client = Anthropic(
+            max_retries=0, http_client=http_client, base_url=base_url or None
+        )
+
+    def _system(self, text: str) -> list[dict] | str:
+        """System prompt with a cache breakpoint after the static curriculum.
+
+        Everything up to the breakpoint is byte-identical between calls, so
+        Anthropic serves it from the prompt cache instead of re-reading it.
+        """
+        if not self.prompt_cache:
+            return text
+        return [
+            {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def _record_usage(self, response) -> None:
+        u = response.usage
+        cache_read = getattr(u, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(u, "cache_creation_input_tokens", 0) or 0
+        self.usage.add(
+            input_tokens=u.input_tokens + cache_read + cache_write,
+            output_tokens=u.output_tokens,
+            cached_tokens=cache_read,
+            cache_write_tokens=cache_write,
         )
 
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=400,
-                system=SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            raw = response.content[0].text
-            return parse_scoring_response(raw, article.url, "claude")
-        except Exception:
-            return None
+    def _complete(
+        self, kind: str, system: str, prompt: str, max_tokens: int = 0
+    ) -> str:
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens or (200 if kind == SKIM else 400),
+            system=self._system(system),
+            messages=[{"role": "user", "content": prompt}],
+        )
+        self._record_usage(response)
+        return response.content[0].text
@@ -0,0 +1,119 @@
+"""Pick the curriculum sections a deep-read prompt needs.
+
+The deep-read system prompt normally carries the whole curriculum, all
+five disciplines. With `ai.curriculum_sections` set, each article's text
+is matched against the curriculum terms of every discipline, and only the
+best-matching sections go into the prompt in full, with a one-line index
+of the rest (prompt.build_deep_read_system).
+
+Matching is TF-IDF over the curriculum: a term counts log(1 + hits) in
+the article, weighted by how few sections list it. Curriculum terms are
+rare in news text, so everyday cue words per discipline ("folketinget",
+"inflation", "sanktioner") count too, at half weight. A section is kept when
+it scores at least `MIN_SHARE` of the best one. An article that matches
+no term at all gets the full curriculum, since nothing says which
+sections it needs.
+"""
+
+import math
+import re
+
+from samfkurator.scoring.prompt import CURRICULUM_SECTIONS, build_deep_read_system
+from samfkurator.scoring.salient import curriculum_terms
+
+# A section is kept when it scores at least this share of the best section
+MIN_SHARE = 0.35
+CUE_WEIGHT = 0.5
+
+# Word starts, so inflected forms match ("ministeren", "skatterne")
+_CUES = {
+    "politik": (
+        "folketing", "regering", "minister", "statsminister", "parti", "valg",
+        "vælger", "lovforslag", "borgmester", "kommunalvalg", "opposition",
+        "demokrati", "meningsmåling", "politiker",
+    ),
+    "sociologi": (
+        "familie", "børn", "unge", "skole", "uddannelse", "køn", "ligestilling",
+        "indvandrer", "integration", "kultur", "fællesskab", "ensomhed",
+        "diskrimination", "religion",
+    ),
+    "okonomi": (
+        "økonomi", "vækst", "priser", "skat", "løn", "arbejdsløs", "ledig",
+        "virksomhed", "kroner", "budget", "nationalbank", "boligmarked",
+        "eksport", "told",
+    ),
+    "international_politik": (
+        "usa", "rusland", "kina", "ukraine", "fn", "krig", "sanktion",
+        "udenrigs", "traktat", "topmøde", "præsident", "diplomat", "grænse",
+        "atomvåben",
+    ),
+    "metode": (
+        "undersøgelse", "måling", "procent", "forsker", "rapport", "data",
+        "statistik", "analyse", "spørgeskema", "interview",
+    ),
+}
+
+SECTION_TERMS = {d: curriculum_terms(s) for d, s in CURRICULUM_SECTIONS.items()}
+# Terms that appear in several sections (Huntington, globalisering) say
+# less about the discipline
+_SECTIONS_PER_TERM: dict[str, int] = {}
+for _terms in SECTION_TERMS.values():
+    for _term in _terms:
+        _SECTIONS_PER_TERM[_term] = _SECTIONS_PER_TERM.get(_term, 0) + 1
+
+
+def _matcher(terms) -> re.Pattern:
+    terms = sorted(terms, key=len, reverse=True)
+    return re.compile(
+        r"\b(" + "|".join(re.escape(t) for t in terms) + ")", re.IGNORECASE
+    )
+
+
+_MATCHERS = {d: _matcher(terms) for d, terms in SECTION_TERMS.items()}
+_CUE_MATCHERS = {d: _matcher(cues) for d, cues in _CUES.items()}
+
+
+def section_scores(text: str) -> dict[str, float]:
+    """TF-IDF relevance of each curriculum section to `text`."""
+    n_sections = len(SECTION_TERMS)
+
+    def weigh(matcher: re.Pattern) -> float:
+        hits: dict[str, int] = {}
+        for match in matcher.finditer(text):
+            term = match.group(1).lower()
+            hits[term] = hits.get(term, 0) + 1
+        return sum(
+            math.log1p(n) * math.log(1 + n_sections / _SECTIONS_PER_TERM.get(t, 1))
+            for t, n in hits.items()
+        )
+
+    return {
+        d: weigh(_MATCHERS[d]) + CUE_WEIGHT * weigh(_CUE_MATCHERS[d])
+        for d in SECTION_TERMS
+    }
+
+
+def select_sections(text: str, max_sections: int) -> tuple[str, ...]:
+    """Up to `max_sections` disciplines for `text`, in curriculum order;
+    every discipline when nothing matches."""
+    scores = section_scores(text)
+    best = max(scores.values(), default=0.0)
+    if best <= 0:
+        return tuple(CURRICULUM_SECTIONS)
+    ranked = sorted(
+        (d for d, s in scores.items() if s >= MIN_SHARE * best),
+        key=scores.get, reverse=True,
+    )[:max_sections]
+    return tuple(d for d in CURRICULUM_SECTIONS if d in ranked)
+
+
+def system_for(texts: list[str], max_sections: int) -> str:
+    """Deep-read system prompt for the article texts in one request (one,
+    or a packed group): the union of their sections. `max_sections` 0 =
+    the full curriculum."""
+    if not max_sections:
+        return build_deep_read_system(())
+    sections: set[str] = set()
+    for text in texts:
+        sections.update(select_sections(text, max_sections))
+    return build_deep_read_system(sections)
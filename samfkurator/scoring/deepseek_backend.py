@@ -1,66 +1,66 @@
 """DeepSeek API backend (OpenAI-compatible) for article scoring."""
 
-import json
 import os
 
 from openai import OpenAI
 
-from samfkurator.models import Article, ScoringResult
-from samfkurator.scoring.prompt import DEEP_READ_SYSTEM_PROMPT, build_deep_read_prompt, parse_scoring_response
+from samfkurator.scoring.base import SKIM, BaseBackend
 
 
-class DeepSeekBackend:
-    def __init__(self, model: str = "deepseek-chat"):
+class DeepSeekBackend(BaseBackend):
+    """DeepSeek caches identical message prefixes automatically.
+
+    The system prompts are module constants and always sent first, so the
+    curriculum prefix is byte-stable and served from DeepSeek's context
+    cache after the first call. Never put per-article text before them.
+    """
+
+    name = "deepseek"
+
+    def __init__(
+        self,
+        model: str = "deepseek-chat",
+        base_url: str = "https://api.deepseek.com",
+        http_client=None,
+    ):
         self.model = model
         api_key = os.environ.get("DEEPSEEK_API_KEY")
         if not api_key:
             raise ValueError("DEEPSEEK_API_KEY environment variable not set")
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com",
+            base_url=base_url,
+            # Retries are handled by BaseBackend._call (scoring/resilience.py)
+            max_retries=0,
+            # Shared pool from scoring/registry.py (None = the SDK's own)
+            http_client=http_client,
         )
 
-    def score_article(self, article: Article) -> ScoringResult | None:
-        prompt = build_deep_read_prompt(
-            article.title,
-            article.scoring_text,
-            article.source_name,
-            article.language,
+    def _record_usage(self, response) -> None:
+        u = response.usage
+        if u is None:
+            return
+        self.usage.add(
+            input_tokens=u.prompt_tokens,
+            output_tokens=u.completion_tokens,
+            cached_tokens=getattr(u, "prompt_cache_hit_tokens", 0) or 0,
         )
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": DEEP_READ_SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.2,
-                max_tokens=500,
-            )
-            raw = response.choices[0].message.content
-            return parse_scoring_response(raw, article.url, "deepseek")
-        except Exception:
-            return None
 
-    def skim(self, headlines: list[dict]) -> list[int]:
-        from samfkurator.scoring.prompt import SKIM_SYSTEM_PROMPT, build_skim_prompt
-        prompt = build_skim_prompt(headlines)
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SKIM_SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,
-                max_tokens=200,
-            )
-            data = json.loads(response.choices[0].message.content)
-            return [int(i) for i in data.get("relevant_indices", [])]
-        except Exception:
-            return list(range(len(headlines)))
+    def _complete(
+        self, kind: str, system: str, prompt: str, max_tokens: int = 0
+    ) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1 if kind == SKIM else 0.2,
+            max_tokens=max_tokens or (200 if kind == SKIM else 500),
+        )
+        self._record_usage(response)
+        return response.choices[0].message.content
 
     def is_available(self) -> bool:
         return bool(os.environ.get("DEEPSEEK_API_KEY"))
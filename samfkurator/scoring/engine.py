@@ -0,0 +1,175 @@
+"""Concurrent scoring with bounded in-flight requests and rate limits.
+
+Hosted backends spend most of a `score_article` call waiting on the network,
+so we run several calls at once from a thread pool. A per-backend
+RateLimiter (applied to every call in BaseBackend._call) keeps us under
+requests-per-minute and tokens-per-minute quotas.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator
+
+from samfkurator.models import Article, ScoringResult
+from samfkurator.scoring.prompt import DEEP_READ_SYSTEM_PROMPT
+
+# Output budget reserved per deep-read call when counting tokens per minute
+SCORE_OUTPUT_TOKENS = 500
+# Packed requests: output reserved per article, plus the provider's cap on
+# output tokens per request (which bounds K as much as the context does)
+PACKED_OUTPUT_TOKENS = 350
+MAX_PACKED_OUTPUT_TOKENS = 8000
+# Article header and instructions around each article in a packed prompt
+PACKED_OVERHEAD_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def pack_articles(
+    articles: list[Article], context_window: int, max_pack: int
+) -> list[list[Article]]:
+    """Group articles greedily so each packed request fits the model.
+
+    K adapts to the articles: long texts give smaller groups, and no group
+    exceeds `max_pack` articles, the context window (system prompt, texts
+    and reserved answers) or the per-request output cap.
+    """
+    max_pack = max(1, min(max_pack, MAX_PACKED_OUTPUT_TOKENS // PACKED_OUTPUT_TOKENS))
+    budget = (
+        context_window
+        - estimate_tokens(DEEP_READ_SYSTEM_PROMPT)
+        - SCORE_OUTPUT_TOKENS
+    )
+    groups: list[list[Article]] = []
+    current: list[Article] = []
+    used = 0
+    for article in articles:
+        need = (
+            estimate_tokens(article.scoring_text)
+            + PACKED_OVERHEAD_TOKENS
+            + PACKED_OUTPUT_TOKENS
+        )
+        if current and (len(current) >= max_pack or used + need > budget):
+            groups.append(current)
+            current, used = [], 0
+        current.append(article)
+        used += need
+    if current:
+        groups.append(current)
+    return groups
+
+
+class RateLimiter:
+    """Sliding one-minute window over requests and tokens. Thread-safe.
+
+    A limit of 0 means unlimited.
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._events: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._events and now - self._events[0][0] >= self.WINDOW:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _wait_time(self, now: float, tokens: int) -> float:
+        if not self._events:
+            return 0.0
+        waits = [0.0]
+        if (
+            self.requests_per_minute
+            and len(self._events) >= self.requests_per_minute
+        ):
+            oldest = self._events[len(self._events) - self.requests_per_minute]
+            waits.append(oldest[0] + self.WINDOW - now)
+        if (
+            self.tokens_per_minute
+            and self._tokens_in_window + tokens > self.tokens_per_minute
+        ):
+            # Wait until enough old events have left the window
+            excess = self._tokens_in_window + tokens - self.tokens_per_minute
+            freed = 0
+            for t, used in self._events:
+                freed += used
+                if freed >= excess:
+                    waits.append(t + self.WINDOW - now)
+                    break
+        return max(waits)
+
+    def acquire(self, tokens: int = 0):
+        """Block until a request using `tokens` fits in the window."""
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                wait = self._wait_time(now, tokens)
+                if wait <= 0:
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+            time.sleep(min(wait, self.WINDOW))
+
+
+def score_many(
+    backend,
+    articles: list[Article],
+    max_concurrency: int = 1,
+) -> Iterator[tuple[Article, ScoringResult | None]]:
+    """Score articles concurrently, yielding (article, result) as they finish.
+
+    Results come back in completion order, so callers can persist each one
+    immediately. Persist from the calling thread: the generator runs there.
+
+    Backends with pack_size > 1 score groups from `pack_articles` with one
+    `score_packed` call each. Rate limits are applied per call by the
+    backend (BaseBackend._call).
+    """
+    if getattr(backend, "pack_size", 1) > 1:
+        yield from _score_packed_many(backend, articles, max_concurrency)
+        return
+
+    if max_concurrency <= 1:
+        for article in articles:
+            yield article, backend.score_article(article)
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = {pool.submit(backend.score_article, a): a for a in articles}
+        for future in as_completed(futures):
+            article = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            yield article, result
+
+
+def _score_packed_many(
+    backend,
+    articles: list[Article],
+    max_concurrency: int,
+) -> Iterator[tuple[Article, ScoringResult | None]]:
+    groups = pack_articles(articles, backend.context_window, backend.pack_size)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = {pool.submit(backend.score_packed, g): g for g in groups}
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except Exception:
+                for article in futures[future]:
+                    yield article, None
@@ -0,0 +1,285 @@
+"""Project a run's LLM calls, tokens, cost and wall time without an LLM.
+
+`samfkurator estimate` fetches the feeds and drops articles that are
+already scored, batched or queued, like `daily`. From those it builds the
+prompts a run would send:
+
+  skim   one build_skim_prompt per SKIM_BATCH_SIZE headlines of a source,
+         for headlines without a reusable skim decision
+  score  a build_deep_read_prompt (or build_packed_prompt per pack) for
+         every queued article and every new article the skim is expected
+         to keep
+
+Tokens are counted per backend with CHARS_PER_TOKEN, a closer fit to each
+provider's tokenizer on Danish news text than the four characters per
+token used for rate limiting. Which new articles the skim keeps is not
+known before the call, so their deep reads count at the historical skim
+selection rate. The text extraction is skipped as well, so articles
+without full text are padded to the mean stored text length, up to the
+backend's text budget.
+
+Output tokens, latency and prompt-cache share come from the backend's
+earlier calls in llm_calls (scoring/telemetry.py), with DEFAULTS where
+there is no history. Wall time is the calls at median latency spread over
+max_concurrency (skims run one at a time), but no faster than the
+backend's requests and tokens per minute allow.
+"""
+
+import math
+from dataclasses import dataclass
+
+from samfkurator.models import Article
+from samfkurator.scoring.base import PACKED, SCORE, SKIM
+from samfkurator.scoring.curriculum import system_for
+from samfkurator.scoring.engine import pack_articles
+from samfkurator.scoring.prompt import (
+    DEEP_READ_SYSTEM_PROMPT,
+    SKIM_PROMPT_VERSION,
+    SKIM_SYSTEM_PROMPT,
+    build_deep_read_prompt,
+    build_packed_prompt,
+    build_skim_prompt,
+)
+from samfkurator.scoring.salient import SourceBoilerplate, TextSelector
+from samfkurator.scoring.skim import SKIM_BATCH_SIZE, title_hash
+from samfkurator.scoring.telemetry import (
+    DEFAULT_PRICES,
+    estimate_cost,
+    kind_history,
+)
+
+# Characters per token on Danish news text, by backend
+CHARS_PER_TOKEN = {"claude": 3.4, "gemini": 3.9, "deepseek": 3.6, "ollama": 3.7}
+
+# Used where llm_calls has no history for the backend and model
+DEFAULTS = {
+    SKIM: {"latency_ms_p50": 2500, "output_tokens": 60},
+    SCORE: {"latency_ms_p50": 5000, "output_tokens": 260},
+    # Packed output is counted per article from SCORE
+    PACKED: {"latency_ms_p50": 12000},
+}
+DEFAULT_SKIM_SELECTION = 0.35
+
+
+def count_tokens(text: str, backend: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN.get(backend, 4.0))
+
+
+@dataclass
+class Phase:
+    name: str
+    calls: float = 0.0
+    # Articles deep-read (several per call when packing)
+    articles: float = 0.0
+    input_tokens: float = 0.0
+    cached_tokens: float = 0.0
+    output_tokens: float = 0.0
+    cost_usd: float = 0.0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "phase": self.name,
+            "calls": round(self.calls),
+            "articles": round(self.articles),
+            "input_tokens": round(self.input_tokens),
+            "cached_tokens": round(self.cached_tokens),
+            "output_tokens": round(self.output_tokens),
+            "cost_usd": round(self.cost_usd, 4),
+            "seconds": round(self.seconds),
+        }
+
+
+def _caches_prefix(backend: str, ai) -> bool:
+    """Whether the provider serves a repeated system prompt from cache."""
+    if backend == "claude":
+        return ai.claude.prompt_cache
+    if backend == "gemini":
+        return ai.gemini.cache_ttl_seconds > 0
+    return backend == "deepseek"
+
+
+class Estimator:
+    """Builds the run's prompts and prices them; see the module docstring."""
+
+    def __init__(self, db, db_path: str, ai, backend: str, since: str = ""):
+        self.db = db
+        self.ai = ai
+        self.backend = backend
+        self.config = ai.backend_config(backend)
+        self.model = self.config.model
+        self.history = kind_history(db_path, backend, self.model, since)
+        rate = db.get_skim_selection_rate(since)
+        self.skim_selection = DEFAULT_SKIM_SELECTION if rate is None else rate
+        self.mean_text_chars = db.get_mean_text_length() or 0.0
+        self.selector = TextSelector(SourceBoilerplate(db_path))
+        self.prices = {**DEFAULT_PRICES, **ai.prices}
+
+    def _tokens(self, text: str) -> int:
+        return count_tokens(text, self.backend)
+
+    def _measured(self, kind: str, key: str) -> float:
+        return self.history.get(kind, DEFAULTS[kind]).get(key, DEFAULTS[kind][key])
+
+    def _text(self, article: Article, fetch_full_text: bool) -> tuple[str, int]:
+        """Deep-read text and the tokens extraction would add to it."""
+        text = self.selector.scoring_text(article, self.config.text_budget_tokens)
+        if article.full_text or not fetch_full_text or article.has_paywall:
+            return text, 0
+        budget = self.config.text_budget_tokens
+        expected = min(
+            budget, count_tokens("x" * int(self.mean_text_chars), self.backend)
+        )
+        return text, max(0, expected - self._tokens(text))
+
+    def _system(self, texts: list[str]) -> str:
+        if not self.ai.curriculum_sections:
+            return DEEP_READ_SYSTEM_PROMPT
+        return system_for(texts, self.ai.curriculum_sections)
+
+    def _price(self, phase: Phase, kind: str, system_tokens: float) -> Phase:
+        """Fill in output, cache, cost and time for `phase`'s calls."""
+        if kind == PACKED:
+            # Packed answers grow with the articles; SCORE measures one
+            phase.output_tokens = phase.articles * self._measured(
+                SCORE, "output_tokens"
+            )
+        else:
+            phase.output_tokens = phase.calls * self._measured(kind, "output_tokens")
+        if kind in self.history:
+            share = self.history[kind]["cache_share"]
+            phase.cached_tokens = phase.input_tokens * share
+        elif _caches_prefix(self.backend, self.ai) and phase.calls > 1:
+            phase.cached_tokens = system_tokens * (phase.calls - 1)
+        phase.cost_usd = estimate_cost(
+            self.model, round(phase.input_tokens), round(phase.output_tokens),
+            round(phase.cached_tokens), self.prices,
+        )
+        parallel = 1 if kind == SKIM else max(1, self.config.max_concurrency)
+        latency = self._measured(kind, "latency_ms_p50") / 1000
+        seconds = phase.calls * latency / parallel
+        if self.config.requests_per_minute:
+            seconds = max(seconds, 60 * phase.calls / self.config.requests_per_minute)
+        if self.config.tokens_per_minute:
+            seconds = max(
+                seconds,
+                60 * (phase.input_tokens + phase.output_tokens)
+                / self.config.tokens_per_minute,
+            )
+        phase.seconds = seconds
+        return phase
+
+    def skim(
+        self, articles: list[Article], ttl_since: str
+    ) -> tuple[Phase, list[Article], list[Article]]:
+        """Skim phase; returns it with the articles whose stored decision
+        keeps them and those the skim still has to decide."""
+        phase = Phase(SKIM)
+        kept, fresh = [], []
+        by_source: dict[str, list[Article]] = {}
+        for article in articles:
+            by_source.setdefault(article.source_name, []).append(article)
+        system_tokens = self._tokens(SKIM_SYSTEM_PROMPT)
+        for source, source_articles in by_source.items():
+            decisions = self.db.get_skim_decisions(
+                source, [a.url for a in source_articles], ttl_since
+            )
+            todo = []
+            for article in source_articles:
+                decision = decisions.get(article.url)
+                if decision and decision[:2] == (
+                    title_hash(article.title), SKIM_PROMPT_VERSION
+                ):
+                    if decision[2]:
+                        kept.append(article)
+                else:
+                    todo.append(article)
+            fresh += todo
+            for start in range(0, len(todo), SKIM_BATCH_SIZE):
+                prompt = build_skim_prompt([
+                    {"title": a.title, "teaser": a.summary[:200], "url": a.url}
+                    for a in todo[start:start + SKIM_BATCH_SIZE]
+                ])
+                phase.calls += 1
+                phase.input_tokens += system_tokens + self._tokens(prompt)
+        return self._price(phase, SKIM, system_tokens), kept, fresh
+
+    def score(
+        self, certain: list[Article], likely: list[Article], share: float,
+        fetch_full_text: bool,
+    ) -> Phase:
+        """Deep-read phase: every article in `certain`, and `share` of the
+        ones in `likely`."""
+        phase = Phase(SCORE if self.config.pack_size <= 1 else PACKED)
+        system_tokens = []
+        for articles, weight in ((certain, 1.0), (likely, share)):
+            if not articles or not weight:
+                continue
+            texts = {a.url: self._text(a, fetch_full_text) for a in articles}
+            if self.config.pack_size <= 1:
+                groups = [[a] for a in articles]
+            else:
+                groups = pack_articles(
+                    articles, self.config.context_window, self.config.pack_size
+                )
+            for group in groups:
+                if len(group) == 1:
+                    a = group[0]
+                    prompt = build_deep_read_prompt(
+                        a.title, texts[a.url][0], a.source_name, a.language
+                    )
+                else:
+                    prompt = build_packed_prompt([
+                        {
+                            "id": f"{i + 1}", "title": a.title,
+                            "text": texts[a.url][0], "source": a.source_name,
+                            "language": a.language,
+                        }
+                        for i, a in enumerate(group)
+                    ])
+                system = self._tokens(
+                    self._system([texts[a.url][0] for a in group])
+                )
+                system_tokens.append(system)
+                phase.calls += weight
+                phase.articles += weight * len(group)
+                phase.input_tokens += weight * (
+                    system + self._tokens(prompt)
+                    + sum(texts[a.url][1] for a in group)
+                )
+        mean_system = sum(system_tokens) / len(system_tokens) if system_tokens else 0
+        return self._price(phase, phase.name, mean_system)
+
+    def run(
+        self, queued: list[Article], new: list[Article], skim: bool,
+        fetch_full_text: bool, ttl_since: str,
+    ) -> dict:
+        """Projection for a run over `queued` and `new` articles."""
+        phases = []
+        if skim and new:
+            skim_phase, kept, fresh = self.skim(new, ttl_since)
+            phases.append(skim_phase)
+            share = self.skim_selection
+            certain, likely = queued + kept, fresh
+        else:
+            certain, likely, share = queued + new, [], 0.0
+        phases.append(self.score(certain, likely, share, fetch_full_text))
+
+        total = Phase("total")
+        for phase in phases:
+            for key in (
+                "calls", "articles", "input_tokens", "cached_tokens",
+                "output_tokens", "cost_usd", "seconds",
+            ):
+                setattr(total, key, getattr(total, key) + getattr(phase, key))
+        return {
+            "backend": self.backend,
+            "model": self.model,
+            "queued": len(queued),
+            "new": len(new),
+            "skim_selection": round(self.skim_selection, 3) if skim else None,
+            "history_calls": sum(h["calls"] for h in self.history.values()),
+            "phases": [p.as_dict() for p in phases],
+            "total": total.as_dict(),
+        }
+
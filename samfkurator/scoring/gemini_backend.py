@@ -1,68 +1,159 @@
 """Google Gemini API backend for article scoring."""
 
-import json
 import os
+import threading
+import time
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
-from samfkurator.models import Article, ScoringResult
-from samfkurator.scoring.prompt import DEEP_READ_SYSTEM_PROMPT, build_deep_read_prompt, parse_scoring_response
+from samfkurator.scoring.base import SKIM, BaseBackend
 
 
-class GeminiBackend:
-    def __init__(self, model: str = "gemini-2.0-flash"):
+def _message(exc: errors.APIError) -> str:
+    return f"{exc.message or ''} {exc.details or ''}".lower()
+
+
+def _uncacheable(exc: Exception) -> bool:
+    """The model can't cache this prompt: too few tokens, or no caching."""
+    if not isinstance(exc, errors.ClientError):
+        return False
+    message = _message(exc)
+    return any(s in message for s in (
+        "too small", "min_total_token_count", "not supported",
+        "does not support",
+    ))
+
+
+def _cache_gone(exc: Exception) -> bool:
+    """The cached-content entry expired or was evicted."""
+    if not isinstance(exc, errors.ClientError) or exc.code not in (400, 403, 404):
+        return False
+    message = _message(exc)
+    return "cache" in message and any(
+        s in message for s in ("not found", "expired", "permission denied")
+    )
+
+
+class GeminiBackend(BaseBackend):
+    name = "gemini"
+
+    def __init__(
+        self,
+        model: str = "gemini-2.0-flash",
+        cache_ttl_seconds: int = 3600,
+        http_client=None,
+    ):
         self.model = model
+        self.cache_ttl_seconds = cache_ttl_seconds
         api_key = os.environ.get("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set")
-        self.client = genai.Client(api_key=api_key)
-
-    def score_article(self, article: Article) -> ScoringResult | None:
-        prompt = build_deep_read_prompt(
-            article.title,
-            article.scoring_text,
-            article.source_name,
-            article.language,
+        # Shared pool from scoring/registry.py (None = the SDK's own)
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(httpx_client=http_client)
+            if http_client is not None else None,
         )
-        try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=DEEP_READ_SYSTEM_PROMPT,
-                    response_mime_type="application/json",
-                    temperature=0.2,
-                    max_output_tokens=500,
-                ),
-            )
-            raw = response.text
-            return parse_scoring_response(raw, article.url, "gemini")
-        except Exception:
-            return None
+        # system prompt -> (cached content name, expiry) or None if uncacheable
+        self._caches: dict[str, tuple[str, float] | None] = {}
+        self._cache_lock = threading.Lock()
 
-    def skim(self, headlines: list[dict]) -> list[int]:
-        """
-        Given a list of {title, teaser, url} dicts, return indices of
-        headlines worth reading in full (0-indexed).
+    def _cached_content(self, system: str) -> str | None:
+        """Name of a Gemini cached-content entry holding `system`.
+
+        Created once per prompt; shortly before its TTL runs out the same
+        entry gets a new TTL rather than a second entry being created.
+        Models that can't cache it (too few tokens, no caching) fall back to
+        a plain system instruction for the rest of the run; any other error
+        only skips the cache for this call.
         """
-        from samfkurator.scoring.prompt import SKIM_SYSTEM_PROMPT, build_skim_prompt
-        prompt = build_skim_prompt(headlines)
-        try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=SKIM_SYSTEM_PROMPT,
-                    response_mime_type="application/json",
-                    temperature=0.1,
-                    max_output_tokens=200,
-                ),
+        if not self.cache_ttl_seconds:
+            return None
+        ttl = f"{self.cache_ttl_seconds}s"
+        expires = time.monotonic() + self.cache_ttl_seconds - 60
+        with self._cache_lock:
+            entry = self._caches.get(system, ())
+            if entry is None:
+                return None
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+            if entry:
+                try:
+                    self.client.caches.update(
+                        name=entry[0],
+                        config=types.UpdateCachedContentConfig(ttl=ttl),
+                    )
+                    self._caches[system] = (entry[0], expires)
+                    return entry[0]
+                except Exception as exc:
+                    if not _cache_gone(exc):
+                        return None
+                    del self._caches[system]
+            try:
+                cache = self.client.caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=system,
+                        display_name="samfkurator-curriculum",
+                        ttl=ttl,
+                    ),
+                )
+            except Exception as exc:
+                if _uncacheable(exc):
+                    self._caches[system] = None
+                return None
+            self._caches[system] = (cache.name, expires)
+            return cache.name
+
+    def _generate(self, system: str, prompt: str, **kwargs):
+        cached = self._cached_content(system)
+        if cached:
+            try:
+                return self._record_usage(self.client.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        cached_content=cached, **kwargs
+                    ),
+                ))
+            except Exception as exc:
+                # Rate limits, server errors and timeouts go to the retry
+                # logic in BaseBackend._call with the cache still in place
+                if not _cache_gone(exc):
+                    raise
+                # Cache evicted early - drop it and send the prompt in full
+                with self._cache_lock:
+                    self._caches.pop(system, None)
+        return self._record_usage(self.client.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                system_instruction=system, **kwargs
+            ),
+        ))
+
+    def _record_usage(self, response):
+        meta = response.usage_metadata
+        if meta is not None:
+            self.usage.add(
+                input_tokens=meta.prompt_token_count or 0,
+                output_tokens=meta.candidates_token_count or 0,
+                cached_tokens=meta.cached_content_token_count or 0,
             )
-            data = json.loads(response.text)
-            return [int(i) for i in data.get("relevant_indices", [])]
-        except Exception:
-            return list(range(len(headlines)))
+        return response
+
+    def _complete(
+        self, kind: str, system: str, prompt: str, max_tokens: int = 0
+    ) -> str:
+        response = self._generate(
+            system,
+            prompt,
+            response_mime_type="application/json",
+            temperature=0.1 if kind == SKIM else 0.2,
+            max_output_tokens=max_tokens or (200 if kind == SKIM else 500),
+        )
+        return response.text
 
     def is_available(self) -> bool:
         return bool(os.environ.get("GEMINI_API_KEY"))
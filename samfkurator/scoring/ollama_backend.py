@@ -1,53 +1,139 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
 
-from samfkurator.models import Article, ScoringResult
-from samfkurator.scoring.prompt import (
-    SYSTEM_PROMPT,
-    build_scoring_prompt,
-    parse_scoring_response,
-)
+from samfkurator.scoring.base import SKIM, BaseBackend
+from samfkurator.scoring.engine import PACKED_OUTPUT_TOKENS, estimate_tokens
+from samfkurator.scoring.prompt import DEEP_READ_SYSTEM_PROMPT
+
+# num_ctx is rounded up to a multiple of this. Ollama reloads the model
+# whenever num_ctx changes, so the window only ever grows in steps.
+NUM_CTX_STEP = 2048
+# Headroom for tokenizer differences: estimate_tokens counts ~4 characters
+# per token, Danish text often needs more tokens than that
+NUM_CTX_MARGIN = 1.25
+
 
+class OllamaBackend(BaseBackend):
+    """Local Ollama server.
+
+    Throughput mode: `warm_up` loads the model and primes the deep-read
+    system prompt in each of the server's parallel slots, `keep_alive`
+    keeps the model loaded between runs, and num_ctx is sized to the
+    prompts actually sent (the server default silently truncates the
+    curriculum prompt). Set max_concurrency to the server's
+    OLLAMA_NUM_PARALLEL to use all slots.
+    """
+
+    name = "ollama"
 
-class OllamaBackend:
     def __init__(
         self,
         base_url: str = "http://localhost:11434",
         model: str = "llama3:8b",
         temperature: float = 0.3,
+        keep_alive: str | None = "30m",
+        num_ctx: int = 0,
+        warm_up: bool = True,
+        http_client: httpx.Client | None = None,
     ):
         self.base_url = base_url
         self.model = model
         self.temperature = temperature
-        self.client = httpx.Client(timeout=120.0)
-
-    def score_article(self, article: Article) -> ScoringResult | None:
-        prompt = build_scoring_prompt(
-            article.title,
-            article.scoring_text,
-            article.source_name,
-            article.language,
+        self.keep_alive = keep_alive
+        # 0 = size to the prompts; a fixed value is sent unchanged
+        self.num_ctx = num_ctx
+        self.warm_up_on_start = warm_up
+        self._ctx = 0
+        self._ctx_lock = threading.Lock()
+        # Shared pool from scoring/registry.py, or a private client
+        self.client = http_client or httpx.Client(timeout=300.0)
+
+    def _context_for(self, system: str, prompt: str, num_predict: int) -> int:
+        """num_ctx for a request: the largest window needed so far."""
+        if self.num_ctx:
+            return self.num_ctx
+        need = int(
+            (estimate_tokens(system) + estimate_tokens(prompt) + num_predict)
+            * NUM_CTX_MARGIN
         )
+        size = -(-need // NUM_CTX_STEP) * NUM_CTX_STEP
+        with self._ctx_lock:
+            self._ctx = min(max(self._ctx, size), self.context_window)
+            return self._ctx
+
+    def _generate(self, system: str, prompt: str, options: dict) -> dict:
+        request = {
+            "model": self.model,
+            "system": system,
+            "prompt": prompt,
+            "stream": False,
+            "format": "json",
+            "options": options,
+        }
+        if self.keep_alive is not None:
+            request["keep_alive"] = self.keep_alive
+        response = self.client.post(f"{self.base_url}/api/generate", json=request)
+        response.raise_for_status()
+        return response.json()
+
+    def _complete(
+        self, kind: str, system: str, prompt: str, max_tokens: int = 0
+    ) -> str:
+        if kind == SKIM:
+            options = {"temperature": 0.1, "num_predict": max_tokens or 200}
+        else:
+            options = {
+                "temperature": self.temperature,
+                "num_predict": max_tokens or 300,
+            }
+        options["num_ctx"] = self._context_for(
+            system, prompt, options["num_predict"]
+        )
+        body = self._generate(system, prompt, options)
+        self.usage.add(
+            input_tokens=body.get("prompt_eval_count", 0),
+            output_tokens=body.get("eval_count", 0),
+        )
+        return body["response"]
+
+    def warm_up(self) -> None:
+        """Load the model and prime the system prompt in every slot.
 
+        Ollama reuses a slot's KV cache for a matching prompt prefix, so
+        after priming, deep-read calls only evaluate the article text.
+        With curriculum_sections the system prompt depends on the articles,
+        so the model is only loaded. Failures are ignored; the first real
+        call then pays the load.
+        """
+        if not self.warm_up_on_start:
+            return
+        # Reserve room for the largest deep read of the run - a full pack,
+        # under the whole curriculum - so no real call changes num_ctx (and
+        # reloads the model)
+        articles = self.pack_size
+        num_predict = PACKED_OUTPUT_TOKENS * articles if articles > 1 else 300
+        options = {
+            "num_predict": 1,
+            "num_ctx": self._context_for(
+                DEEP_READ_SYSTEM_PROMPT,
+                " " * (articles * (self.text_budget * 4 + 400)),
+                num_predict,
+            ),
+        }
+        if self.curriculum_sections:
+            system, slots = "", 1
+        else:
+            system, slots = DEEP_READ_SYSTEM_PROMPT, max(1, self.max_concurrency)
         try:
-            response = self.client.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "system": SYSTEM_PROMPT,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json",
-                    "options": {
-                        "temperature": self.temperature,
-                        "num_predict": 300,
-                    },
-                },
-            )
-            response.raise_for_status()
-            raw = response.json()["response"]
-            return parse_scoring_response(raw, article.url, "ollama")
-        except (httpx.HTTPError, KeyError):
-            return None
+            with ThreadPoolExecutor(max_workers=slots) as pool:
+                list(pool.map(
+                    lambda _: self._generate(system, "{}", options),
+                    range(slots),
+                ))
+        except httpx.HTTPError:
+            pass
 
     def is_available(self) -> bool:
         try:
@@ -0,0 +1,361 @@
+"""Local relevance pre-filter trained on our own LLM-scored archive.
+
+A hashed TF-IDF model over word uni/bigrams and character n-grams of
+title + summary + source, with a logistic regression on top. It predicts
+the probability that an article scores >= min_score_to_display, and the
+pipeline skips LLM scoring below a threshold calibrated for a target
+recall on the newest scores. Pure Python and CPU only: a few thousand
+short texts train in seconds.
+
+Train with `samfkurator train-prefilter`; `--incremental` continues from
+the saved model with only the scores that arrived since.
+"""
+
+import json
+import math
+import random
+import re
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from samfkurator.db import Database
+from samfkurator.models import Article
+
+# Hashed feature space (collisions are rare at our vocabulary size)
+N_FEATURES = 1 << 18
+CHAR_NGRAMS = (3, 4, 5)
+# Share of the newest examples held out to pick the threshold
+VALIDATION_SHARE = 0.2
+# Refuse to train with fewer examples than this in either class
+MIN_PER_CLASS = 10
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash(feature: str) -> int:
+    # crc32, not hash(): str hashes are randomised per process
+    return zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+
+
+def term_counts(title: str, summary: str, source: str) -> dict[int, int]:
+    """Hashed raw term counts for one article."""
+    words = _WORD.findall(f"{title} {summary}".lower())
+    terms = [f"w:{w}" for w in words]
+    terms += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f" {w} "
+        for n in CHAR_NGRAMS:
+            terms += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    # Title words count separately: headlines carry most of the signal
+    terms += [f"t:{w}" for w in _WORD.findall(title.lower())]
+    terms.append(f"s:{source.lower()}")
+
+    counts: dict[int, int] = {}
+    for term in terms:
+        h = _hash(term)
+        counts[h] = counts.get(h, 0) + 1
+    return counts
+
+
+@dataclass
+class Example:
+    title: str
+    summary: str
+    source: str
+    label: int
+    # scored_at / decided_at, used for the time-ordered split
+    at: str = ""
+
+
+@dataclass
+class Prefilter:
+    weights: dict[int, float] = field(default_factory=dict)
+    bias: float = 0.0
+    # Document frequencies for the IDF weights, updated incrementally
+    doc_freq: dict[int, int] = field(default_factory=dict)
+    n_docs: int = 0
+    threshold: float = 0.5
+    min_score: int = 5
+    target_recall: float = 0.95
+    trained_through: str = ""
+    report: dict = field(default_factory=dict)
+
+    # ── Features ─────────────────────────────────────────────────────────────
+
+    def _update_doc_freq(self, examples: list[Example]) -> None:
+        for ex in examples:
+            for h in term_counts(ex.title, ex.summary, ex.source):
+                self.doc_freq[h] = self.doc_freq.get(h, 0) + 1
+        self.n_docs += len(examples)
+
+    def vector(self, title: str, summary: str, source: str) -> dict[int, float]:
+        """Sublinear TF-IDF, L2-normalised."""
+        vec = {}
+        for h, tf in term_counts(title, summary, source).items():
+            idf = math.log((1 + self.n_docs) / (1 + self.doc_freq.get(h, 0))) + 1
+            vec[h] = (1 + math.log(tf)) * idf
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {h: v / norm for h, v in vec.items()}
+
+    # ── Model ────────────────────────────────────────────────────────────────
+
+    def _proba(self, vec: dict[int, float]) -> float:
+        z = self.bias + sum(self.weights.get(h, 0.0) * v for h, v in vec.items())
+        if z < -30:
+            return 0.0
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def predict_proba(self, article: Article) -> float:
+        return self._proba(
+            self.vector(article.title, article.summary, article.source_name)
+        )
+
+    def passes(self, article: Article) -> bool:
+        return self.predict_proba(article) >= self.threshold
+
+    def fit(
+        self,
+        examples: list[Example],
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 1,
+    ) -> None:
+        """SGD on the logistic loss with balanced class weights.
+
+        Starts from the current weights, so calling it again with only new
+        examples continues training (see `update`).
+        """
+        self._update_doc_freq(examples)
+        vectors = [
+            (self.vector(ex.title, ex.summary, ex.source), ex.label)
+            for ex in examples
+        ]
+        positives = sum(label for _, label in vectors)
+        negatives = len(vectors) - positives
+        class_weight = {
+            1: len(vectors) / (2 * positives) if positives else 1.0,
+            0: len(vectors) / (2 * negatives) if negatives else 1.0,
+        }
+
+        rnd = random.Random(seed)
+        step = 0
+        for _ in range(epochs):
+            rnd.shuffle(vectors)
+            for vec, label in vectors:
+                step += 1
+                lr = learning_rate / math.sqrt(step)
+                grad = (self._proba(vec) - label) * class_weight[label]
+                for h, v in vec.items():
+                    w = self.weights.get(h, 0.0)
+                    self.weights[h] = w - lr * (grad * v + l2 * w)
+                self.bias -= lr * grad
+
+    def calibrate(self, examples: list[Example]) -> dict:
+        """Pick the highest threshold that keeps `target_recall` on examples.
+
+        Returns the evaluation at that threshold: recall, precision and the
+        share of articles that would skip the LLM. Raises ValueError when
+        the examples have no relevant article to calibrate on; the
+        threshold is then left unchanged.
+        """
+        scored = sorted(
+            (
+                (self._proba(self.vector(ex.title, ex.summary, ex.source)), ex.label)
+                for ex in examples
+            ),
+            reverse=True,
+        )
+        positives = sum(label for _, label in scored)
+        if not positives:
+            raise ValueError(
+                f"Ikke kalibreret: ingen relevante artikler blandt "
+                f"{len(scored)} valideringseksempler"
+            )
+        needed = math.ceil(self.target_recall * positives)
+        kept = 0
+        for prob, label in scored:
+            kept += label
+            if kept >= needed:
+                self.threshold = prob
+                break
+        return evaluate(self, examples)
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path: str) -> None:
+        data = {
+            "version": 1,
+            "n_features": N_FEATURES,
+            "bias": self.bias,
+            "weights": {str(h): round(w, 6) for h, w in self.weights.items() if w},
+            "doc_freq": {str(h): n for h, n in self.doc_freq.items()},
+            "n_docs": self.n_docs,
+            "threshold": self.threshold,
+            "min_score": self.min_score,
+            "target_recall": self.target_recall,
+            "trained_through": self.trained_through,
+            "report": self.report,
+        }
+        Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str) -> "Prefilter | None":
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("n_features") != N_FEATURES:
+            return None
+        return cls(
+            weights={int(h): w for h, w in data["weights"].items()},
+            bias=data["bias"],
+            doc_freq={int(h): n for h, n in data["doc_freq"].items()},
+            n_docs=data["n_docs"],
+            threshold=data["threshold"],
+            min_score=data["min_score"],
+            target_recall=data["target_recall"],
+            trained_through=data["trained_through"],
+            report=data.get("report", {}),
+        )
+
+
+def evaluate(model: Prefilter, examples: list[Example]) -> dict:
+    """Recall/precision at the model's threshold and LLM calls saved."""
+    tp = fp = fn = tn = 0
+    for ex in examples:
+        passed = (
+            model._proba(model.vector(ex.title, ex.summary, ex.source))
+            >= model.threshold
+        )
+        if passed and ex.label:
+            tp += 1
+        elif passed:
+            fp += 1
+        elif ex.label:
+            fn += 1
+        else:
+            tn += 1
+    n = len(examples)
+    return {
+        "examples": n,
+        "positives": tp + fn,
+        "threshold": round(model.threshold, 4),
+        "recall": round(tp / (tp + fn), 3) if tp + fn else None,
+        "precision": round(tp / (tp + fp), 3) if tp + fp else None,
+        "llm_calls_saved": tn + fn,
+        "llm_calls_saved_share": round((tn + fn) / n, 3) if n else None,
+        "relevant_missed": fn,
+    }
+
+
+def load_examples(
+    db: Database, min_score: int, since: str = "", skim_negatives: bool = True
+) -> list[Example]:
+    """Labelled examples from `scores`, oldest first.
+
+    Headlines the skim rejected count as negatives too: the agent only
+    stores articles at or above min_score, so `scores` alone has few.
+    """
+    examples = [
+        Example(title, summary or "", source, int(score >= min_score), at)
+        for title, summary, source, score, at in db.get_prefilter_training_rows(since)
+    ]
+    if skim_negatives:
+        examples += [
+            Example(title, "", source, 0, at)
+            for title, source, at in db.get_skim_rejections(since)
+        ]
+    examples.sort(key=lambda ex: ex.at)
+    return examples
+
+
+def train(
+    db: Database,
+    min_score: int,
+    target_recall: float = 0.95,
+    epochs: int = 10,
+    skim_negatives: bool = True,
+) -> Prefilter:
+    """Train from scratch; threshold and report come from the newest 20%.
+
+    The final model is refitted on all examples with the calibrated
+    threshold. Raises ValueError when there are too few examples, or no
+    relevant one among the newest 20% (no threshold can be calibrated).
+    """
+    examples = load_examples(db, min_score, skim_negatives=skim_negatives)
+    positives = sum(ex.label for ex in examples)
+    if min(positives, len(examples) - positives) < MIN_PER_CLASS:
+        raise ValueError(
+            f"For få eksempler: {positives} relevante og "
+            f"{len(examples) - positives} irrelevante (kræver {MIN_PER_CLASS} af hver)"
+        )
+
+    split = int(len(examples) * (1 - VALIDATION_SHARE))
+    held_out = Prefilter(min_score=min_score, target_recall=target_recall)
+    held_out.fit(examples[:split], epochs=epochs)
+    report = held_out.calibrate(examples[split:])
+
+    model = Prefilter(
+        min_score=min_score,
+        target_recall=target_recall,
+        threshold=held_out.threshold,
+    )
+    model.fit(examples, epochs=epochs)
+    model.trained_through = examples[-1].at
+    model.report = {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": "full",
+        "train_examples": len(examples),
+        "train_positives": positives,
+        "validation": report,
+    }
+    return model
+
+
+def update(
+    model: Prefilter, db: Database, epochs: int = 3, skim_negatives: bool = True
+) -> dict:
+    """Continue training on scores newer than `model.trained_through`.
+
+    New examples are evaluated before the model sees them (prequential), so
+    the returned report is an honest recall estimate for recent articles.
+    """
+    examples = load_examples(
+        db, model.min_score, since=model.trained_through,
+        skim_negatives=skim_negatives,
+    )
+    if not examples:
+        return {}
+    report = evaluate(model, examples)
+    model.fit(examples, epochs=epochs)
+    model.trained_through = examples[-1].at
+    model.report = {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": "incremental",
+        "train_examples": model.report.get("train_examples", 0) + len(examples),
+        "new_examples": len(examples),
+        "validation": report,
+    }
+    return report
+
+
+def audited(url: str, audit_rate: float) -> bool:
+    """Whether a filtered-out article is read anyway for the recall audit.
+
+    Decided by the URL, so an article skipped on one run is skipped on the
+    next too instead of getting a fresh draw each time it is seen."""
+    return zlib.crc32(url.encode("utf-8")) / 2**32 < audit_rate
+
+
+def filter_articles(
+    articles: list[Article], model: Prefilter, audit_rate: float = 0.0
+) -> list[Article]:
+    """Keep articles at or above the threshold, plus an `audit_rate` share
+    of the rest so their scores keep measuring the filter's recall."""
+    return [
+        a for a in articles
+        if model.passes(a) or audited(a.url, audit_rate)
+    ]
@@ -1,8 +1,12 @@
 """Scoring prompts for Samfkurator."""
 
+import hashlib
 import json
+import re
+from dataclasses import dataclass, field
 
 from samfkurator.models import DisciplineScore, ScoringResult
+from samfkurator.scoring.repair import TRUNCATED, normalize_scoring, repair_json
 
 # ─── Shared curriculum context ────────────────────────────────────────────────
 
@@ -72,6 +76,14 @@ SKIM_SYSTEM_PROMPT = (
 )
 
 
+# Stored with each skim decision; decisions made under another version are
+# not reused. Bump the number when build_skim_prompt's (or, for the "r"
+# version, build_ranked_skim_prompt's) wording changes.
+_SKIM_SYSTEM_HASH = hashlib.sha256(SKIM_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:10]
+SKIM_PROMPT_VERSION = "1-" + _SKIM_SYSTEM_HASH
+SKIM_RANKED_PROMPT_VERSION = "1r-" + _SKIM_SYSTEM_HASH
+
+
 def build_skim_prompt(headlines: list[dict]) -> str:
     """Build prompt for quick headline filtering."""
     lines = []
@@ -87,13 +99,32 @@ def build_skim_prompt(headlines: list[dict]) -> str:
     )
 
 
+def build_ranked_skim_prompt(headlines: list[dict]) -> str:
+    """Skim prompt for headlines from several sites, asking for a relevance
+    score per selected headline so candidates can be ranked across sites."""
+    lines = []
+    for i, h in enumerate(headlines):
+        teaser = f" — {h['teaser']}" if h.get("teaser") else ""
+        lines.append(f"{i}: [{h.get('source', '')}] {h['title']}{teaser}")
+
+    return (
+        f"Her er {len(headlines)} nyhedsoverskrifter fra flere danske/internationale nyhedssider.\n"
+        "Vælg de overskrifter der sandsynligvis kan bruges som genstandsfelt i Samfundsfag A, "
+        "og giv hver valgt overskrift en relevans fra 1 til 10 (10 = oplagt undervisningsartikel).\n\n"
+        + "\n".join(lines)
+        + '\n\nSvar med JSON (kun de valgte overskrifter):\n'
+        '{"ratings": [{"index": <indeksnummer>, "relevance": <1-10>}]}'
+    )
+
+
 # ─── Deep-read prompt (full article scoring) ──────────────────────────────────
 
-DEEP_READ_SYSTEM_PROMPT = (
+_DEEP_READ_INTRO = (
     "Du er en erfaren samfundsfagslærer (stx) der vurderer om en nyhedsartikel kan bruges som "
     "GENSTANDSFELT for analyse i undervisningen.\n\n"
-    + _CURRICULUM
-    + "\n\nDIN OPGAVE:\n"
+)
+_DEEP_READ_TASK = (
+    "\n\nDIN OPGAVE:\n"
     "Læs artiklen grundigt og vurder om elever kan bruge den som udgangspunkt for en faglig analyse. "
     "En god artikel er en hvor eleverne kan ANVENDE konkrete teorier og begreber – ikke bare nævne dem.\n\n"
     "STRENGE KRITERIER:\n"
@@ -120,6 +151,65 @@ DEEP_READ_SYSTEM_PROMPT = (
     "artiklens faglige potentiale. Vælg en sætning der viser konkret hvad artiklen handler om.\n\n"
     "Du svarer KUN med valid JSON. Ingen anden tekst."
 )
+DEEP_READ_SYSTEM_PROMPT = _DEEP_READ_INTRO + _CURRICULUM + _DEEP_READ_TASK
+
+# Curriculum per discipline (in _CURRICULUM's order) and a short index of
+# each, for deep-read prompts that carry only some sections in full
+_SECTION_HEADERS = {
+    "politik": "POLITIK",
+    "sociologi": "SOCIOLOGI",
+    "okonomi": "ØKONOMI",
+    "international_politik": "INTERNATIONAL POLITIK",
+    "metode": "METODE",
+}
+_INDEX_TERMS = 8
+
+
+def _split_curriculum(text: str) -> dict[str, str]:
+    keys = {header: key for key, header in _SECTION_HEADERS.items()}
+    sections = {}
+    for block in text.split("\n\n")[1:]:
+        header, body = block.split(":\n", 1)
+        sections[keys[header]] = body
+    return sections
+
+
+def _index(section: str) -> str:
+    # Top-level items only; "Giddens (senmodernitet, ...)" counts as one
+    items = re.split(r",\s*(?![^()]*\))", section.replace("\n", " "))
+    return ", ".join(
+        re.sub(r"\s*\([^)]*\)", "", item).strip() for item in items[:_INDEX_TERMS]
+    )
+
+
+CURRICULUM_SECTIONS = _split_curriculum(_CURRICULUM)
+CURRICULUM_INDEX = {d: _index(s) for d, s in CURRICULUM_SECTIONS.items()}
+
+
+def build_deep_read_system(disciplines) -> str:
+    """Deep-read system prompt with the curriculum of `disciplines` in full
+    and a one-line index of the other sections.
+
+    The sections keep _CURRICULUM's order whatever the order of
+    `disciplines`, so each combination is one stable prompt (and one
+    provider cache entry). No or all disciplines give DEEP_READ_SYSTEM_PROMPT.
+    """
+    chosen = [d for d in CURRICULUM_SECTIONS if d in disciplines]
+    if not chosen or len(chosen) == len(CURRICULUM_SECTIONS):
+        return DEEP_READ_SYSTEM_PROMPT
+    others = [d for d in CURRICULUM_SECTIONS if d not in chosen]
+    curriculum = (
+        "Samfundsfag A (stx) er opdelt i fem discipliner. Artiklen ser ud til især at "
+        "høre under disse, med følgende centrale teorier og begreber:\n\n"
+        + "\n\n".join(
+            f"{_SECTION_HEADERS[d]}:\n{CURRICULUM_SECTIONS[d]}" for d in chosen
+        )
+        + "\n\nDe øvrige discipliner (kun stikord - scor dem stadig):\n"
+        + "\n".join(
+            f"{_SECTION_HEADERS[d]}: {CURRICULUM_INDEX[d]} m.fl." for d in others
+        )
+    )
+    return _DEEP_READ_INTRO + curriculum + _DEEP_READ_TASK
 
 
 def build_deep_read_prompt(
@@ -136,7 +226,7 @@ def build_deep_read_prompt(
     return (
         f"Vurder denne artikel fra {source}{lang_note} som potentielt undervisningsmateriale:\n\n"
         f"Titel: {title}\n\n"
-        f"Artikeltekst:\n{text[:5000]}\n\n"
+        f"Artikeltekst:\n{text}\n\n"
         "Svar med dette JSON-format:\n"
         "{\n"
         '  "overall_score": <1-10>,\n'
@@ -155,6 +245,61 @@ def build_deep_read_prompt(
     )
 
 
+def deep_read_template(language: str) -> str:
+    """build_deep_read_prompt without the article: the part of the prompt
+    the response cache keys on besides the text (BaseBackend._cache_key)."""
+    return build_deep_read_prompt("", "", "", language)
+
+
+def split_deep_read_prompt(prompt: str) -> tuple[str, str] | None:
+    """(language, text) of a build_deep_read_prompt prompt, else None."""
+    head, sep, rest = prompt.partition("Artikeltekst:\n")
+    text, end, _ = rest.rpartition("\n\nSvar med dette JSON-format:\n")
+    if not sep or not end or not head.startswith("Vurder denne artikel fra "):
+        return None
+    return ("en" if "(Artiklen er på engelsk" in head else "da"), text
+
+
+# ─── Packed prompt (several articles per request) ─────────────────────────────
+
+def build_packed_prompt(articles: list[dict]) -> str:
+    """Build one deep-read prompt for several articles.
+
+    Each dict: {id, title, text, source, language}. The answer is a JSON
+    object whose "results" array holds one deep-read result per article,
+    tagged with the article's id.
+    """
+    blocks = []
+    for a in articles:
+        lang_note = " (engelsk – vurder komparativt)" if a["language"] == "en" else ""
+        blocks.append(
+            f"### Artikel {a['id']} fra {a['source']}{lang_note}\n"
+            f"Titel: {a['title']}\n\n"
+            f"Artikeltekst:\n{a['text']}"
+        )
+
+    return (
+        f"Vurder disse {len(articles)} artikler hver for sig som potentielt "
+        "undervisningsmateriale. Bedøm hver artikel uafhængigt af de andre.\n\n"
+        + "\n\n".join(blocks)
+        + "\n\nSvar med dette JSON-format, ét element pr. artikel:\n"
+        "{\n"
+        '  "results": [\n'
+        "    {\n"
+        '      "id": "<artiklens id>",\n'
+        '      "overall_score": <1-10>,\n'
+        '      "disciplines": {"sociologi": <0-10>, "politik": <0-10>, '
+        '"okonomi": <0-10>, "international_politik": <0-10>, "metode": <0-10>},\n'
+        '      "primary_discipline": "<sociologi|politik|okonomi|international_politik|metode>",\n'
+        '      "concepts": ["<begreb1>", "<begreb2>", "<begreb3>"],\n'
+        '      "explanation": "<Hvad kan eleverne konkret analysere med artiklen?>",\n'
+        '      "quote": "<Verbatim citat fra artiklen, 1-2 sætninger>"\n'
+        "    }\n"
+        "  ]\n"
+        "}"
+    )
+
+
 # ─── Backwards-compat aliases (used by ollama/claude backends) ────────────────
 
 SYSTEM_PROMPT = DEEP_READ_SYSTEM_PROMPT
@@ -168,38 +313,151 @@ def build_scoring_prompt(
 
 # ─── Response parser ──────────────────────────────────────────────────────────
 
+def _strip_fences(raw: str) -> str:
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1].rsplit("```", 1)[0]
+    return text
+
+
+def _result_from_fields(
+    fields: dict, article_url: str, backend: str
+) -> ScoringResult:
+    return ScoringResult(
+        article_url=article_url,
+        overall_score=fields["overall_score"],
+        disciplines=DisciplineScore(**fields["disciplines"]),
+        primary_discipline=fields["primary_discipline"],
+        explanation=fields["explanation"],
+        quote=fields["quote"],
+        concepts=fields["concepts"],
+        backend_used=backend,
+    )
+
+
+@dataclass
+class ParsedScore:
+    """Outcome of parsing one deep-read answer.
+
+    `data` holds whatever could be salvaged (also when required fields are
+    missing), `missing` the required fields that could not be, and
+    `repaired` whether the JSON or a value had to be fixed up.
+    """
+
+    result: ScoringResult | None
+    data: dict = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+    repaired: bool = False
+
+
+def parse_scoring_details(
+    raw: str, article_url: str, backend: str = "ollama"
+) -> ParsedScore:
+    """Repair and validate a deep-read answer (see scoring/repair.py)."""
+    data, repair = repair_json(raw)
+    if isinstance(data, list):
+        data = next((d for d in data if isinstance(d, dict)), None)
+    if not isinstance(data, dict):
+        return ParsedScore(None, missing=["overall_score", "disciplines"])
+    fields, missing, changed = normalize_scoring(data, repair == TRUNCATED)
+    result = None if missing else _result_from_fields(fields, article_url, backend)
+    return ParsedScore(result, data, missing, bool(repair) or changed)
+
+
 def parse_scoring_response(
     raw: str, article_url: str, backend: str = "ollama"
 ) -> ScoringResult | None:
     """Parse JSON response from LLM into a ScoringResult."""
+    return parse_scoring_details(raw, article_url, backend).result
+
+
+def build_fix_prompt(prompt: str, partial: dict, missing: list[str]) -> str:
+    """Follow-up asking only for the required fields an answer lacked."""
+    return (
+        f"{prompt}\n\n"
+        "Dit svar blev afbrudt, og disse felter manglede: "
+        f"{', '.join(missing)}.\n"
+        f"Det modtagne svar:\n{json.dumps(partial, ensure_ascii=False)}\n\n"
+        "Svar KUN med et JSON-objekt med de manglende felter i formatet ovenfor."
+    )
+
+
+_RESULT_START = re.compile(r'\{\s*"id"\s*:')
+
+
+def _salvage_objects(text: str) -> list[dict]:
+    """Decode every complete `{"id": ...}` object in a broken JSON array.
+
+    Used when the whole answer doesn't parse (truncated output, one bad
+    element); each element that decodes on its own is kept.
+    """
+    decoder = json.JSONDecoder()
+    found = []
+    match = _RESULT_START.search(text)
+    while match:
+        try:
+            obj, end = decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            match = _RESULT_START.search(text, match.start() + 1)
+            continue
+        if isinstance(obj, dict):
+            found.append(obj)
+        match = _RESULT_START.search(text, end)
+    return found
+
+
+def parse_packed_scoring_response(
+    raw: str, urls_by_id: dict[str, str], backend: str = "ollama"
+) -> dict[str, ScoringResult]:
+    """Parse a packed answer into {article url: ScoringResult}.
+
+    Elements that are malformed, or whose id is unknown, are left out, so
+    the caller can retry just those articles one at a time.
+    """
+    text = _strip_fences(raw or "")
     try:
-        text = raw.strip()
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0]
         data = json.loads(text)
-        raw_concepts = data.get("concepts", [])
-        if isinstance(raw_concepts, list):
-            concepts_str = " · ".join(str(c) for c in raw_concepts)
-        else:
-            concepts_str = str(raw_concepts)
-
-        return ScoringResult(
-            article_url=article_url,
-            overall_score=int(data["overall_score"]),
-            disciplines=DisciplineScore(
-                sociologi=int(data["disciplines"].get("sociologi", 0)),
-                politik=int(data["disciplines"].get("politik", 0)),
-                okonomi=int(data["disciplines"].get("okonomi", 0)),
-                international_politik=int(
-                    data["disciplines"].get("international_politik", 0)
-                ),
-                metode=int(data["disciplines"].get("metode", 0)),
-            ),
-            primary_discipline=data.get("primary_discipline", ""),
-            explanation=data.get("explanation", ""),
-            quote=data.get("quote", ""),
-            concepts=concepts_str,
-            backend_used=backend,
-        )
-    except (json.JSONDecodeError, KeyError, ValueError, TypeError):
-        return None
+        items = data.get("results", []) if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            items = []
+    except json.JSONDecodeError:
+        # Complete elements first, then whatever the repaired tail holds
+        items = _salvage_objects(text)
+        repaired, _ = repair_json(text)
+        if isinstance(repaired, dict):
+            repaired = repaired.get("results")
+        if isinstance(repaired, list):
+            items += repaired
+
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        url = urls_by_id.get(str(item.get("id", "")))
+        if url is None or url in results:
+            continue
+        fields, missing, _ = normalize_scoring(item, truncated=True)
+        if not missing:
+            results[url] = _result_from_fields(fields, url, backend)
+    return results
+
+
+def parse_ranked_skim_response(raw: str, n_headlines: int) -> dict[int, int]:
+    """Parse a ranked skim answer into {headline index: relevance 1-10}.
+
+    Raises ValueError if the answer isn't the expected JSON object;
+    ratings with unknown indices are dropped.
+    """
+    data = json.loads(_strip_fences(raw or ""))
+    if not isinstance(data, dict) or not isinstance(data.get("ratings"), list):
+        raise ValueError("ranked skim answer without a ratings list")
+    ratings = {}
+    for item in data["ratings"]:
+        try:
+            index = int(item["index"])
+            relevance = max(1, min(10, int(item["relevance"])))
+        except (KeyError, ValueError, TypeError):
+            continue
+        if 0 <= index < n_headlines:
+            ratings[index] = relevance
+    return ratings
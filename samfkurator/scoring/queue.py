@@ -0,0 +1,127 @@
+"""Order the persistent scoring queue by predicted value.
+
+Articles that get past the pre-filter and skim wait in table score_queue
+until they are deep-scored, so a run that stops at its budget
+(scoring/budget.py) leaves the rest for the next one. Every run ranks the
+whole queue by the predicted value of scoring an article, the product of:
+
+  source prior   the source's historic hit rate (share of its scored
+                 articles at min_score_to_display or above), smoothed
+                 toward the rate over all sources
+  recency        halves every RECENCY_HALF_LIFE_HOURS since publication,
+                 or since queueing when the feed gave no date, down to
+                 RECENCY_FLOOR so old items still rank by the other signals
+  skim signal    the headline relevance (1-10) from the skim
+  language mix   a boost for Danish or international sources while
+                 today's scored articles are short of daily.min_danish /
+                 min_international (same split as output/daily.py)
+"""
+
+from datetime import datetime
+
+from samfkurator.config import DailyConfig
+from samfkurator.models import Article
+from samfkurator.output.daily import DANISH_SOURCES
+
+# Pseudo-articles at the overall hit rate added to every source's record,
+# so a source with three lucky articles doesn't jump the queue
+PRIOR_STRENGTH = 10
+# Hit rate assumed before anything has been scored
+DEFAULT_HIT_RATE = 0.3
+RECENCY_HALF_LIFE_HOURS = 24
+RECENCY_FLOOR = 0.1
+LANGUAGE_BOOST = 1.5
+# Skim factor for articles without a relevance: selected by the skim's
+# fallback, never skimmed, or a skim rejection in the recall audit. Audit
+# articles get the neutral value so a budget stop doesn't thin the recall
+# sample more than the rest of the queue
+SELECTED_FACTOR = 0.7
+NEUTRAL_FACTOR = 0.5
+
+
+def source_priors(
+    hit_rates: dict[str, tuple[int, int]],
+) -> tuple[dict[str, float], float]:
+    """Smoothed hit rate per source, and the rate for unseen sources."""
+    hits = sum(h for h, _ in hit_rates.values())
+    total = sum(n for _, n in hit_rates.values())
+    base = hits / total if total else DEFAULT_HIT_RATE
+    return {
+        source: (h + PRIOR_STRENGTH * base) / (n + PRIOR_STRENGTH)
+        for source, (h, n) in hit_rates.items()
+    }, base
+
+
+def recency(published: str | None, enqueued_at: str, now: datetime) -> float:
+    try:
+        when = datetime.fromisoformat(published or enqueued_at)
+    except ValueError:
+        when = datetime.fromisoformat(enqueued_at)
+    if when.tzinfo is not None:
+        when = when.astimezone().replace(tzinfo=None)
+    hours = max((now - when).total_seconds() / 3600, 0.0)
+    return max(0.5 ** (hours / RECENCY_HALF_LIFE_HOURS), RECENCY_FLOOR)
+
+
+def skim_factor(
+    selected: int | None, audited: int | None, relevance: int | None
+) -> float:
+    if relevance is not None:
+        return relevance / 10
+    if selected and not audited:
+        return SELECTED_FACTOR
+    return NEUTRAL_FACTOR
+
+
+def language_factors(
+    todays_rows: list[tuple], daily: DailyConfig
+) -> tuple[float, float]:
+    """(Danish, international) boosts from today's qualifying articles."""
+    danish = sum(row[1] in DANISH_SOURCES for row in todays_rows)
+    international = len(todays_rows) - danish
+    return (
+        LANGUAGE_BOOST if danish < daily.min_danish else 1.0,
+        LANGUAGE_BOOST if international < daily.min_international else 1.0,
+    )
+
+
+def _article(row: tuple) -> Article:
+    url, title, source, summary, text, published, language, paywall = row[:8]
+    return Article(
+        url=url, title=title, source_name=source, summary=summary or "",
+        full_text=text,
+        published=datetime.fromisoformat(published) if published else None,
+        language=language or "da", has_paywall=bool(paywall),
+    )
+
+
+def queued_articles(db) -> list[Article]:
+    """The queue in its stored priority order."""
+    return [_article(row) for row in db.get_queue()]
+
+
+def prioritize(
+    db, min_score: int, daily: DailyConfig | None = None,
+    now: datetime | None = None,
+) -> list[tuple[Article, float]]:
+    """Rank the queue by predicted value, store the priorities, and return
+    (article, value) best first."""
+    now = now or datetime.now()
+    priors, base = source_priors(db.get_source_hit_rates(min_score))
+    danish_boost, international_boost = language_factors(
+        db.get_todays_scored_articles(min_score), daily or DailyConfig()
+    )
+    ranked = []
+    for row in db.get_queue():
+        source, published, enqueued_at = row[2], row[5], row[8]
+        selected, audited, relevance = row[9:12]
+        value = (
+            priors.get(source, base)
+            * recency(published, enqueued_at, now)
+            * skim_factor(selected, audited, relevance)
+            * (danish_boost if source in DANISH_SOURCES else international_boost)
+        )
+        ranked.append((_article(row), round(value, 6)))
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    db.set_queue_priorities({a.url: v for a, v in ranked})
+    return ranked
@@ -0,0 +1,190 @@
+"""One place to build scoring backends.
+
+Backends are looked up by name and their modules (and with them the
+provider SDKs) imported only when selected. Each provider gets one pooled
+httpx client per process, with keep-alive and timeouts from ai.http; every
+backend instance, fallback and batch provider talking to that provider
+shares it, so a run opens its connections once.
+"""
+
+import importlib
+import threading
+from dataclasses import replace
+from typing import Iterator, Protocol
+
+from samfkurator.config import AIConfig, HttpConfig
+from samfkurator.models import Article, ScoringResult
+from samfkurator.scoring.cascade import Cascade
+from samfkurator.scoring.resilience import link_fallbacks
+
+# name -> "module:class"
+BACKENDS = {
+    "ollama": "samfkurator.scoring.ollama_backend:OllamaBackend",
+    "claude": "samfkurator.scoring.claude_backend:ClaudeBackend",
+    "gemini": "samfkurator.scoring.gemini_backend:GeminiBackend",
+    "deepseek": "samfkurator.scoring.deepseek_backend:DeepSeekBackend",
+}
+BACKEND_NAMES = tuple(BACKENDS)
+
+# Pooled client class per provider, "module:class". The SDKs only accept
+# their own client subclass (some builds vendor httpx under another name).
+CLIENT_CLASSES = {
+    "claude": "anthropic:DefaultHttpxClient",
+    "deepseek": "openai:DefaultHttpxClient",
+}
+DEFAULT_CLIENT_CLASS = "httpx:Client"
+
+
+class ScoringBackend(Protocol):
+    """What the pipeline needs from a backend (see scoring/base.py)."""
+
+    name: str
+
+    def score(self, article: Article) -> ScoringResult | None: ...
+
+    def score_many(
+        self, articles: list[Article]
+    ) -> Iterator[tuple[Article, ScoringResult | None]]: ...
+
+    def skim(self, headlines: list[dict]) -> list[int] | None: ...
+
+    def is_available(self) -> bool: ...
+
+
+_clients: dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _load(path: str):
+    module, name = path.split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def http_client(provider: str, http: HttpConfig | None = None):
+    """The process-wide pooled httpx client for a provider.
+
+    Settings apply when the client is first created.
+    """
+    with _clients_lock:
+        client = _clients.get(provider)
+        if client is None:
+            cls = _load(CLIENT_CLASSES.get(provider, DEFAULT_CLIENT_CLASS))
+            # Timeout and Limits must come from the package the class is from
+            base = next(c for c in cls.__mro__ if c.__name__ == "Client")
+            httpx = importlib.import_module(base.__module__.partition(".")[0])
+            http = http or HttpConfig()
+            read = (
+                http.ollama_timeout_seconds if provider == "ollama"
+                else http.timeout_seconds
+            )
+            client = cls(
+                timeout=httpx.Timeout(read, connect=http.connect_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=http.max_connections,
+                    max_keepalive_connections=http.max_keepalive_connections,
+                    keepalive_expiry=http.keepalive_expiry_seconds,
+                ),
+            )
+            _clients[provider] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close every pooled client (end of process, or between benchmarks)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def backend_class(name: str) -> type:
+    """Import and return the backend class for `name`."""
+    if name not in BACKENDS:
+        raise ValueError(f"Ukendt backend: {name}")
+    return _load(BACKENDS[name])
+
+
+def _construct(name: str, ai: AIConfig):
+    cls = backend_class(name)
+    client = http_client(name, ai.http)
+    if name == "claude":
+        return cls(
+            ai.claude.model, ai.claude.prompt_cache, http_client=client,
+            base_url=ai.claude.base_url,
+        )
+    if name == "gemini":
+        return cls(ai.gemini.model, ai.gemini.cache_ttl_seconds, http_client=client)
+    if name == "deepseek":
+        return cls(ai.deepseek.model, ai.deepseek.base_url, http_client=client)
+    return cls(
+        ai.ollama.base_url, ai.ollama.model, ai.ollama.temperature,
+        ai.ollama.keep_alive, ai.ollama.num_ctx, ai.ollama.warm_up,
+        http_client=client,
+    )
+
+
+def create_single_backend(
+    name: str, ai: AIConfig, llm_cache=None, telemetry=None, boilerplate=None
+):
+    """One backend with its limits, packing, cache, telemetry and the
+    repeated-paragraph index its text selection uses (scoring/salient.py)."""
+    backend = _construct(name, ai)
+    cfg = ai.backend_config(name)
+    backend.set_limits(
+        cfg.max_concurrency, cfg.requests_per_minute, cfg.tokens_per_minute
+    )
+    backend.set_packing(cfg.pack_size, cfg.context_window)
+    backend.set_text_budget(cfg.text_budget_tokens)
+    backend.set_boilerplate(boilerplate)
+    backend.set_curriculum(ai.curriculum_sections)
+    backend.set_cache(llm_cache)
+    backend.set_telemetry(telemetry)
+    return backend
+
+
+def create_cascade(
+    ai: AIConfig, llm_cache=None, telemetry=None, boilerplate=None
+) -> Cascade:
+    """The fast tier from ai.cascade (retries, no fallbacks: a failed fast
+    read goes to the full tier)."""
+    settings = ai.cascade
+    name = settings.backend
+    if settings.model:
+        ai = replace(
+            ai, **{name: replace(ai.backend_config(name), model=settings.model)}
+        )
+    fast = link_fallbacks(
+        create_single_backend(name, ai, llm_cache, telemetry, boilerplate), [], None,
+        ai.resilience,
+    )
+    return Cascade(
+        fast,
+        settings.accept_below,
+        settings.accept_above,
+        settings.thresholds,
+        settings.max_discipline_gap,
+        settings.validation_rate,
+    )
+
+
+def create_backend(
+    name: str, ai: AIConfig | None = None, llm_cache=None, telemetry=None,
+    boilerplate=None,
+):
+    """The backend `name` with ai.fallback_chain behind it, and the fast
+    tier from ai.cascade in front of it when enabled."""
+    ai = ai or AIConfig()
+    backend = link_fallbacks(
+        create_single_backend(name, ai, llm_cache, telemetry, boilerplate),
+        ai.fallback_chain,
+        lambda fallback: create_single_backend(
+            fallback, ai, llm_cache, telemetry, boilerplate
+        ),
+        ai.resilience,
+    )
+    if ai.cascade.enabled:
+        cascade = create_cascade(ai, llm_cache, telemetry, boilerplate)
+        # A fast tier that is the full model would only double the calls
+        if (cascade.fast.name, cascade.fast.model) != (backend.name, backend.model):
+            backend.set_cascade(cascade)
+    return backend
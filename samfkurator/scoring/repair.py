@@ -0,0 +1,222 @@
+"""Repair and validate malformed deep-read answers.
+
+Answers are cut off at max_tokens, wrapped in prose or code fences, or
+write scores as "7/10". Rather than discarding the paid call, the answer is
+repaired to the nearest valid JSON object (unterminated strings, arrays and
+objects are closed; a dangling key is dropped) and checked against the
+deep-read schema: scores are coerced and clamped to 0-10, discipline names
+normalised and primary_discipline derived from the scores if it is missing
+or unknown. Only overall_score and the discipline scores are required;
+see BaseBackend.score_article for the follow-up request when they are
+missing.
+"""
+
+import json
+import re
+
+DISCIPLINES = (
+    "sociologi", "politik", "okonomi", "international_politik", "metode",
+)
+REQUIRED_FIELDS = ("overall_score", "disciplines")
+
+# Alternative names models use for the overall score
+_OVERALL_KEYS = ("overall_score", "score", "overall", "samlet_score")
+
+_FENCED = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_BARE_FRACTION = re.compile(r'(:\s*)(-?\d+(?:\.\d+)?\s*/\s*\d+)(?=\s*[,}\]\n])')
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_DANGLING_KEY = re.compile(r'[{,]\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+# A number or literal at the very end may be cut off ("10" -> "1")
+_TRAILING_TOKEN = re.compile(r'([:,\[]\s*)[^\s"{}\[\],:]+$')
+_NUMBER = re.compile(r"-?\d+(?:[.,]\d+)?")
+_OUT_OF = re.compile(r"^\s*/\s*(\d+)|^\s*(?:af|ud af|of|out of)\s+(\d+)")
+
+# Attempts at cutting a broken answer back to an earlier comma
+_MAX_CUTS = 40
+
+
+def _scan(text: str) -> tuple[list[str], bool, list[int]]:
+    """Open brackets (as closers), whether a string is open, and the
+    positions of commas outside strings."""
+    stack, commas = [], []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            commas.append(i)
+    return stack, in_string, commas
+
+
+def _close(text: str) -> str:
+    """Terminate an open string and close every open array/object."""
+    stack, in_string, _ = _scan(text)
+    if in_string:
+        if text.endswith("\\"):
+            text = text[:-1]
+        text += '"'
+    else:
+        text = _TRAILING_TOKEN.sub(r"\1", text.rstrip())
+    text = text.rstrip().rstrip(",")
+    if stack and stack[-1] == "}":
+        match = _DANGLING_KEY.search(text)
+        if match:
+            text = text[: match.start() + 1].rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def _loads(text: str):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+# How repair_json got its value
+FIXED = "fixed"
+TRUNCATED = "truncated"
+
+
+def repair_json(raw: str) -> tuple[dict | list | None, str | None]:
+    """Best-effort JSON from an LLM answer: (value, repair).
+
+    `repair` is None when the answer parsed as it was (apart from code
+    fences and surrounding prose), FIXED after local fixes (bare "7/10",
+    trailing commas) and TRUNCATED when open strings, arrays or objects
+    had to be closed. Returns (None, None) when no JSON object or array
+    can be recovered.
+    """
+    text = (raw or "").strip()
+    fenced = _FENCED.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    start = min(
+        (i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1
+    )
+    if start < 0:
+        return None, None
+    text = text[start:]
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value, None
+    except json.JSONDecodeError:
+        pass
+
+    text = _BARE_FRACTION.sub(lambda m: f'{m.group(1)}"{m.group(2)}"', text)
+    text = _TRAILING_COMMA.sub(r"\1", text)
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value, FIXED
+    except json.JSONDecodeError:
+        pass
+    value = _loads(_close(text))
+    if value is not None:
+        return value, TRUNCATED
+
+    # Cut back to earlier commas until the rest closes cleanly
+    _, _, commas = _scan(text)
+    for cut in reversed(commas[-_MAX_CUTS:]):
+        value = _loads(_close(text[:cut]))
+        if value is not None:
+            return value, TRUNCATED
+    return None, None
+
+
+def coerce_score(value) -> int | None:
+    """A 0-10 score from 7, 7.6, "7", "7/10", "4/5", "8 af 10"; else None."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str):
+        match = _NUMBER.search(value)
+        if not match:
+            return None
+        number = float(match.group().replace(",", "."))
+        scale = _OUT_OF.match(value[match.end():])
+        if scale:
+            out_of = int(scale.group(1) or scale.group(2))
+            if out_of:
+                number = number * 10 / out_of
+    else:
+        return None
+    return max(0, min(10, round(number)))
+
+
+def _discipline_key(name) -> str:
+    key = str(name).strip().lower()
+    for old, new in (("ø", "o"), ("æ", "ae"), ("å", "aa"), ("-", "_"), (" ", "_")):
+        key = key.replace(old, new)
+    return {"international": "international_politik", "ip": "international_politik"}.get(
+        key, key
+    )
+
+
+def normalize_scoring(data, truncated: bool = False) -> tuple[dict, list[str], bool]:
+    """Validate a deep-read object against the schema.
+
+    Returns (fields, missing required fields, changed); `changed` is True
+    when a value had to be coerced, clamped, renamed or derived. A
+    discipline the model left out scores 0, unless the answer was
+    `truncated` - then the scores after the cut are unknown and
+    "disciplines" counts as missing.
+    """
+    if not isinstance(data, dict):
+        return {}, list(REQUIRED_FIELDS), True
+    fields: dict = {}
+    missing: list[str] = []
+    changed = False
+
+    overall_key = next((k for k in _OVERALL_KEYS if k in data), None)
+    overall = coerce_score(data.get(overall_key)) if overall_key else None
+    if overall is None:
+        missing.append("overall_score")
+    else:
+        fields["overall_score"] = overall
+        changed |= overall_key != "overall_score" or overall != data[overall_key]
+
+    raw_disciplines = data.get("disciplines")
+    if not isinstance(raw_disciplines, dict):
+        # Some answers put the discipline scores at the top level
+        raw_disciplines = data
+        changed |= "disciplines" in data
+    scores = {}
+    for name, value in raw_disciplines.items():
+        key = _discipline_key(name)
+        score = coerce_score(value)
+        if key in DISCIPLINES and score is not None:
+            scores[key] = score
+            changed |= key != name or score != value
+    if scores and not (truncated and len(scores) < len(DISCIPLINES)):
+        fields["disciplines"] = {d: scores.get(d, 0) for d in DISCIPLINES}
+    else:
+        missing.append("disciplines")
+
+    primary = _discipline_key(data.get("primary_discipline") or "")
+    if primary not in DISCIPLINES:
+        primary = max(scores, key=scores.get) if scores else ""
+        changed = True
+    fields["primary_discipline"] = primary
+
+    concepts = data.get("concepts", [])
+    if isinstance(concepts, list):
+        fields["concepts"] = " · ".join(str(c) for c in concepts)
+    else:
+        fields["concepts"] = str(concepts or "")
+    for key in ("explanation", "quote"):
+        value = data.get(key, "")
+        fields[key] = value if isinstance(value, str) else str(value or "")
+    return fields, missing, changed
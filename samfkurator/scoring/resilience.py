@@ -0,0 +1,270 @@
+"""Retries, circuit breaking and fail-over for scoring backends.
+
+Provider errors are classified as rate limits, transient failures, an
+unusable backend or fatal errors. Rate limits and transient failures are
+retried with jittered exponential backoff (honouring Retry-After); repeated
+failures open a per-backend circuit breaker, after which calls fail fast
+and the backend's fallback (next in `ai.fallback_chain`) takes over. An
+unusable backend (revoked key, unknown model) opens the breaker at once.
+Only a bad request is fatal: it propagates and the backend stays healthy.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+# Error classes
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+UNUSABLE = "unusable"
+FATAL = "fatal"
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_TRANSIENT_STATUS = {408, 409, 425, 500, 502, 503, 504, 529}
+_TRANSIENT_NAMES = ("Timeout", "Connection", "Connect", "ServerError", "Unavailable")
+# The request itself is bad; any other 4xx means the backend can't be used
+_FATAL_STATUS = {400, 413, 422}
+
+
+class BackendUnavailable(Exception):
+    """The backend gave up on a call: breaker open or retries exhausted."""
+
+
+def _status_code(exc: Exception) -> int | None:
+    # httpx.HTTPStatusError, anthropic/openai APIStatusError, google-genai APIError
+    response = getattr(exc, "response", None)
+    for value in (
+        getattr(exc, "status_code", None),
+        getattr(response, "status_code", None),
+        getattr(exc, "code", None),
+    ):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _retry_after(exc: Exception) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # email.utils is slow to import and only needed for HTTP dates
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(exc: Exception) -> tuple[str, float | None]:
+    """Return (error class, Retry-After seconds or None) for an exception."""
+    status = _status_code(exc)
+    if status == 429:
+        return RATE_LIMIT, _retry_after(exc)
+    if status in _TRANSIENT_STATUS or (status is not None and status >= 500):
+        return TRANSIENT, _retry_after(exc)
+    if status in _FATAL_STATUS:
+        return FATAL, None
+    if status is not None:
+        return UNUSABLE, None
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return TRANSIENT, None
+    if any(name in type(exc).__name__ for name in _TRANSIENT_NAMES):
+        return TRANSIENT, None
+    return FATAL, None
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            return min(max(retry_after, backoff), self.max_delay)
+        return backoff
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures. Thread-safe.
+
+    While open, calls are refused until `reset_timeout` has passed; then a
+    single trial call is let through (half-open) and its outcome closes or
+    re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            self.state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def trip(self) -> None:
+        """Open now, whatever the failure count."""
+        with self._lock:
+            self._trial_running = False
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+
+@dataclass
+class BackendHealth:
+    """Per-backend call outcomes for the run report. Thread-safe."""
+
+    calls: int = 0
+    successes: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    transient_errors: int = 0
+    unusable_errors: int = 0
+    fatal_errors: int = 0
+    gave_up: int = 0
+    short_circuited: int = 0
+    fallbacks: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def count(self, **increments: int) -> None:
+        with self._lock:
+            for name, n in increments.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def as_dict(self) -> dict:
+        return {
+            k: v for k, v in self.__dict__.items() if not k.startswith("_")
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.successes}/{self.calls} kald ok · {self.retries} retries "
+            f"({self.rate_limited} rate-limit, {self.transient_errors} midlertidige) · "
+            f"{self.gave_up} opgivet · {self.fallbacks} videresendt"
+        )
+
+
+def call_with_retries(fn, policy: RetryPolicy, breaker: CircuitBreaker, health: BackendHealth):
+    """Call fn() under the retry policy and circuit breaker.
+
+    Fatal errors propagate unchanged (the request itself is bad); rate
+    limits and transient errors are retried and end in BackendUnavailable,
+    as does a call refused by an open breaker. An unusable backend (auth
+    or not-found errors) opens the breaker and raises BackendUnavailable
+    without retrying, so the fallback gets the call.
+    """
+    for attempt in range(policy.max_attempts):
+        if not breaker.allow():
+            health.count(short_circuited=1)
+            raise BackendUnavailable("circuit breaker open")
+        health.count(calls=1)
+        try:
+            result = fn()
+        except Exception as exc:
+            kind, retry_after = classify(exc)
+            if kind == FATAL:
+                # A bad request says nothing about the backend's health
+                breaker.record_success()
+                health.count(fatal_errors=1)
+                raise
+            if kind == UNUSABLE:
+                breaker.trip()
+                health.count(unusable_errors=1, gave_up=1)
+                raise BackendUnavailable(f"{kind}: {exc}") from exc
+            breaker.record_failure()
+            if kind == RATE_LIMIT:
+                health.count(rate_limited=1)
+            else:
+                health.count(transient_errors=1)
+            if attempt + 1 >= policy.max_attempts:
+                health.count(gave_up=1)
+                raise BackendUnavailable(f"{kind}: {exc}") from exc
+            health.count(retries=1)
+            time.sleep(policy.delay(attempt, retry_after))
+        else:
+            breaker.record_success()
+            health.count(successes=1)
+            return result
+    raise BackendUnavailable("no attempts allowed")
+
+
+def link_fallbacks(primary, names: list[str], create, settings):
+    """Give `primary` and the backends named in `names` retries and breakers
+    from `settings` (a ResilienceConfig) and chain them as fallbacks.
+
+    `create(name)` builds a backend; names that fail with ValueError (no API
+    key) or repeat an earlier backend are skipped. Returns `primary`.
+    """
+    chain = [primary]
+    for name in names:
+        if name in {b.name for b in chain}:
+            continue
+        try:
+            chain.append(create(name))
+        except ValueError:
+            continue
+    for backend, fallback in zip(chain, chain[1:] + [None]):
+        backend.set_resilience(
+            RetryPolicy(settings.max_attempts, settings.base_delay, settings.max_delay),
+            CircuitBreaker(settings.breaker_failures, settings.breaker_reset_seconds),
+            fallback,
+        )
+    return primary
+
+
+def health_report(backend) -> list[str]:
+    """One line per backend in the fallback chain, for logs and the console."""
+    return [
+        f"{b.name}: {b.health.summary()} · breaker {b.breaker.state}"
+        + (f" (åbnet {b.breaker.opened}x)" if b.breaker.opened else "")
+        for b in backend.chain()
+    ]
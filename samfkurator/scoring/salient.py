@@ -0,0 +1,234 @@
+"""Token-budgeted selection of the most curriculum-dense paragraphs.
+
+Instead of cutting article text at a fixed character count (which keeps
+page boilerplate at the top and drops the analytical paragraphs further
+down), the text is split into paragraphs, boilerplate is removed, and
+paragraphs are picked by density of curriculum terms until the backend's
+token budget is spent. The selection is returned in original order.
+
+Paragraphs that recur across a source's articles (newsletter pitch, author
+box, disclaimer) are boilerplate too. They are found in the source's stored
+articles (SourceBoilerplate), not in what the process happened to score
+before, so an article's selection - and with it the prompt and the
+response-cache key - doesn't depend on scoring order.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+from samfkurator.models import Article
+from samfkurator.scoring.engine import estimate_tokens
+from samfkurator.scoring.prompt import _CURRICULUM
+
+# Default budget for article text in a deep-read prompt (~1800 characters,
+# a little under the old fixed 2000-character cut)
+DEFAULT_TEXT_BUDGET = 450
+# Texts stored without line breaks are cut into chunks of about this size
+CHUNK_CHARS = 400
+# Extra weight for the lead paragraph, which frames the story
+LEAD_BONUS = 1.5
+# A paragraph seen in this many articles from one source is boilerplate
+REPEAT_THRESHOLD = 3
+# Stored articles per source it is looked for in (most recent first)
+REPEAT_SAMPLE = 50
+
+_SHORT_TERMS = {"bnp", "eu", "wto", "nato", "erm2", "ras"}
+# Fragments of the curriculum lists that match too much everyday text
+_NOISY_TERMS = {
+    "stat", "skifte", "sæson", "formel", "reel", "direkte", "personlig",
+    "biologi", "marked", "roller", "relation",
+}
+
+_BOILERPLATE = re.compile(
+    r"^(læs også|læs mere|del (artiklen|på)|annonce|foto:|©|abonn|"
+    r"tilmeld|cookie|gå til|se også|relaterede|mest læste|"
+    r"read more|sign up|subscribe|advertisement|share this|related)",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?»\"])\s+(?=[A-ZÆØÅ\"«])")
+
+
+def curriculum_terms(text: str) -> list[str]:
+    """Theory and concept names from a curriculum block (the whole
+    curriculum or one section, see scoring/curriculum.py), lower-cased."""
+    terms = set()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.endswith(":") and line.isupper():
+            continue
+        line = line.split(":", 1)[-1]
+        for part in re.split(r"[,()/]| og | eller ", line):
+            term = part.strip(" .-\\").lower()
+            if (len(term) >= 4 or term in _SHORT_TERMS) and term not in _NOISY_TERMS:
+                terms.add(term)
+            # Multi-word terms also count by their first distinctive word
+            # ("social mobilitet" → "mobilitet" matches "den sociale mobilitet")
+            words = [w for w in term.split() if len(w) >= 6]
+            if len(words) > 1:
+                terms.update(words)
+    return sorted(terms, key=len, reverse=True)
+
+
+CURRICULUM_TERMS = curriculum_terms(_CURRICULUM)
+# Word-start match without a trailing boundary, so Danish inflections
+# ("inflationen", "renterne") match their base term
+CURRICULUM_MATCHER = re.compile(
+    r"\b(?:" + "|".join(re.escape(t) for t in CURRICULUM_TERMS) + ")",
+    re.IGNORECASE,
+)
+
+
+def split_paragraphs(text: str) -> list[str]:
+    """Paragraphs from line breaks, or sentence chunks for flattened text."""
+    paragraphs = [p.strip() for p in re.split(r"\n+", text) if p.strip()]
+    if len(paragraphs) > 1:
+        return paragraphs
+
+    chunks, current = [], ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if current and len(current) + len(sentence) > CHUNK_CHARS:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _looks_like_boilerplate(paragraph: str) -> bool:
+    if _BOILERPLATE.match(paragraph):
+        return True
+    # Short lines without sentence punctuation: menus, bylines, captions
+    # (list items are kept - they often carry the facts)
+    return (
+        len(paragraph) < 40
+        and not re.search(r"[.!?]", paragraph)
+        and not paragraph.startswith(("-", "•", "*"))
+    )
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.blake2b(text.lower().encode("utf-8"), digest_size=8).hexdigest()
+
+
+def term_density(paragraph: str) -> float:
+    """Curriculum-term matches per estimated token."""
+    return len(CURRICULUM_MATCHER.findall(paragraph)) / estimate_tokens(paragraph)
+
+
+def _paragraphs(text: str) -> list[str]:
+    return [p for p in split_paragraphs(text) if not _looks_like_boilerplate(p)]
+
+
+class SourceBoilerplate:
+    """Paragraphs repeated across a source's stored articles. Thread-safe.
+
+    A paragraph is boilerplate when it also appears in at least
+    `repeat_threshold - 1` other articles among the source's `sample` most
+    recent stored ones. Only articles stored before this object was made
+    count, and each source is read once, so the result is the same for
+    every article of a run whatever order they are scored in.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        repeat_threshold: int = REPEAT_THRESHOLD,
+        sample: int = REPEAT_SAMPLE,
+    ):
+        self.db_path = db_path
+        self.repeat_threshold = repeat_threshold
+        self.sample = sample
+        self.as_of = datetime.now().isoformat()
+        # source -> paragraph fingerprint -> URLs of articles containing it
+        self._sources: dict[str, dict[str, set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, source: str) -> dict[str, set[str]]:
+        try:
+            with closing(sqlite3.connect(self.db_path)) as db:
+                rows = db.execute(
+                    """SELECT url, full_text FROM articles
+                       WHERE source_name = ? AND full_text IS NOT NULL
+                         AND fetched_at < ?
+                       ORDER BY fetched_at DESC LIMIT ?""",
+                    (source, self.as_of, self.sample),
+                ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        urls: dict[str, set[str]] = {}
+        for url, text in rows:
+            for paragraph in _paragraphs(text):
+                urls.setdefault(_fingerprint(paragraph), set()).add(url)
+        return urls
+
+    def repeated(self, source: str, url: str, paragraphs: list[str]) -> set[str]:
+        with self._lock:
+            if source not in self._sources:
+                self._sources[source] = self._load(source)
+            urls = self._sources[source]
+        return {
+            p for p in paragraphs
+            if len(urls.get(_fingerprint(p), set()) - {url})
+            >= self.repeat_threshold - 1
+        }
+
+
+class TextSelector:
+    """Selects salient paragraphs within a token budget. Thread-safe.
+
+    With a SourceBoilerplate, paragraphs repeated across the source's
+    stored articles are dropped as well.
+    """
+
+    def __init__(self, boilerplate: SourceBoilerplate | None = None):
+        self.boilerplate = boilerplate
+
+    def clean(self, text: str, source: str = "", url: str = "") -> list[str]:
+        """Paragraphs with per-page and repeated boilerplate removed."""
+        paragraphs = _paragraphs(text)
+        if not source or self.boilerplate is None:
+            return paragraphs
+        repeated = self.boilerplate.repeated(source, url, paragraphs)
+        return [p for p in paragraphs if p not in repeated]
+
+    def select(
+        self, text: str, budget_tokens: int, source: str = "", url: str = ""
+    ) -> str:
+        paragraphs = self.clean(text, source, url)
+        if sum(estimate_tokens(p) for p in paragraphs) <= budget_tokens:
+            return "\n\n".join(paragraphs)
+
+        ranked = sorted(
+            range(len(paragraphs)),
+            key=lambda i: (
+                term_density(paragraphs[i]) * (LEAD_BONUS if i == 0 else 1.0),
+                -i,
+            ),
+            reverse=True,
+        )
+        chosen, used = set(), 0
+        for i in ranked:
+            cost = estimate_tokens(paragraphs[i])
+            if used + cost > budget_tokens:
+                continue
+            chosen.add(i)
+            used += cost
+        if not chosen:
+            # A single paragraph longer than the budget: keep its start
+            return paragraphs[ranked[0]][: budget_tokens * 4]
+        return "\n\n".join(paragraphs[i] for i in sorted(chosen))
+
+    def scoring_text(self, article: Article, budget_tokens: int) -> str:
+        """Budgeted replacement for Article.scoring_text."""
+        if article.full_text and len(article.full_text) > 200:
+            body = self.select(
+                article.full_text, budget_tokens, article.source_name, article.url
+            )
+            return f"{article.title}\n\n{body}"
+        return f"{article.title}\n\n{article.summary}"
@@ -0,0 +1,215 @@
+"""Headline skim stage for the RSS/scraper pipeline.
+
+Same two-pass idea as the agent: one cheap batched `backend.skim()` call per
+source decides which items are worth full-text extraction and deep scoring.
+"""
+
+import hashlib
+import random
+from datetime import datetime, timedelta
+
+from samfkurator.db import Database
+from samfkurator.models import Article
+from samfkurator.scoring.engine import estimate_tokens
+from samfkurator.scoring.prompt import SKIM_PROMPT_VERSION, SKIM_RANKED_PROMPT_VERSION
+
+# Same cap as ArticleBrowser.get_headlines returns per front page
+SKIM_BATCH_SIZE = 60
+# Skim decisions are reused for this long while the headline is unchanged
+SKIM_CACHE_TTL_DAYS = 7
+# Headline tokens per ranked (cross-site) skim call
+SKIM_BATCH_TOKENS = 3000
+
+
+def title_hash(title: str) -> str:
+    """Hash of a headline, insensitive to case and whitespace changes."""
+    normalized = " ".join(title.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def skim_headlines(
+    headlines: list[dict],
+    backend,
+    db: Database,
+    source_name: str,
+    backend_name: str = "",
+    audit_rate: float = 0.0,
+    ttl_days: int = SKIM_CACHE_TTL_DAYS,
+    batch_size: int = SKIM_BATCH_SIZE,
+) -> tuple[list[int], int]:
+    """Skim {title, teaser, url} headlines from one source.
+
+    Headlines with a stored decision (same URL, same title, same skim prompt
+    version, younger than `ttl_days`) reuse it; only new or re-titled
+    headlines are sent to `backend.skim`, and their decisions are stored.
+    When a skim call fails (None) its headlines are all read and nothing
+    is stored.
+    A random `audit_rate` share of new rejections is kept anyway (see
+    skim_articles).
+
+    Returns (indices of headlines to read, number sent to the LLM).
+    """
+    since = (datetime.now() - timedelta(days=ttl_days)).isoformat()
+    decisions = db.get_skim_decisions(
+        source_name, [h["url"] for h in headlines], since
+    )
+    keep: set[int] = set()
+    fresh: list[int] = []
+    for i, h in enumerate(headlines):
+        decision = decisions.get(h["url"])
+        if decision and decision[:2] == (title_hash(h["title"]), SKIM_PROMPT_VERSION):
+            if decision[2]:
+                keep.add(i)
+        else:
+            fresh.append(i)
+
+    for start in range(0, len(fresh), batch_size):
+        batch = fresh[start:start + batch_size]
+        try:
+            picked = backend.skim([headlines[i] for i in batch])
+        except Exception:
+            picked = None
+        # The call failed: read them all, but don't pin that for the TTL
+        remember = picked is not None
+        picked = set(range(len(batch)) if picked is None else picked)
+        for j, i in enumerate(batch):
+            selected = j in picked
+            audited = not selected and random.random() < audit_rate
+            if remember:
+                h = headlines[i]
+                db.save_skim_decision(
+                    Article(
+                        url=h["url"], title=h["title"], source_name=source_name,
+                        summary=h.get("teaser", ""),
+                    ),
+                    selected, audited, audit_rate, backend_name,
+                    title_hash(h["title"]), SKIM_PROMPT_VERSION,
+                )
+            if selected or audited:
+                keep.add(i)
+    return sorted(keep), len(fresh)
+
+
+def _headline_tokens(h: dict) -> int:
+    return estimate_tokens(f"{h['title']} — {h.get('teaser', '')}") + 8
+
+
+def rank_headlines(
+    headlines: list[dict],
+    backend,
+    db: Database,
+    backend_name: str = "",
+    ttl_days: int = SKIM_CACHE_TTL_DAYS,
+    batch_tokens: int = SKIM_BATCH_TOKENS,
+) -> tuple[list[tuple[dict, int]], int]:
+    """Skim headlines from several sites and rank the selected ones.
+
+    Each headline dict carries a `source`. Fresh headlines (see
+    skim_headlines for what is reused) are packed into calls of about
+    `batch_tokens` headline tokens regardless of site, and the LLM gives
+    each selected headline a relevance from 1 to 10.
+
+    Returns ([(headline, relevance)] best first, number sent to the LLM).
+    Relevance 0 means the skim call failed and the headline is unrated.
+    """
+    since = (datetime.now() - timedelta(days=ttl_days)).isoformat()
+    by_source: dict[str, list[dict]] = {}
+    for h in headlines:
+        by_source.setdefault(h["source"], []).append(h)
+
+    ranked: list[tuple[dict, int]] = []
+    fresh: list[dict] = []
+    for source, source_headlines in by_source.items():
+        decisions = db.get_skim_decisions(
+            source, [h["url"] for h in source_headlines], since
+        )
+        for h in source_headlines:
+            decision = decisions.get(h["url"])
+            if decision and decision[:2] == (
+                title_hash(h["title"]), SKIM_RANKED_PROMPT_VERSION
+            ):
+                if decision[2]:
+                    ranked.append((h, decision[3] or 0))
+            else:
+                fresh.append(h)
+
+    batches: list[list[dict]] = []
+    used = 0
+    for h in fresh:
+        cost = _headline_tokens(h)
+        if not batches or used + cost > batch_tokens:
+            batches.append([])
+            used = 0
+        batches[-1].append(h)
+        used += cost
+
+    for batch in batches:
+        try:
+            ratings = backend.skim_ranked(batch)
+        except Exception:
+            ratings = None
+        # The call failed: read them all unrated, but don't store that
+        failed = ratings is None
+        if failed:
+            ratings = dict.fromkeys(range(len(batch)), 0)
+        for i, h in enumerate(batch):
+            relevance = ratings.get(i)
+            if not failed:
+                db.save_skim_decision(
+                    Article(
+                        url=h["url"], title=h["title"], source_name=h["source"],
+                        summary=h.get("teaser", ""),
+                    ),
+                    relevance is not None, backend=backend_name,
+                    title_hash=title_hash(h["title"]),
+                    prompt_version=SKIM_RANKED_PROMPT_VERSION,
+                    relevance=relevance,
+                )
+            if relevance is not None:
+                ranked.append((h, relevance))
+
+    # Stable sort: equal relevance keeps the order headlines were collected
+    ranked.sort(key=lambda pair: pair[1], reverse=True)
+    return ranked, len(fresh)
+
+
+def skim_articles(
+    articles: list[Article],
+    backend,
+    db: Database,
+    backend_name: str = "",
+    audit_rate: float = 0.0,
+    batch_size: int = SKIM_BATCH_SIZE,
+    ttl_days: int = SKIM_CACHE_TTL_DAYS,
+) -> list[Article]:
+    """Return the articles the skim selected, in original order.
+
+    Every decision is recorded in `skim_decisions`. A random `audit_rate`
+    share of rejected articles is kept anyway (audited=1) so their deep
+    scores can be used to estimate skim recall (see Database.get_skim_recall).
+    Headlines decided on an earlier run are not sent to the LLM again
+    (see skim_headlines).
+    """
+    by_source: dict[str, list[Article]] = {}
+    for article in articles:
+        by_source.setdefault(article.source_name, []).append(article)
+
+    keep: set[str] = set()
+    for source, source_articles in by_source.items():
+        indices, _ = skim_headlines(
+            [
+                {
+                    "title": a.title, "teaser": a.summary[:200], "url": a.url,
+                    "source": a.source_name,
+                }
+                for a in source_articles
+            ],
+            backend, db, source,
+            backend_name=backend_name,
+            audit_rate=audit_rate,
+            ttl_days=ttl_days,
+            batch_size=batch_size,
+        )
+        keep.update(source_articles[i].url for i in indices)
+
+    return [a for a in articles if a.url in keep]
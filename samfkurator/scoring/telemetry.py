@@ -0,0 +1,284 @@
+"""Per-call LLM telemetry: latency, tokens, estimated cost and outcome.
+
+Every provider call made through BaseBackend._call (including retries that
+failed) becomes one row in `llm_calls`, tagged with a run ID. `samfkurator
+stats` aggregates the table by backend, kind and source.
+
+Like the response cache, the recorder keeps its own SQLite connection,
+because backends record from the score_many worker threads.
+"""
+
+import random
+import sqlite3
+import statistics
+import threading
+from datetime import datetime, timedelta
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    model TEXT,
+    kind TEXT NOT NULL,
+    source TEXT,
+    latency_ms INTEGER,
+    input_tokens INTEGER DEFAULT 0,
+    output_tokens INTEGER DEFAULT 0,
+    cached_tokens INTEGER DEFAULT 0,
+    cost_usd REAL DEFAULT 0,
+    outcome TEXT NOT NULL,
+    parse_status TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_started ON llm_calls(started_at);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls(run_id);
+"""
+
+# Call outcomes (besides the error classes in scoring/resilience.py)
+OK = "ok"
+# parse_status values
+PARSED = "ok"
+# Parsed after repairing the JSON or coercing values (scoring/repair.py)
+REPAIRED = "repaired"
+# Salvaged, but required fields missing (a follow-up call was made)
+PARTIAL = "partial"
+UNPARSED = "failed"
+
+# USD per million tokens: input, output, cached input. Matched by model-name
+# prefix, longest first; override or extend with ai.prices in config.yaml.
+# List prices when written - check the providers' pages before relying on
+# the totals.
+DEFAULT_PRICES = {
+    "claude-haiku-4-5": {"input": 1.00, "output": 5.00, "cached": 0.10},
+    "claude-sonnet-4": {"input": 3.00, "output": 15.00, "cached": 0.30},
+    "claude-opus-4": {"input": 15.00, "output": 75.00, "cached": 1.50},
+    "gemini-2.0-flash": {"input": 0.10, "output": 0.40, "cached": 0.025},
+    "gemini-2.5-flash": {"input": 0.30, "output": 2.50, "cached": 0.075},
+    "deepseek-chat": {"input": 0.27, "output": 1.10, "cached": 0.07},
+    "deepseek-reasoner": {"input": 0.55, "output": 2.19, "cached": 0.14},
+}
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S-") + f"{random.getrandbits(16):04x}"
+
+
+def price_for(model: str, prices: dict) -> dict | None:
+    for prefix in sorted(prices, key=len, reverse=True):
+        if model.startswith(prefix):
+            return prices[prefix]
+    return None
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    prices: dict | None = None,
+) -> float:
+    """Estimated USD for one call; 0 for unknown (e.g. local) models."""
+    price = price_for(model, DEFAULT_PRICES if prices is None else prices)
+    if price is None:
+        return 0.0
+    uncached = max(0, input_tokens - cached_tokens)
+    return (
+        uncached * price.get("input", 0)
+        + cached_tokens * price.get("cached", price.get("input", 0))
+        + output_tokens * price.get("output", 0)
+    ) / 1_000_000
+
+
+class CallRecorder:
+    """Writes llm_calls rows for one run. Thread-safe."""
+
+    def __init__(
+        self,
+        path: str = "./samfkurator.db",
+        run_id: str | None = None,
+        prices: dict | None = None,
+    ):
+        self.run_id = run_id or new_run_id()
+        self.prices = {**DEFAULT_PRICES, **(prices or {})}
+        self.calls = 0
+        self.cost_usd = 0.0
+        self._lock = threading.Lock()
+        # Row ID of each thread's latest successful call, for set_parse_status
+        self._last = threading.local()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(CREATE_TABLE)
+
+    def record(
+        self,
+        backend: str,
+        model: str,
+        kind: str,
+        latency_ms: int,
+        outcome: str,
+        source: str = "",
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        parse_status: str | None = None,
+        error: str = "",
+    ) -> None:
+        cost = estimate_cost(
+            model, input_tokens, output_tokens, cached_tokens, self.prices
+        )
+        with self._lock:
+            cursor = self.db.execute(
+                """INSERT INTO llm_calls
+                   (run_id, started_at, backend, model, kind, source,
+                    latency_ms, input_tokens, output_tokens, cached_tokens,
+                    cost_usd, outcome, parse_status, error)
+                   VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+                (
+                    self.run_id,
+                    (datetime.now() - timedelta(milliseconds=latency_ms)).isoformat(),
+                    backend, model, kind, source, latency_ms,
+                    input_tokens, output_tokens, cached_tokens, cost,
+                    outcome, parse_status, error[:300],
+                ),
+            )
+            self.db.commit()
+            self.calls += 1
+            self.cost_usd += cost
+        self._last.row = cursor.lastrowid if outcome == OK else None
+
+    def set_parse_status(self, status: str) -> None:
+        """Set parse_status on this thread's latest successful call."""
+        row = getattr(self._last, "row", None)
+        if row is None:
+            return
+        self._last.row = None
+        with self._lock:
+            self.db.execute(
+                "UPDATE llm_calls SET parse_status = ? WHERE id = ?", (status, row)
+            )
+            self.db.commit()
+
+    def summary(self) -> str:
+        return f"{self.calls} kald logget · ca. ${self.cost_usd:.4f} (kørsel {self.run_id})"
+
+    def close(self) -> None:
+        self.db.close()
+
+
+# ── Aggregates for `samfkurator stats` ──────────────────────────────────────
+
+
+def _percentiles(values: list[int]) -> dict:
+    if not values:
+        return {"p50": None, "p90": None, "p99": None}
+    if len(values) == 1:
+        return dict.fromkeys(("p50", "p90", "p99"), values[0])
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": round(cuts[49]), "p90": round(cuts[89]), "p99": round(cuts[98])}
+
+
+def _aggregate(rows: list[tuple]) -> dict:
+    """rows: (latency_ms, input, output, cached, cost, outcome, parse_status)"""
+    ok = [r for r in rows if r[5] == OK]
+    return {
+        "calls": len(rows),
+        "errors": len(rows) - len(ok),
+        "error_rate": round((len(rows) - len(ok)) / len(rows), 3) if rows else None,
+        "parse_failures": sum(1 for r in ok if r[6] == UNPARSED),
+        "repaired": sum(1 for r in ok if r[6] in (REPAIRED, PARTIAL)),
+        "input_tokens": sum(r[1] for r in rows),
+        "output_tokens": sum(r[2] for r in rows),
+        "cached_tokens": sum(r[3] for r in rows),
+        "cost_usd": round(sum(r[4] for r in rows), 4),
+        "latency_ms": _percentiles(sorted(r[0] for r in ok)),
+    }
+
+
+def call_stats(
+    path: str, since: str = "", run_id: str | None = None
+) -> dict:
+    """Totals, percentiles and per-backend/kind/source/run aggregates."""
+    db = sqlite3.connect(path)
+    try:
+        db.executescript(CREATE_TABLE)
+        where, params = "started_at > ?", [since]
+        if run_id:
+            where += " AND run_id = ?"
+            params.append(run_id)
+        rows = db.execute(
+            f"""SELECT backend || ' / ' || COALESCE(model, ''), kind,
+                       COALESCE(NULLIF(source, ''), '(flere/ukendt)'), run_id,
+                       latency_ms, input_tokens, output_tokens, cached_tokens,
+                       cost_usd, outcome, parse_status, started_at
+                FROM llm_calls WHERE {where}""",
+            params,
+        ).fetchall()
+    finally:
+        db.close()
+
+    def group(index: int) -> dict:
+        groups: dict[str, list[tuple]] = {}
+        for r in rows:
+            groups.setdefault(r[index], []).append(r[4:11])
+        return {
+            key: _aggregate(values)
+            for key, values in sorted(groups.items(), key=lambda kv: -len(kv[1]))
+        }
+
+    outcomes: dict[str, int] = {}
+    for r in rows:
+        outcomes[r[9]] = outcomes.get(r[9], 0) + 1
+    runs = {}
+    for r in rows:
+        run = runs.setdefault(r[3], {"first": r[11], "last": r[11], "rows": []})
+        run["first"] = min(run["first"], r[11])
+        run["last"] = max(run["last"], r[11])
+        run["rows"].append(r[4:11])
+    return {
+        "total": _aggregate([r[4:11] for r in rows]),
+        "outcomes": outcomes,
+        "by_backend": group(0),
+        "by_kind": group(1),
+        "by_source": group(2),
+        "runs": {
+            run_id: {"started": run["first"], "ended": run["last"], **_aggregate(run["rows"])}
+            for run_id, run in sorted(runs.items(), reverse=True)
+        },
+    }
+
+
+def kind_history(
+    path: str, backend: str, model: str, since: str = ""
+) -> dict[str, dict]:
+    """Successful calls of one backend/model per kind: count, median
+    latency, mean output tokens and the share of input served from the
+    prompt cache. Used by `samfkurator estimate`."""
+    db = sqlite3.connect(path)
+    try:
+        db.executescript(CREATE_TABLE)
+        rows = db.execute(
+            """SELECT kind, latency_ms, input_tokens, output_tokens, cached_tokens
+               FROM llm_calls
+               WHERE backend = ? AND model = ? AND outcome = ?
+                 AND started_at > ?""",
+            (backend, model, OK, since),
+        ).fetchall()
+    finally:
+        db.close()
+
+    kinds: dict[str, list[tuple]] = {}
+    for kind, *values in rows:
+        kinds.setdefault(kind, []).append(values)
+    history = {}
+    for kind, values in kinds.items():
+        input_tokens = sum(v[1] for v in values)
+        history[kind] = {
+            "calls": len(values),
+            "latency_ms_p50": statistics.median(v[0] for v in values),
+            "output_tokens": sum(v[2] for v in values) / len(values),
+            "cache_share": (
+                sum(v[3] for v in values) / input_tokens if input_tokens else 0.0
+            ),
+        }
+    return history
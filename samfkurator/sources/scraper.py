@@ -154,13 +154,27 @@ def scrape_site(
 
 
 def scrape_all_sources(
-    sources: list[ScrapeSourceConfig], max_per_site: int = 20, delay: float = 2.0
+    sources: list[ScrapeSourceConfig],
+    max_per_site: int = 20,
+    delay: float = 2.0,
+    db=None,
 ) -> list[Article]:
-    """Scrape articles from all configured scrape sources."""
+    """Scrape articles from all configured scrape sources.
+
+    Sources with a Google News sitemap are read from that in one request;
+    the front-page scraper is only used when no sitemap exists. Pass `db`
+    to make sitemap fetches conditional (ETag/Last-Modified).
+    """
+    from samfkurator.sources.sitemap import fetch_sitemap_articles
+
     all_articles: list[Article] = []
 
     for source in sources:
-        articles = scrape_site(source, max_per_site, delay=delay)
+        articles = None
+        if source.use_sitemap:
+            articles = fetch_sitemap_articles(source, max_per_site, db=db)
+        if articles is None:
+            articles = scrape_site(source, max_per_site, delay=delay)
         all_articles.extend(articles)
         if delay > 0:
             time.sleep(delay)
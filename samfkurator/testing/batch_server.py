@@ -0,0 +1,172 @@
+"""Stand-in for an OpenAI-style batch endpoint (/v1/files + /v1/batches).
+
+Accepts a JSONL batch upload, "processes" it after `complete_after`
+seconds and serves an output file with deterministic chat-completion
+answers from samfkurator.testing.responses. Point OpenAIBatchProvider
+(deepseek.batch_base_url) at `<base_url>/v1` to test --batch offline.
+
+Run standalone:  python -m samfkurator.testing.batch_server --port 8802
+"""
+
+import argparse
+import itertools
+import json
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+
+from samfkurator.testing.responses import fake_response
+from samfkurator.testing.server import StubServer
+
+_JSON = {"Content-Type": "application/json"}
+
+
+def _json(status: int, data: dict) -> tuple[int, dict, bytes]:
+    data = {k: v for k, v in data.items() if not k.startswith("_")}
+    return status, _JSON, json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _multipart_file(content_type: str, body: bytes) -> bytes:
+    """Extract the `file` part from a multipart/form-data body."""
+    msg = BytesParser(policy=default_policy).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+    )
+    for part in msg.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    return b""
+
+
+class BatchAPI:
+    """In-memory implementation of the OpenAI files/batches subset we use."""
+
+    def __init__(self, complete_after: float = 0.0):
+        self.complete_after = complete_after
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict] = {}
+        self._ids = itertools.count(1)
+
+    def _run_batch(self, batch: dict):
+        """Produce the output file once the batch is 'done'."""
+        lines = []
+        for line in self.files[batch["input_file_id"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            messages = request["body"]["messages"]
+            system = next(
+                (m["content"] for m in messages if m["role"] == "system"), ""
+            )
+            prompt = messages[-1]["content"]
+            lines.append(json.dumps({
+                "id": f"req_{next(self._ids)}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "object": "chat.completion",
+                        "model": request["body"].get("model", ""),
+                        "choices": [{
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": fake_response(system, prompt),
+                            },
+                            "finish_reason": "stop",
+                        }],
+                    },
+                },
+                "error": None,
+            }, ensure_ascii=False))
+        output_id = f"file-{next(self._ids)}"
+        self.files[output_id] = "\n".join(lines).encode("utf-8")
+        batch.update(
+            status="completed",
+            output_file_id=output_id,
+            completed_at=int(time.time()),
+            request_counts={
+                "total": len(lines), "completed": len(lines), "failed": 0,
+            },
+        )
+
+    def _batch_view(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        if (
+            batch["status"] == "in_progress"
+            and time.monotonic() - batch["_started"] >= self.complete_after
+        ):
+            self._run_batch(batch)
+        return batch
+
+    def __call__(self, method, path, headers, body):
+        path = path.split("?", 1)[0].rstrip("/")
+        if path.startswith("/v1"):
+            path = path[3:]
+
+        if method == "POST" and path == "/files":
+            file_id = f"file-{next(self._ids)}"
+            self.files[file_id] = _multipart_file(
+                headers.get("content-type", ""), body
+            )
+            return _json(200, {
+                "id": file_id, "object": "file", "purpose": "batch",
+                "bytes": len(self.files[file_id]), "filename": "batch.jsonl",
+                "created_at": int(time.time()), "status": "processed",
+            })
+
+        if method == "GET" and path.startswith("/files/") and path.endswith("/content"):
+            file_id = path.split("/")[2]
+            if file_id not in self.files:
+                return _json(404, {"error": {"message": "no such file"}})
+            return 200, {"Content-Type": "application/jsonl"}, self.files[file_id]
+
+        if method == "POST" and path == "/batches":
+            request = json.loads(body or b"{}")
+            batch_id = f"batch_{next(self._ids)}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": request.get("endpoint", "/v1/chat/completions"),
+                "input_file_id": request["input_file_id"],
+                "completion_window": request.get("completion_window", "24h"),
+                "status": "in_progress",
+                "output_file_id": None,
+                "error_file_id": None,
+                "created_at": int(time.time()),
+                "_started": time.monotonic(),
+                "completed_at": None,
+                "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            }
+            return _json(200, self._batch_view(batch_id))
+
+        if method == "GET" and path.startswith("/batches/"):
+            batch_id = path.split("/")[2]
+            if batch_id not in self.batches:
+                return _json(404, {"error": {"message": "no such batch"}})
+            return _json(200, self._batch_view(batch_id))
+
+        return _json(404, {"error": {"message": f"unknown route {path}"}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokal stand-in for batch-API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--complete-after", type=float, default=0.0,
+        help="Sekunder før et batch-job er færdigt",
+    )
+    args = parser.parse_args()
+
+    server = StubServer(
+        BatchAPI(args.complete_after), host=args.host, port=args.port
+    ).start()
+    print(f"{server.base_url}/v1", flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
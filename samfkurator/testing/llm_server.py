@@ -0,0 +1,253 @@
+"""Stand-in for a local Ollama server (/api/generate, /api/tags, /api/ps).
+
+Answers come from samfkurator.testing.responses, so they are deterministic.
+By default calls cost nothing beyond the StubServer's latency. With a
+timing profile (see CPU_PROFILE) the stand-in behaves like Ollama on a
+CPU-only machine:
+
+- the model loads on first use, after `keep_alive` has run out and
+  whenever num_ctx changes
+- at most `num_parallel` requests run at once (OLLAMA_NUM_PARALLEL); on a
+  CPU they share the cores, so more slots help less than linearly
+- each slot keeps the KV cache of its last system prompt, and a request
+  with the same system prompt only evaluates the new tokens
+- prompts longer than num_ctx are counted as truncated
+
+Times are multiplied by `time_scale`, so a benchmark can run a CPU-sized
+workload in a fraction of the real time.
+
+Run standalone:  python -m samfkurator.testing.llm_server --port 11434 --cpu
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from samfkurator.scoring.engine import estimate_tokens
+from samfkurator.testing.responses import fake_response
+from samfkurator.testing.server import StubServer
+
+_JSON = {"Content-Type": "application/json"}
+
+# Roughly llama3:8b (Q4) on an 8-core desktop CPU
+CPU_PROFILE = {
+    "load_seconds": 12.0,
+    "prompt_tokens_per_second": 60.0,
+    "tokens_per_second": 8.0,
+    "parallel_efficiency": 0.4,
+}
+
+_DURATION = re.compile(r"^(-?\d+(?:\.\d+)?)(ms|s|m|h)?$")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def parse_keep_alive(value, default: float) -> float:
+    """Ollama keep_alive ("30m", "1h", 300, -1) in seconds; negative = forever."""
+    if value is None or value == "":
+        return default
+    match = _DURATION.match(str(value).strip())
+    if not match:
+        return default
+    seconds = float(match.group(1)) * _UNITS[match.group(2)]
+    return float("inf") if seconds < 0 else seconds
+
+
+@dataclass
+class OllamaStats:
+    requests: int = 0
+    loads: int = 0
+    load_seconds: float = 0.0
+    prompt_tokens: int = 0
+    prompt_tokens_reused: int = 0
+    output_tokens: int = 0
+    truncated: int = 0
+    busy_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            **self.__dict__,
+            "load_seconds": round(self.load_seconds, 2),
+            "busy_seconds": round(self.busy_seconds, 2),
+        }
+
+
+class OllamaStandIn:
+    """StubServer handler emulating Ollama's model lifecycle and slots.
+
+    Rates of 0 mean "free"; the defaults therefore answer instantly and
+    only the StubServer latency applies.
+    """
+
+    def __init__(
+        self,
+        load_seconds: float = 0.0,
+        prompt_tokens_per_second: float = 0.0,
+        tokens_per_second: float = 0.0,
+        num_parallel: int = 1,
+        parallel_efficiency: float = 1.0,
+        default_keep_alive: float = 300.0,
+        default_num_ctx: int = 2048,
+        prefix_cache: bool = True,
+        time_scale: float = 1.0,
+        noise: dict[str, int] | None = None,
+        answer: Callable[[str, str, str], str] | None = None,
+    ):
+        self.load_seconds = load_seconds
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.tokens_per_second = tokens_per_second
+        self.num_parallel = max(1, num_parallel)
+        self.parallel_efficiency = parallel_efficiency
+        self.default_keep_alive = default_keep_alive
+        self.default_num_ctx = default_num_ctx
+        self.prefix_cache = prefix_cache
+        self.time_scale = time_scale
+        # Score noise per model name, standing in for weaker models
+        # (see testing/responses.py)
+        self.noise = noise or {}
+        # answer(model, system, prompt) replaces the deterministic answers
+        # (provider_server.py replays cassettes through it)
+        self.answer = answer
+        self.stats = OllamaStats()
+        # Loaded model: num_ctx and expiry (monotonic, scaled); None = unloaded
+        self._loaded_ctx: int | None = None
+        self._expires = 0.0
+        # Per slot: system prompt in its KV cache, and whether it is busy
+        self._slots = [{"system": None, "busy": False} for _ in range(self.num_parallel)]
+        # Created on the server's event loop at first use
+        self._semaphore: asyncio.Semaphore | None = None
+        self._load_lock: asyncio.Lock | None = None
+
+    def _seconds(self, tokens: int, rate: float) -> float:
+        return tokens / rate if rate else 0.0
+
+    async def _ensure_loaded(self, num_ctx: int) -> None:
+        async with self._load_lock:
+            now = time.monotonic()
+            if self._loaded_ctx == num_ctx and now < self._expires:
+                return
+            self.stats.loads += 1
+            self.stats.load_seconds += self.load_seconds
+            await asyncio.sleep(self.load_seconds * self.time_scale)
+            self._loaded_ctx = num_ctx
+            self._expires = time.monotonic() + self.default_keep_alive * self.time_scale
+            # A reload starts with empty KV caches
+            for slot in self._slots:
+                slot["system"] = None
+
+    def _touch(self, keep_alive) -> None:
+        seconds = parse_keep_alive(keep_alive, self.default_keep_alive)
+        self._expires = time.monotonic() + seconds * self.time_scale
+        if seconds == 0:
+            self._loaded_ctx = None
+
+    async def _generate(self, request: dict) -> tuple[int, dict, bytes]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.num_parallel)
+            self._load_lock = asyncio.Lock()
+        options = request.get("options") or {}
+        num_ctx = int(options.get("num_ctx") or self.default_num_ctx)
+        system = request.get("system", "")
+        prompt = request.get("prompt", "")
+
+        async with self._semaphore:
+            await self._ensure_loaded(num_ctx)
+            if not prompt:
+                # Empty prompt: load only (Ollama's documented preload call)
+                self._touch(request.get("keep_alive"))
+                return 200, _JSON, json.dumps({
+                    "model": request.get("model", ""), "response": "",
+                    "done": True, "done_reason": "load",
+                }).encode()
+
+            free = [s for s in self._slots if not s["busy"]]
+            slot = next((s for s in free if s["system"] == system), free[0])
+            slot["busy"] = True
+            active = sum(s["busy"] for s in self._slots)
+            try:
+                system_tokens = estimate_tokens(system)
+                total = system_tokens + estimate_tokens(prompt)
+                reused = (
+                    system_tokens
+                    if self.prefix_cache and slot["system"] == system else 0
+                )
+                model = request.get("model", "")
+                answer = (
+                    self.answer(model, system, prompt) if self.answer
+                    else fake_response(system, prompt, self.noise.get(model, 0))
+                )
+                output = estimate_tokens(answer)
+                if options.get("num_predict"):
+                    output = min(output, int(options["num_predict"]))
+                if total + output > num_ctx:
+                    self.stats.truncated += 1
+
+                seconds = (
+                    self._seconds(total - reused, self.prompt_tokens_per_second)
+                    + self._seconds(output, self.tokens_per_second)
+                ) * active ** (1 - self.parallel_efficiency)
+                await asyncio.sleep(seconds * self.time_scale)
+
+                slot["system"] = system
+                self.stats.requests += 1
+                self.stats.prompt_tokens += total - reused
+                self.stats.prompt_tokens_reused += reused
+                self.stats.output_tokens += output
+                self.stats.busy_seconds += seconds
+            finally:
+                slot["busy"] = False
+            self._touch(request.get("keep_alive"))
+
+        return 200, _JSON, json.dumps({
+            "model": request.get("model", ""),
+            "response": answer,
+            "done": True,
+            "done_reason": "stop",
+            # Like Ollama: only tokens evaluated for this call are counted
+            "prompt_eval_count": total - reused,
+            "eval_count": output,
+        }, ensure_ascii=False).encode("utf-8")
+
+    async def __call__(self, method, path, headers, body):
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/api/tags":
+            return 200, _JSON, b'{"models": []}'
+        if path == "/api/ps":
+            loaded = self._loaded_ctx is not None and time.monotonic() < self._expires
+            return 200, _JSON, json.dumps({
+                "models": [{"context_length": self._loaded_ctx}] if loaded else []
+            }).encode()
+        if path == "/api/stand-in/stats":
+            return 200, _JSON, json.dumps(self.stats.as_dict()).encode()
+        if method == "POST" and path == "/api/generate":
+            return await self._generate(json.loads(body or b"{}"))
+        return 404, _JSON, json.dumps({"error": f"unknown route {path}"}).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokal stand-in for Ollama")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--cpu", action="store_true", help="CPU-tidsprofil")
+    parser.add_argument("--num-parallel", type=int, default=1)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    handler = OllamaStandIn(
+        **(CPU_PROFILE if args.cpu else {}),
+        num_parallel=args.num_parallel,
+        time_scale=args.time_scale,
+    )
+    server = StubServer(handler, host=args.host, port=args.port).start()
+    print(server.base_url, flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Corpus of malformed deep-read answers for the repairing parser.
+
+Each case starts from a well-formed answer (built from a stored score, or
+from responses._fake_result) and applies one failure mode seen from the
+backends: output cut off at max_tokens, prose or code fences around the
+JSON, "7/10" scores, trailing commas, discipline scores at the top level,
+Danish discipline names, a missing or invalid primary_discipline, and
+out-of-range scores. Truncation points are drawn from a seeded RNG, so the
+corpus is the same on every run.
+
+Used by scripts/bench_parser.py; see scoring/repair.py.
+"""
+
+import json
+import random
+
+from samfkurator.testing.responses import DISCIPLINES, _fake_result
+
+CATEGORIES = (
+    "valid", "truncated", "fenced_prose", "fraction_scores", "trailing_comma",
+    "flat_disciplines", "danish_names", "bad_primary", "out_of_range",
+    "string_scores",
+)
+
+
+def _dump(answer: dict, indent: int | None = 2) -> str:
+    return json.dumps(answer, ensure_ascii=False, indent=indent)
+
+
+def _mutate(category: str, answer: dict, rng: random.Random) -> str:
+    """The answer broken in the way `category` names."""
+    if category == "valid":
+        return _dump(answer)
+    if category == "truncated":
+        text = _dump(answer)
+        return text[: int(len(text) * rng.uniform(0.05, 0.97))]
+    if category == "fenced_prose":
+        return (
+            "Her er min vurdering af artiklen:\n\n```json\n"
+            + _dump(answer)
+            + "\n```\n\nSig til hvis du vil have uddybet noget."
+        )
+    if category == "fraction_scores":
+        text = _dump(answer)
+        text = text.replace(
+            f'"overall_score": {answer["overall_score"]}',
+            f'"overall_score": {answer["overall_score"]}/10',
+        )
+        for d, score in answer["disciplines"].items():
+            text = text.replace(f'"{d}": {score}', f'"{d}": "{score}/10"')
+        return text
+    if category == "trailing_comma":
+        return _dump(answer).replace('"\n}', '",\n}').replace("\n  }", ",\n  }")
+    if category == "flat_disciplines":
+        flat = {k: v for k, v in answer.items() if k != "disciplines"}
+        return _dump({**answer["disciplines"], **flat})
+    if category == "danish_names":
+        named = dict(answer)
+        named["disciplines"] = {
+            {"okonomi": "Økonomi", "international_politik": "International politik"}
+            .get(d, d.capitalize()): s
+            for d, s in answer["disciplines"].items()
+        }
+        return _dump(named)
+    if category == "bad_primary":
+        broken = dict(answer)
+        if rng.random() < 0.5:
+            broken.pop("primary_discipline")
+        else:
+            broken["primary_discipline"] = "samfundsfag"
+        return _dump(broken)
+    if category == "out_of_range":
+        return _dump(_out_of_range(answer))
+    if category == "string_scores":
+        return _dump(dict(
+            answer,
+            overall_score=str(answer["overall_score"]),
+            disciplines={d: str(s) for d, s in answer["disciplines"].items()},
+        ))
+    raise ValueError(f"unknown category {category}")
+
+
+def _out_of_range(answer: dict) -> dict:
+    return dict(answer, overall_score=answer["overall_score"] + 10)
+
+
+def answer_from_score(row: tuple) -> dict:
+    """A well-formed answer from a scores row
+    (overall, soc, pol, oko, ip, met, primary, explanation, quote, concepts)."""
+    overall, *scores, primary, explanation, quote, concepts = row
+    return {
+        "overall_score": overall,
+        "disciplines": dict(zip(DISCIPLINES, scores)),
+        "primary_discipline": primary,
+        "concepts": [c for c in (concepts or "").split(" · ") if c],
+        "explanation": explanation or "",
+        "quote": quote or "",
+    }
+
+
+def build_corpus(
+    answers: list[dict] | None = None, per_category: int = 50, seed: int = 41
+) -> list[dict]:
+    """[{category, raw, expected}]; expected is the answer before it was
+    broken (scores above 10 are meant to be clamped)."""
+    rng = random.Random(seed)
+    if not answers:
+        answers = [_fake_result(rng.getrandbits(32)) for _ in range(per_category)]
+    corpus = []
+    for category in CATEGORIES:
+        for i in range(per_category):
+            answer = answers[i % len(answers)]
+            corpus.append({
+                "category": category,
+                "raw": _mutate(category, answer, rng),
+                "expected": (
+                    _out_of_range(answer) if category == "out_of_range" else answer
+                ),
+            })
+    return corpus
@@ -0,0 +1,216 @@
+"""Stand-in for news outlets: RSS feeds, front pages, sitemaps and articles.
+
+Serves either recorded pages from a fixtures directory (URL path → file,
+`index.html` for directories) or a deterministic synthetic site:
+
+  /feeds/<n>.xml           RSS feed for source n
+  /kilde<n>/               front page for source n
+  /kilde<n>/<slug>         article page (og:description, published time)
+  /robots.txt              points at /news-sitemap.xml
+  /news-sitemap.xml        Google News sitemap over all articles
+
+Run standalone:  python -m samfkurator.testing.news_site --port 8800
+"""
+
+import argparse
+import mimetypes
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from samfkurator.testing.server import StubServer
+
+_WORDS = (
+    "regeringen folketinget finanslov inflation rente ledighed velfærd "
+    "ulighed skat valg partier EU-Kommissionen NATO globalisering "
+    "klimapolitik forhandlinger kommunerne borgerne eksport konjunktur "
+    "analyse reform undersøgelse minister"
+).split()
+
+_PUBLISHED = datetime(2026, 1, 5, 8, 0)
+
+
+class SyntheticNewsSite:
+    """Deterministic site with `sources` × `articles_per_source` articles."""
+
+    def __init__(
+        self,
+        sources: int = 4,
+        articles_per_source: int = 20,
+        paragraphs: int = 12,
+        seed: int = 1,
+    ):
+        self.sources = sources
+        self.articles_per_source = articles_per_source
+        self.paragraphs = paragraphs
+        self.seed = seed
+        self.base_url = ""
+
+    def _title(self, source: int, n: int) -> str:
+        rnd = random.Random(f"{self.seed}-{source}-{n}")
+        return " ".join(rnd.choice(_WORDS) for _ in range(7)).capitalize()
+
+    def _published(self, source: int, n: int) -> datetime:
+        return _PUBLISHED - timedelta(minutes=37 * n + source)
+
+    def _paragraph(self, rnd: random.Random) -> str:
+        words = [rnd.choice(_WORDS) for _ in range(rnd.randint(40, 90))]
+        return " ".join(words).capitalize() + "."
+
+    def articles(self):
+        for source in range(self.sources):
+            for n in range(self.articles_per_source):
+                yield source, n, f"/kilde{source}/artikel-{n}"
+
+    def feed(self, source: int) -> bytes:
+        items = []
+        for n in range(self.articles_per_source):
+            pub = self._published(source, n).strftime("%a, %d %b %Y %H:%M:%S +0000")
+            items.append(
+                "<item>"
+                f"<title>{escape(self._title(source, n))}</title>"
+                f"<link>{self.base_url}/kilde{source}/artikel-{n}</link>"
+                f"<description>{escape(self._title(source, n + 1000))}</description>"
+                f"<pubDate>{pub}</pubDate>"
+                "</item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Kilde {source}</title><link>{self.base_url}/kilde{source}/</link>"
+            + "".join(items)
+            + "</channel></rss>"
+        ).encode()
+
+    def front_page(self, source: int) -> bytes:
+        links = "".join(
+            f'<article><a href="/kilde{source}/artikel-{n}">'
+            f"{escape(self._title(source, n))}</a>"
+            f"<p>{escape(self._title(source, n + 1000))}</p></article>"
+            for n in range(self.articles_per_source)
+        )
+        nav = "".join(f'<a href="/kilde{i}/">Kilde {i}</a>' for i in range(self.sources))
+        return (
+            f"<html><head><title>Kilde {source}</title></head><body>"
+            f"<nav>{nav}</nav><main>{links}</main></body></html>"
+        ).encode()
+
+    def article(self, source: int, n: int) -> bytes:
+        rnd = random.Random(f"{self.seed}-{source}-{n}-body")
+        title = escape(self._title(source, n))
+        body = "".join(
+            f"<p>{self._paragraph(rnd)}</p>" for _ in range(self.paragraphs)
+        )
+        return (
+            "<html><head>"
+            f"<title>{title}</title>"
+            f'<meta property="og:description" content="{escape(self._title(source, n + 1000))}">'
+            '<meta property="article:published_time" '
+            f'content="{self._published(source, n).strftime("%Y-%m-%dT%H:%M:%SZ")}">'
+            "</head><body><header>Log ind · Abonnement</header>"
+            f"<article><h1>{title}</h1>{body}</article>"
+            "<footer>Kontakt redaktionen</footer></body></html>"
+        ).encode()
+
+    def news_sitemap(self) -> bytes:
+        urls = []
+        for source, n, path in self.articles():
+            pub = self._published(source, n).strftime("%Y-%m-%dT%H:%M:%SZ")
+            urls.append(
+                f"<url><loc>{self.base_url}{path}</loc><news:news>"
+                "<news:publication><news:name>Kilde</news:name>"
+                "<news:language>da</news:language></news:publication>"
+                f"<news:publication_date>{pub}</news:publication_date>"
+                f"<news:title>{escape(self._title(source, n))}</news:title>"
+                "</news:news></url>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+            + "".join(urls)
+            + "</urlset>"
+        ).encode()
+
+    def __call__(self, method, path, headers, body):
+        path = path.split("?", 1)[0]
+        parts = [p for p in path.split("/") if p]
+        html = {"Content-Type": "text/html; charset=utf-8"}
+        xml = {"Content-Type": "application/xml; charset=utf-8"}
+
+        if path == "/robots.txt":
+            return 200, {"Content-Type": "text/plain"}, (
+                f"User-agent: *\nSitemap: {self.base_url}/news-sitemap.xml\n"
+            ).encode()
+        if path == "/news-sitemap.xml":
+            return 200, xml, self.news_sitemap()
+        if len(parts) == 2 and parts[0] == "feeds" and parts[1].endswith(".xml"):
+            source = int(parts[1][:-4])
+            if source < self.sources:
+                return 200, {"Content-Type": "application/rss+xml"}, self.feed(source)
+        if parts and parts[0].startswith("kilde"):
+            source = int(parts[0][5:] or 0)
+            if source < self.sources:
+                if len(parts) == 1:
+                    return 200, html, self.front_page(source)
+                if len(parts) == 2 and parts[1].startswith("artikel-"):
+                    return 200, html, self.article(source, int(parts[1][8:]))
+        return 404, {}, b"not found"
+
+
+class RecordedNewsSite:
+    """Serve recorded pages from a directory (URL path → file)."""
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def __call__(self, method, path, headers, body):
+        rel = path.split("?", 1)[0].lstrip("/")
+        target = (self.root / rel).resolve()
+        if target.is_dir():
+            target = target / "index.html"
+        if self.root not in target.parents or not target.is_file():
+            return 404, {}, b"not found"
+        ctype = mimetypes.guess_type(target.name)[0] or "text/html"
+        return 200, {"Content-Type": ctype}, target.read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokal stand-in for nyhedssider")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--fixtures", help="Mappe med optagede sider")
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        site = RecordedNewsSite(args.fixtures)
+    else:
+        site = SyntheticNewsSite(args.sources, args.articles, seed=args.seed)
+
+    server = StubServer(
+        site,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server.start()
+    site.base_url = server.base_url
+    # First stdout line tells the parent process where we listen
+    print(server.base_url, flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
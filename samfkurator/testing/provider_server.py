@@ -0,0 +1,404 @@
+"""Stand-in for the LLM providers our backends call, in one server.
+
+Implements the subsets the backends use:
+
+  POST /api/generate            Ollama (plus /api/tags, /api/ps), via
+                                llm_server.OllamaStandIn
+  POST /v1/chat/completions     OpenAI chat completions, as DeepSeek
+  POST /chat/completions        serves them (deepseek.base_url = base_url)
+  POST /v1/messages             Anthropic messages (claude.base_url)
+
+Answers are deterministic (testing/responses.py) unless a cassette has a
+recorded one for the same call. Cassettes are JSON files keyed like the
+llm_cache table; `Cassette.from_response_cache` builds one from it, so
+answers recorded from a paid run can be replayed offline.
+
+Each response is delayed by a sampled latency (LatencyModel: fixed,
+uniform, exponential or lognormal around a median, plus time per output
+token). A share of requests is answered with 429 or 500 in the provider's
+own error format, with Retry-After. Token usage is reported the way each
+provider does it, including prompt-cache hits: DeepSeek caches every
+repeated system prompt, Anthropic only blocks marked with cache_control.
+Counters per provider are served at GET /stand-in/stats.
+
+Run standalone:  python -m samfkurator.testing.provider_server --port 8803
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+from samfkurator.scoring.cache import content_hash
+from samfkurator.scoring.engine import estimate_tokens
+from samfkurator.scoring.prompt import deep_read_template, split_deep_read_prompt
+from samfkurator.testing.llm_server import OllamaStandIn
+from samfkurator.testing.responses import fake_response
+from samfkurator.testing.server import StubServer
+
+_JSON = {"Content-Type": "application/json"}
+
+OLLAMA, OPENAI, ANTHROPIC = "ollama", "openai", "anthropic"
+
+
+def _json(status: int, data: dict, headers: dict | None = None):
+    return status, {**_JSON, **(headers or {})}, json.dumps(
+        data, ensure_ascii=False
+    ).encode("utf-8")
+
+
+class Cassette:
+    """Recorded answers keyed like scoring/cache.py: deep reads by (system
+    prompt and template, article text), other calls by (system prompt,
+    prompt)."""
+
+    def __init__(self, entries: dict[str, str] | None = None):
+        self.entries = entries or {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(system: str, prompt: str) -> str:
+        parts = split_deep_read_prompt(prompt)
+        if parts is not None:
+            language, prompt = parts
+            system = f"{system}\n\n{deep_read_template(language)}"
+        return f"{content_hash(system)}:{content_hash(prompt)}"
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["entries"])
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, ensure_ascii=False)
+            f.write("\n")
+
+    @classmethod
+    def from_response_cache(
+        cls, db_path: str, backend: str = "", model: str = ""
+    ) -> "Cassette":
+        """Answers stored by scoring/cache.py, optionally for one backend/model.
+
+        The cache is keyed by the same two hashes, so every recorded call
+        replays under the prompt that produced it. Packed answers are
+        cached per article and only replay for single deep reads.
+        """
+        db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        rows = db.execute(
+            """SELECT prompt_hash, text_hash, raw FROM llm_cache
+               WHERE (? = '' OR backend = ?) AND (? = '' OR model = ?)
+               ORDER BY last_used""",
+            (backend, backend, model, model),
+        ).fetchall()
+        db.close()
+        return cls({f"{p}:{t}": raw for p, t, raw in rows})
+
+    def get(self, system: str, prompt: str) -> str | None:
+        answer = self.entries.get(self.key(system, prompt))
+        if answer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return answer
+
+    def record(self, system: str, prompt: str, answer: str) -> None:
+        self.entries[self.key(system, prompt)] = answer
+
+
+@dataclass
+class LatencyModel:
+    """Seconds before a response: a draw around `median`, plus
+    `per_output_token` for each generated token. `spread` is the lognormal
+    sigma; uniform draws from [0, 2 × median]."""
+
+    distribution: str = "fixed"
+    median: float = 0.0
+    spread: float = 0.5
+    per_output_token: float = 0.0
+
+    def sample(self, rng: random.Random, output_tokens: int = 0) -> float:
+        if self.median <= 0:
+            base = 0.0
+        elif self.distribution == "uniform":
+            base = rng.uniform(0, 2 * self.median)
+        elif self.distribution == "exponential":
+            base = rng.expovariate(math.log(2) / self.median)
+        elif self.distribution == "lognormal":
+            base = rng.lognormvariate(math.log(self.median), self.spread)
+        else:
+            base = self.median
+        return base + self.per_output_token * output_tokens
+
+
+@dataclass
+class ProviderStats:
+    requests: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    latency_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {**self.__dict__, "latency_seconds": round(self.latency_seconds, 3)}
+
+
+_ERRORS = {
+    # status: (Anthropic error type, OpenAI error type, message)
+    429: ("rate_limit_error", "rate_limit_exceeded", "Rate limit reached"),
+    500: ("api_error", "server_error", "Internal server error"),
+}
+
+
+@dataclass
+class ProviderStandIn:
+    """StubServer handler for Ollama, OpenAI and Anthropic requests.
+
+    `rate_limit_rate` and `server_error_rate` are the shares of requests
+    answered with 429 and 500; `retry_after` is sent with both.
+    `noise` is score noise per model name (testing/responses.py). With
+    `record` every answer is added to the cassette, so a run against the
+    deterministic answers can be saved and replayed after they change.
+    """
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    retry_after: float = 0.0
+    cassette: Cassette | None = None
+    record: bool = False
+    noise: dict[str, int] = field(default_factory=dict)
+    seed: int = 1
+    time_scale: float = 1.0
+    ollama: OllamaStandIn | None = None
+
+    def __post_init__(self):
+        self.stats = {p: ProviderStats() for p in (OLLAMA, OPENAI, ANTHROPIC)}
+        self._random = random.Random(self.seed)
+        self._ids = itertools.count(1)
+        # System prompts seen per (provider, model): their prefix cache
+        self._cached: set[tuple[str, str, str]] = set()
+        if self.ollama is None:
+            self.ollama = OllamaStandIn(noise=self.noise)
+        self.ollama.answer = self._answer
+
+    def _answer(self, model: str, system: str, prompt: str) -> str:
+        answer = self.cassette.get(system, prompt) if self.cassette else None
+        if answer is None:
+            answer = fake_response(system, prompt, self.noise.get(model, 0))
+            if self.record and self.cassette is not None:
+                self.cassette.record(system, prompt, answer)
+        return answer
+
+    def _injected(self, provider: str) -> int | None:
+        draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            self.stats[provider].rate_limited += 1
+            return 429
+        if draw < self.rate_limit_rate + self.server_error_rate:
+            self.stats[provider].server_errors += 1
+            return 500
+        return None
+
+    def _error(self, provider: str, status: int):
+        anthropic_type, openai_type, message = _ERRORS[status]
+        headers = {"Retry-After": f"{self.retry_after:g}"}
+        if provider == ANTHROPIC:
+            body = {
+                "type": "error",
+                "error": {"type": anthropic_type, "message": message},
+            }
+        elif provider == OPENAI:
+            body = {"error": {
+                "message": message, "type": openai_type, "code": openai_type,
+            }}
+        else:
+            body = {"error": message}
+        return _json(status, body, headers)
+
+    async def _reply(
+        self, provider: str, model: str, system: str, prompt: str,
+        max_tokens: int, cacheable: bool,
+    ) -> tuple[str, int, int, int]:
+        """(answer, input, cached, output tokens) after the sampled delay."""
+        answer = self._answer(model, system, prompt)
+        output = min(estimate_tokens(answer), max_tokens or 10**9)
+        system_tokens = estimate_tokens(system)
+        key = (provider, model, content_hash(system))
+        cached = system_tokens if cacheable and key in self._cached else 0
+        if cacheable:
+            self._cached.add(key)
+        delay = self.latency.sample(self._random, output)
+        await asyncio.sleep(delay * self.time_scale)
+
+        stats = self.stats[provider]
+        stats.requests += 1
+        stats.input_tokens += system_tokens + estimate_tokens(prompt)
+        stats.cached_tokens += cached
+        stats.output_tokens += output
+        stats.latency_seconds += delay
+        return answer, system_tokens + estimate_tokens(prompt), cached, output
+
+    async def _chat_completions(self, request: dict):
+        messages = request.get("messages") or []
+        system = "".join(m["content"] for m in messages if m["role"] == "system")
+        prompt = next(
+            (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+        )
+        model = request.get("model", "")
+        answer, input_tokens, cached, output = await self._reply(
+            OPENAI, model, system, prompt, request.get("max_tokens") or 0, True
+        )
+        return _json(200, {
+            "id": f"chatcmpl-standin-{next(self._ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output,
+                "total_tokens": input_tokens + output,
+                # DeepSeek's and OpenAI's names for the cached prefix
+                "prompt_cache_hit_tokens": cached,
+                "prompt_cache_miss_tokens": input_tokens - cached,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        })
+
+    async def _messages(self, request: dict):
+        blocks = request.get("system") or ""
+        if isinstance(blocks, str):
+            blocks = [{"type": "text", "text": blocks}]
+        system = "".join(b.get("text", "") for b in blocks)
+        cacheable = any("cache_control" in b for b in blocks)
+        content = (request.get("messages") or [{}])[-1].get("content", "")
+        if isinstance(content, list):
+            content = "".join(b.get("text", "") for b in content)
+        model = request.get("model", "")
+        answer, input_tokens, cached, output = await self._reply(
+            ANTHROPIC, model, system, content, request.get("max_tokens") or 0,
+            cacheable,
+        )
+        # Anthropic splits input into uncached, cache reads and cache writes
+        written = estimate_tokens(system) if cacheable and not cached else 0
+        return _json(200, {
+            "id": f"msg_standin_{next(self._ids)}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": answer}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": input_tokens - cached - written,
+                "cache_read_input_tokens": cached,
+                "cache_creation_input_tokens": written,
+                "output_tokens": output,
+            },
+        })
+
+    def stats_dict(self) -> dict:
+        # Ollama requests and tokens are counted by the Ollama stand-in
+        ollama = self.ollama.stats
+        self.stats[OLLAMA].requests = ollama.requests
+        self.stats[OLLAMA].input_tokens = (
+            ollama.prompt_tokens + ollama.prompt_tokens_reused
+        )
+        self.stats[OLLAMA].cached_tokens = ollama.prompt_tokens_reused
+        self.stats[OLLAMA].output_tokens = ollama.output_tokens
+        return {
+            **{p: s.as_dict() for p, s in self.stats.items()},
+            "cassette": (
+                {"hits": self.cassette.hits, "misses": self.cassette.misses}
+                if self.cassette else None
+            ),
+        }
+
+    async def __call__(self, method, path, headers, body):
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/stand-in/stats":
+            return _json(200, self.stats_dict())
+        if path.startswith("/api/"):
+            if method == "POST" and path == "/api/generate":
+                status = self._injected(OLLAMA)
+                if status:
+                    return self._error(OLLAMA, status)
+                # Output-token time comes from the Ollama stand-in's rates
+                delay = self.latency.sample(self._random)
+                self.stats[OLLAMA].latency_seconds += delay
+                await asyncio.sleep(delay * self.time_scale)
+            return await self.ollama(method, path, headers, body)
+        if method == "POST" and path in ("/v1/chat/completions", "/chat/completions"):
+            status = self._injected(OPENAI)
+            if status:
+                return self._error(OPENAI, status)
+            return await self._chat_completions(json.loads(body or b"{}"))
+        if method == "POST" and path == "/v1/messages":
+            status = self._injected(ANTHROPIC)
+            if status:
+                return self._error(ANTHROPIC, status)
+            return await self._messages(json.loads(body or b"{}"))
+        return _json(404, {"error": f"unknown route {path}"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokal stand-in for LLM-udbydere")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--latency", choices=["fixed", "uniform", "exponential", "lognormal"],
+        default="lognormal",
+    )
+    parser.add_argument("--median", type=float, default=0.0, help="sekunder")
+    parser.add_argument("--per-token", type=float, default=0.0, help="sekunder")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--cassette", help="Afspil optagede svar fra denne fil")
+    parser.add_argument(
+        "--export-cassette", metavar="FIL",
+        help="Skriv en kassette fra llm_cache i --db og afslut",
+    )
+    parser.add_argument("--db", default="./samfkurator.db")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.export_cassette:
+        cassette = Cassette.from_response_cache(args.db)
+        cassette.save(args.export_cassette)
+        print(f"{len(cassette.entries)} svar skrevet til {args.export_cassette}")
+        return
+
+    handler = ProviderStandIn(
+        latency=LatencyModel(
+            args.latency, args.median, per_output_token=args.per_token
+        ),
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        retry_after=args.retry_after,
+        cassette=Cassette.load(args.cassette) if args.cassette else None,
+        seed=args.seed,
+    )
+    server = StubServer(handler, host=args.host, port=args.port).start()
+    print(server.base_url, flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
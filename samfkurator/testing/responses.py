@@ -0,0 +1,106 @@
+"""Deterministic fake LLM answers for the stand-in servers.
+
+The same prompt always gets the same answer, so benchmark and regression
+runs are comparable without paying a provider. A `noise` above 0 stands in
+for a weaker model: the overall score moves by up to that many points,
+again the same way for the same article.
+"""
+
+import hashlib
+import json
+import re
+
+DISCIPLINES = [
+    "sociologi", "politik", "okonomi", "international_politik", "metode",
+]
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+_TITLE = re.compile(r"^Titel: (.*)$", re.MULTILINE)
+
+
+def _fake_result(seed: int) -> dict:
+    overall = 1 + seed % 10
+    primary = DISCIPLINES[(seed >> 4) % len(DISCIPLINES)]
+    scores = {
+        d: overall if d == primary else (seed >> (4 * i + 8)) % (overall + 1)
+        for i, d in enumerate(DISCIPLINES)
+    }
+    return {
+        "overall_score": overall,
+        "disciplines": scores,
+        "primary_discipline": primary,
+        "concepts": ["medianvælgerteorien", "framing", "social arv"][: 1 + seed % 3],
+        "explanation": "Syntetisk vurdering fra stand-in serveren.",
+        "quote": "",
+    }
+
+
+def _noisy(result: dict, seed: int, noise: int) -> dict:
+    if not noise:
+        return result
+    shift = (seed >> 20) % (2 * noise + 1) - noise
+    overall = max(1, min(10, result["overall_score"] + shift))
+    scores = {d: min(s, overall) for d, s in result["disciplines"].items()}
+    scores[result["primary_discipline"]] = overall
+    return dict(result, overall_score=overall, disciplines=scores)
+
+
+def _article_seed(block: str) -> int:
+    # Seed on the title so single and packed prompts score an article alike
+    match = _TITLE.search(block)
+    return _seed(match.group(1) if match else block)
+
+
+def _scored(block: str, noise: int) -> dict:
+    seed = _article_seed(block)
+    return _noisy(_fake_result(seed), _seed(f"noise:{seed}"), noise)
+
+
+def fake_scoring_response(prompt: str, noise: int = 0) -> str:
+    """A valid deep-read JSON answer derived from the prompt text."""
+    return json.dumps(_scored(prompt, noise), ensure_ascii=False)
+
+
+def fake_packed_response(prompt: str, noise: int = 0) -> str:
+    """A packed answer: one result per `### Artikel <id>` block."""
+    parts = re.split(r"^### Artikel (\S+) fra .*$", prompt, flags=re.MULTILINE)
+    results = [
+        dict(id=article_id, **_scored(block, noise))
+        for article_id, block in zip(parts[1::2], parts[2::2])
+    ]
+    return json.dumps({"results": results}, ensure_ascii=False)
+
+
+def fake_skim_response(prompt: str) -> str:
+    """Pick roughly a third of the numbered headlines in a skim prompt."""
+    indices = [
+        int(m.group(1))
+        for m in re.finditer(r"^(\d+): (.+)$", prompt, re.MULTILINE)
+        if _seed(m.group(2)) % 3 == 0
+    ]
+    return json.dumps({"relevant_indices": indices})
+
+
+def fake_ranked_skim_response(prompt: str) -> str:
+    """Rate the same third of headlines a plain skim would pick, 1-10."""
+    ratings = [
+        {"index": int(m.group(1)), "relevance": 1 + _seed(m.group(2)) % 10}
+        for m in re.finditer(r"^(\d+): \[[^\]]*\] (.+)$", prompt, re.MULTILINE)
+        if _seed(m.group(2)) % 3 == 0
+    ]
+    return json.dumps({"ratings": ratings})
+
+
+def fake_response(system: str, prompt: str, noise: int = 0) -> str:
+    """Answer a skim, packed or deep-read prompt, whichever this looks like."""
+    if '"ratings"' in prompt:
+        return fake_ranked_skim_response(prompt)
+    if "relevant_indices" in prompt:
+        return fake_skim_response(prompt)
+    if '"results"' in prompt:
+        return fake_packed_response(prompt, noise)
+    return fake_scoring_response(prompt, noise)
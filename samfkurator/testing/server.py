@@ -0,0 +1,239 @@
+"""Minimal asyncio HTTP/1.1 server for offline benchmarks.
+
+Stands in for news sites and LLM providers so ingestion and scoring can be
+measured without touching the network. Supports keep-alive, configurable
+latency/jitter and error injection, and counts requests and bytes.
+
+Two control endpoints are always available:
+  GET /__stats  → JSON with request/byte/error counters
+  GET /__reset  → zero the counters
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+# handler(method, path, headers, body) -> (status, headers, body)
+Handler = Callable[[str, str, dict, bytes], tuple[int, dict, bytes]]
+
+REASONS = {
+    200: "OK", 304: "Not Modified", 404: "Not Found", 429: "Too Many Requests",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    connections: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    errors_injected: int = 0
+    by_status: dict[int, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "errors_injected": self.errors_injected,
+            "by_status": {str(k): v for k, v in self.by_status.items()},
+        }
+
+
+class StubServer:
+    """HTTP server running its own event loop in a background thread.
+
+    latency/jitter are seconds: each response is delayed by
+    latency + uniform(0, jitter). connect_latency delays the first response
+    on each new connection (a stand-in for the TCP/TLS handshake to a
+    remote API). error_rate is the probability that a request is answered
+    with one of `error_statuses` instead.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        connect_latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: tuple[int, ...] = (500, 503),
+        seed: int | None = None,
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.stats = ServerStats()
+        self._random = random.Random(seed)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(5)
+
+    def serve_forever(self):
+        """Run in the calling thread (for `python -m ...` entry points)."""
+        self._run()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            # Close kept-alive client connections before the loop goes away
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+            self._loop.close()
+
+    # ── Request handling ──────────────────────────────────────────────────────
+
+    async def _handle(self, reader, writer):
+        self.stats.connections += 1
+        try:
+            if self.connect_latency:
+                await asyncio.sleep(self.connect_latency)
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0) or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                if not path.startswith("/__"):
+                    self.stats.bytes_received += len(request_line) + length
+                status, resp_headers, resp_body = await self._respond(
+                    method, path, headers, body
+                )
+                keep_alive = headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Status')}"]
+                resp_headers = {
+                    "Content-Length": str(len(resp_body)),
+                    "Connection": "keep-alive" if keep_alive else "close",
+                    **resp_headers,
+                }
+                head += [f"{k}: {v}" for k, v in resp_headers.items()]
+                payload = ("\r\n".join(head) + "\r\n\r\n").encode() + resp_body
+                writer.write(payload)
+                await writer.drain()
+
+                if path.startswith("/__"):
+                    if not keep_alive:
+                        break
+                    continue
+                self.stats.requests += 1
+                self.stats.bytes_sent += len(payload)
+                self.stats.by_status[status] = (
+                    self.stats.by_status.get(status, 0) + 1
+                )
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down with the connection still kept alive
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, method: str, path: str, headers: dict, body: bytes
+    ) -> tuple[int, dict, bytes]:
+        if path == "/__stats":
+            return 200, {"Content-Type": "application/json"}, json.dumps(
+                self.stats.as_dict()
+            ).encode()
+        if path == "/__reset":
+            self.stats = ServerStats()
+            return 200, {}, b"ok"
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats.errors_injected += 1
+            status = self._random.choice(self.error_statuses)
+            return status, {"Retry-After": "1"}, b"injected error"
+
+        result = self.handler(method, path, headers, body)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+
+def fetch_stats(base_url: str, reset: bool = False) -> dict:
+    """Read (and optionally reset) counters from a running StubServer."""
+    import httpx
+
+    stats = httpx.get(f"{base_url}/__stats", timeout=5).json()
+    if reset:
+        httpx.get(f"{base_url}/__reset", timeout=5)
+    return stats
+
+
+def wait_until_up(base_url: str, timeout: float = 10.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/__stats", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Stub server at {base_url} did not start")
@@ -0,0 +1,92 @@
+"""Start CLI commands in fresh interpreters and record what they import.
+
+Used by scripts/check_importtime.py (which modules a command may load) and
+scripts/bench_coldstart.py (how long a cold start takes). READ_ONLY
+commands run for real against an empty database (DATABASE_PATH); the rest
+need the network, a browser or a server, so for them the CLI and the
+modules the command loads before its first request are imported instead.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+READ_ONLY = {
+    "daily --cached": ["daily", "--cached"],
+    "all --cached": ["all", "--cached"],
+    "stats": ["stats"],
+}
+
+IMPORT_ONLY = {
+    "daily": [
+        "rich.progress",
+        "samfkurator.sources.rss",
+        "samfkurator.sources.extractors",
+        "samfkurator.scoring.skim",
+        "samfkurator.scoring.queue",
+        "samfkurator.output.daily",
+    ],
+    "all": [
+        "rich.progress",
+        "samfkurator.sources.rss",
+        "samfkurator.sources.extractors",
+        "samfkurator.scoring.skim",
+        "samfkurator.scoring.queue",
+        "samfkurator.output.terminal",
+    ],
+    "estimate": [
+        "samfkurator.sources.rss",
+        "samfkurator.scoring.estimate",
+        "samfkurator.scoring.queue",
+        "samfkurator.output.estimate",
+    ],
+    "train-prefilter": ["rich.table", "samfkurator.scoring.prefilter"],
+    "local": ["samfkurator.agent.curator", "samfkurator.output.daily"],
+    "web": ["samfkurator.web.app"],
+}
+
+COMMANDS = [*READ_ONLY, *IMPORT_ONLY]
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from the
+    `-X importtime` lines on stderr."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def start(command: str, db_path: str, importtime: bool = False) -> dict:
+    """Start `command` (a key of READ_ONLY or IMPORT_ONLY) once.
+
+    Returns wall seconds including interpreter startup, the exit code and,
+    with `importtime`, the modules imported (see parse_importtime)."""
+    argv = [sys.executable]
+    if importtime:
+        argv += ["-X", "importtime"]
+    if command in READ_ONLY:
+        argv += ["-m", "samfkurator", *READ_ONLY[command]]
+    else:
+        modules = ["samfkurator.cli", *IMPORT_ONLY[command]]
+        argv += ["-c", "; ".join(f"import {m}" for m in modules)]
+    env = {**os.environ, "DATABASE_PATH": db_path, "COLUMNS": "100"}
+    begin = time.perf_counter()
+    result = subprocess.run(argv, capture_output=True, text=True, env=env)
+    seconds = time.perf_counter() - begin
+    run = {"seconds": seconds, "returncode": result.returncode}
+    if result.returncode:
+        lines = [
+            line for line in result.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        run["error"] = lines[-1] if lines else ""
+    if importtime:
+        run["imports"] = parse_importtime(result.stderr)
+    return run
+
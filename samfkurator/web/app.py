@@ -1,16 +1,39 @@
+"""The web front end: all scored articles and today's must-reads.
+
+Built by create_app(), once per gunicorn worker, or once in the master
+with `--preload`:
+
+  gunicorn "samfkurator.web.app:create_app()" --preload --workers 2
+
+The app reads config.yaml once (again only when the file changes) and
+sets up the schema once. Requests then read through one read-only
+connection per thread, reopened when a sync replaces the database file.
+Nothing is opened before the fork, so `--preload` is safe.
+"""
+
 import os
 import random
+import threading
 from datetime import datetime
 from functools import wraps
 
-from flask import Flask, render_template, request, session, redirect, url_for
-
-from samfkurator.config import load_config
+from flask import (
+    Blueprint,
+    Flask,
+    current_app,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+
+from samfkurator.config import Config, ConfigFile
 from samfkurator.db import Database
 from samfkurator.output.daily import select_daily
+from samfkurator.web.cache import RenderCache
 
-app = Flask(__name__)
-app.secret_key = os.environ.get("FLASK_SECRET_KEY", "skift-denne-noegle")
+bp = Blueprint("web", __name__)
 
 DISCIPLINE_NAMES = {
     "sociologi": "Sociologi",
@@ -21,6 +44,57 @@ DISCIPLINE_NAMES = {
 }
 
 
+
+class WebState:
+    """Per-process state of the app, kept in app.extensions."""
+
+    def __init__(self, config_file: ConfigFile):
+        self.config_file = config_file
+        self._readers = threading.local()
+        self._render_caches: dict[str, RenderCache] = {}
+        self._schema_inode = None
+        self._lock = threading.Lock()
+
+    def config(self) -> Config:
+        return self.config_file.get()
+
+    def ensure_schema(self, db_path: str) -> int | None:
+        """Create or migrate the schema once per database file; returns the
+        file's inode."""
+        try:
+            inode = os.stat(db_path).st_ino
+        except FileNotFoundError:
+            inode = None
+        with self._lock:
+            if inode is None or inode != self._schema_inode:
+                Database(db_path).close()
+                inode = os.stat(db_path).st_ino
+                self._schema_inode = inode
+        return inode
+
+    def reader(self, db_path: str) -> Database:
+        """This thread's read-only connection to `db_path`."""
+        readers = self._readers
+        inode = self.ensure_schema(db_path)
+        db = getattr(readers, "db", None)
+        if db is None or readers.key != (db_path, inode):
+            if db is not None:
+                db.close()
+            readers.db = Database(db_path, read_only=True)
+            readers.key = (db_path, inode)
+        return readers.db
+
+    def render_cache(self, db_path: str) -> RenderCache:
+        cache = self._render_caches.get(db_path)
+        if cache is None:
+            cache = self._render_caches.setdefault(db_path, RenderCache(db_path))
+        return cache
+
+
+def _state() -> WebState:
+    return current_app.extensions["samfkurator"]
+
+
 def _get_password():
     return os.environ.get("FLASK_PASSWORD", "")
 
@@ -29,33 +103,44 @@ def login_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         if _get_password() and not session.get("authenticated"):
-            return redirect(url_for("login", next=request.url))
+            return redirect(url_for(".login", next=request.url))
         return f(*args, **kwargs)
     return decorated
 
 
-@app.route("/login", methods=["GET", "POST"])
+@bp.route("/login", methods=["GET", "POST"])
 def login():
     error = None
     if request.method == "POST":
         if request.form.get("password") == _get_password():
             session["authenticated"] = True
-            return redirect(request.args.get("next") or url_for("index"))
+            return redirect(request.args.get("next") or url_for(".index"))
         error = "Forkert adgangskode"
     return render_template("login.html", error=error)
 
 
-@app.route("/logout")
+@bp.route("/logout")
 def logout():
     session.clear()
-    return redirect(url_for("login"))
+    return redirect(url_for(".login"))
+
 
+def _cached_page(db_path: str, render):
+    """Serve render()'s HTML from the render cache, keyed on the endpoint
+    and its query parameters (see web/cache.py)."""
+    key = (request.endpoint, tuple(sorted(request.args.items(multi=True))))
+    return _state().render_cache(db_path).get(key, render).response(request)
 
-@app.route("/")
+
+@bp.route("/")
 @login_required
 def index():
-    config = load_config()
-    db = Database(config.database.path)
+    config = _state().config()
+    return _cached_page(config.database.path, lambda: _render_index(config))
+
+
+def _render_index(config) -> str:
+    db = _state().reader(config.database.path)
 
     min_score = request.args.get("min_score", 1, type=int)
     discipline = request.args.get("discipline", "")
@@ -71,8 +156,6 @@ def index():
         today_rows = db.get_scored_articles(min_score=5, limit=100)
     must_reads_raw = select_daily(today_rows, config.daily)
 
-    db.close()
-
     must_reads = []
     for row in must_reads_raw:
         title, source_name, url, published, language, score, disc, explanation, soc, pol, oko, ip, met, quote, concepts = row
@@ -127,18 +210,21 @@ def index():
             "soc": soc, "pol": pol, "oko": oko, "ip": ip, "met": met,
         })
 
-    # Shuffle within same-score groups so same-source articles don't cluster
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # Shuffle within same-score groups so same-source articles don't cluster.
+    # Seeded by the last write, so every worker renders the same page (and
+    # ETag) until the data changes
+    rng = random.Random(f"{today}:{os.stat(config.database.path).st_mtime_ns}")
     by_score = {}
     for a in articles:
         by_score.setdefault(a["score"], []).append(a)
     articles = []
     for score in sorted(by_score.keys(), reverse=True):
         group = by_score[score]
-        random.shuffle(group)
+        rng.shuffle(group)
         articles.extend(group)
 
-    today = datetime.now().strftime("%Y-%m-%d")
-
     return render_template(
         "index.html",
         articles=articles,
@@ -154,16 +240,19 @@ def index():
     )
 
 
-@app.route("/must")
+@bp.route("/must")
 @login_required
 def must():
-    config = load_config()
-    db = Database(config.database.path)
+    config = _state().config()
+    return _cached_page(config.database.path, lambda: _render_must(config))
+
+
+def _render_must(config) -> str:
+    db = _state().reader(config.database.path)
     today_rows = db.get_todays_scored_articles(min_score=5)
     if not today_rows:
         today_rows = db.get_scored_articles(min_score=5, limit=100)
     must_reads_raw = select_daily(today_rows, config.daily)
-    db.close()
 
     must_reads = []
     for row in must_reads_raw:
@@ -182,5 +271,24 @@ def must():
     return render_template("must.html", must_reads=must_reads)
 
 
+def create_app(config_path: str | None = None) -> Flask:
+    """The web app, with config and schema loaded (see module docstring)."""
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("FLASK_SECRET_KEY", "skift-denne-noegle")
+    state = WebState(ConfigFile(config_path))
+    state.ensure_schema(state.config().database.path)
+    app.extensions["samfkurator"] = state
+    app.register_blueprint(bp)
+    return app
+
+
+def __getattr__(name: str):
+    # `samfkurator.web.app:app`, as older deployments start it
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def run_server(host: str = "0.0.0.0", port: int = 5000, debug: bool = False):
-    app.run(host=host, port=port, debug=debug)
+    create_app().run(host=host, port=port, debug=debug)
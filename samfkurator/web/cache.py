@@ -0,0 +1,174 @@
+"""Rendered pages kept per process until the database changes.
+
+The pages only change when a run writes new scores, a few times a day, so
+each worker keeps the HTML it rendered keyed on the page and its query
+parameters, and drops everything when the database's watermark moves:
+
+  file state      inode, size and mtime of the database and its -wal
+                  file (a sync replaces the whole file)
+  data_version    PRAGMA data_version on a connection the cache keeps
+                  open, which changes whenever another connection commits
+
+and on the date, since both pages show today's must-reads. Each page is
+served with an ETag and Last-Modified (conditional requests get a 304)
+and compressed once per encoding: gzip, and brotli when the `brotli`
+package is installed.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from pathlib import Path
+
+from flask import Request, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Pages per worker (query parameter combinations across both pages)
+MAX_ENTRIES = 64
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def accepted_encoding(accept_encoding: str) -> str | None:
+    """Best encoding we can produce that the client accepts."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+    for encoding in ("br", "gzip") if brotli else ("gzip",):
+        if offered.get(encoding, 0) > 0:
+            return encoding
+    return None
+
+
+@dataclass
+class Page:
+    body: bytes
+    etag: str
+    last_modified: datetime
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def response(self, request: Request) -> Response:
+        """The page for `request`: 304 when the client's copy is current,
+        otherwise the body, compressed if the client accepts it."""
+        response = Response(mimetype="text/html")
+        response.set_etag(self.etag)
+        response.last_modified = self.last_modified
+        # Behind a login: browsers may keep it but must revalidate
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.add("Accept-Encoding")
+        encoding = (
+            accepted_encoding(request.headers.get("Accept-Encoding", ""))
+            if len(self.body) >= MIN_COMPRESS_BYTES else None
+        )
+        if encoding:
+            if encoding not in self.encoded:
+                self.encoded[encoding] = _compress(self.body, encoding)
+            response.set_data(self.encoded[encoding])
+            response.content_encoding = encoding
+            # Each encoding is its own representation with its own tag
+            response.set_etag(f"{self.etag}-{encoding}")
+        else:
+            response.set_data(self.body)
+        return response.make_conditional(request)
+
+
+class RenderCache:
+    """Rendered pages for one database. Thread-safe."""
+
+    def __init__(self, db_path: str, max_entries: int = MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._pages: OrderedDict[tuple, Page] = OrderedDict()
+        self._watermark = None
+        self._conn = None
+        self._conn_inode = None
+        self._lock = threading.Lock()
+
+    def _file_state(self) -> tuple:
+        state = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                state.append(None)
+                continue
+            state.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(state)
+
+    def _data_version(self, file_state: tuple) -> int:
+        # A replaced file keeps the old inode open; reconnect to the new one
+        inode = file_state[0][0] if file_state[0] else None
+        if self._conn is None or inode != self._conn_inode:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._conn = sqlite3.connect(
+                Path(self.db_path).resolve().as_uri() + "?mode=ro", uri=True,
+                check_same_thread=False,
+            )
+            self._conn_inode = inode
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _last_modified(self, file_state: tuple) -> datetime:
+        """Last write, but no earlier than midnight: the must-reads change
+        with the date too."""
+        mtime = max((s[2] for s in file_state if s), default=0)
+        return max(
+            datetime.fromtimestamp(mtime // 1_000_000_000),
+            datetime.combine(date.today(), time()),
+        )
+
+    def get(self, key: tuple, render) -> Page:
+        """The cached page for `key`, or render() it (a str of HTML) if the
+        database changed since or it isn't cached."""
+        with self._lock:
+            file_state = self._file_state()
+            try:
+                version = self._data_version(file_state)
+            except sqlite3.Error:
+                version = None
+            watermark = ((file_state, version), date.today())
+            if watermark != self._watermark:
+                self._pages.clear()
+                self._watermark = watermark
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                return page
+
+        # Rendered outside the lock; concurrent misses may render twice
+        body = render().encode("utf-8")
+        page = Page(
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            last_modified=self._last_modified(file_state),
+        )
+        with self._lock:
+            if self._watermark == watermark:
+                self._pages[key] = page
+                while len(self._pages) > self.max_entries:
+                    self._pages.popitem(last=False)
+        return page
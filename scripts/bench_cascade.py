@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Escalation rate and agreement of the deep-read cascade.
+
+Scores a fixed sample of stored articles (ORDER BY url; synthetic
+articles if the database has none) twice: with the full model alone, and
+through the cascade (scoring/cascade.py) with validation off. The full
+model's scores are the reference - every article is in the validation
+sample. Reported overall and per primary discipline:
+
+  escalation_rate   share of articles the fast tier passed on
+  agreement         share of kept fast scores whose full score falls in
+                    the same accepted band (below accept_below / above
+                    accept_above)
+  within_one        kept fast scores at most one point from the full score
+  display_agreement articles on the same side of min_score_to_display
+
+plus calls and tokens per tier against the full model alone.
+
+By default both tiers are Ollama stand-ins; the fast one scores with
+`--noise` points of deterministic noise. `--live` uses the configured
+backend and ai.cascade instead (and costs tokens).
+
+Brug: python scripts/bench_cascade.py --sample 200 --noise 2 -o cascade.json
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime
+
+from samfkurator.config import load_config
+from samfkurator.models import Article
+from samfkurator.scoring.cascade import FAST
+from samfkurator.scoring.registry import create_backend, create_cascade
+from samfkurator.testing.llm_server import OllamaStandIn
+from samfkurator.testing.server import StubServer
+
+
+def _load_sample(db_path: str, n: int) -> list[Article]:
+    try:
+        db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        rows = db.execute(
+            """SELECT url, title, source_name, summary, full_text, language
+               FROM articles ORDER BY url LIMIT ?""",
+            (n,),
+        ).fetchall()
+        db.close()
+    except sqlite3.Error:
+        rows = []
+    articles = [
+        Article(
+            url=url, title=title, source_name=source, summary=summary or "",
+            full_text=text, language=language or "da",
+        )
+        for url, title, source, summary, text, language in rows
+    ]
+    articles += [
+        Article(
+            url=f"bench://cascade/{i}", title=f"Syntetisk artikel nr. {i}",
+            source_name="Bench", summary="Regeringen og arbejdsmarkedet " * 20,
+        )
+        for i in range(len(articles), n)
+    ]
+    return articles
+
+
+def _tier_usage(backend) -> dict:
+    usage = backend.usage
+    return {
+        "calls": usage.calls,
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+    }
+
+
+def _score(backend, articles: list[Article]) -> dict:
+    return {a.url: r for a, r in backend.score_many(articles)}
+
+
+def _compare(articles, reference, cascaded, cascade, min_score) -> dict:
+    groups = defaultdict(lambda: defaultdict(int))
+    for article in articles:
+        full, result = reference.get(article.url), cascaded.get(article.url)
+        if full is None or result is None:
+            continue
+        for key in ("all", full.primary_discipline):
+            stats = groups[key]
+            stats["articles"] += 1
+            stats["display_agreement"] += (
+                (result.overall_score >= min_score) == (full.overall_score >= min_score)
+            )
+            if result.tier != FAST:
+                stats["escalated"] += 1
+                continue
+            stats["kept"] += 1
+            band = cascade._accepted_band(result.overall_score, result.primary_discipline)
+            stats["agreement"] += (
+                cascade._accepted_band(full.overall_score, result.primary_discipline)
+                == band
+            )
+            stats["within_one"] += abs(result.overall_score - full.overall_score) <= 1
+
+    def rates(stats: dict) -> dict:
+        n, kept = stats["articles"], stats["kept"]
+        return {
+            "articles": n,
+            "escalation_rate": round(stats["escalated"] / n, 3) if n else None,
+            "agreement": round(stats["agreement"] / kept, 3) if kept else None,
+            "within_one": round(stats["within_one"] / kept, 3) if kept else None,
+            "display_agreement": (
+                round(stats["display_agreement"] / n, 3) if n else None
+            ),
+        }
+
+    total = rates(groups.pop("all", defaultdict(int)))
+    return {
+        "total": total,
+        "by_discipline": {d: rates(s) for d, s in sorted(groups.items())},
+    }
+
+
+def run(ai, articles: list[Article], min_score: int) -> dict:
+    full_only = create_backend(ai.backend, replace(
+        ai, cascade=replace(ai.cascade, enabled=False)
+    ))
+    reference = _score(full_only, articles)
+
+    backend = create_backend(ai.backend, replace(
+        ai, cascade=replace(ai.cascade, enabled=False)
+    ))
+    cascade = create_cascade(
+        replace(ai, cascade=replace(ai.cascade, validation_rate=0.0))
+    )
+    backend.set_cascade(cascade)
+    cascaded = _score(backend, articles)
+
+    return {
+        **_compare(articles, reference, cascaded, cascade, min_score),
+        "decisions": cascade.stats.as_dict(),
+        "usage": {
+            "full_only": _tier_usage(full_only),
+            "cascade_fast": _tier_usage(cascade.fast),
+            "cascade_full": _tier_usage(backend),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Database med artikler (default: config)")
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--noise", type=int, default=2, help="hurtig stand-ins støj")
+    parser.add_argument("--accept-below", type=int)
+    parser.add_argument("--accept-above", type=int)
+    parser.add_argument("--live", action="store_true", help="Brug rigtige backends")
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    config = load_config()
+    ai = config.ai
+    overrides = {
+        k: v for k, v in (
+            ("accept_below", args.accept_below), ("accept_above", args.accept_above)
+        ) if v is not None
+    }
+    ai = replace(ai, cascade=replace(ai.cascade, **overrides))
+    articles = _load_sample(args.db or config.database.path, args.sample)
+    min_score = config.scoring.min_score_to_display
+
+    if args.live:
+        results = run(ai, articles, min_score)
+    else:
+        with StubServer(OllamaStandIn(noise={"fast": args.noise})) as server:
+            ai = replace(
+                ai,
+                backend="ollama",
+                fallback_chain=[],
+                ollama=replace(
+                    ai.ollama, base_url=server.base_url, model="full",
+                    warm_up=False, max_concurrency=4, pack_size=1,
+                ),
+                cascade=replace(ai.cascade, backend="ollama", model="fast"),
+            )
+            results = run(ai, articles, min_score)
+
+    report = {
+        "benchmark": "cascade",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "cascade": {
+            k: v for k, v in vars(ai.cascade).items() if k != "enabled"
+        },
+        **results,
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Cold-start time of every CLI command.
+
+Each command is started `--repeat` times in a fresh interpreter (see
+samfkurator/testing/startup.py: `daily --cached`, `all --cached` and
+`stats` run for real against an empty database, the others import the CLI
+and what the command loads before its first request). Reported per
+command: wall seconds (median and min, interpreter startup included),
+plus from one extra `-X importtime` run the number of modules imported and
+the cumulative import time of samfkurator.cli. A bare `python -c pass` is
+timed the same way as the floor.
+
+Brug: python scripts/bench_coldstart.py --repeat 10 -o coldstart.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from samfkurator.testing.startup import COMMANDS, start
+
+
+def _interpreter(repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        runs.append(time.perf_counter() - begin)
+    return {
+        "command": "python -c pass",
+        "seconds_median": round(statistics.median(runs), 3),
+        "seconds_min": round(min(runs), 3),
+    }
+
+
+def bench(command: str, db_path: str, repeat: int) -> dict:
+    runs = [start(command, db_path) for _ in range(repeat)]
+    seconds = [r["seconds"] for r in runs]
+    traced = start(command, db_path, importtime=True)
+    result = {
+        "command": command,
+        "seconds_median": round(statistics.median(seconds), 3),
+        "seconds_min": round(min(seconds), 3),
+        "modules": len(traced.get("imports", {})),
+        "cli_import_ms": round(
+            traced.get("imports", {}).get("samfkurator.cli", 0) / 1000, 1
+        ),
+    }
+    if traced["returncode"]:
+        result["error"] = traced.get("error", "")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--commands", nargs="+", choices=COMMANDS, default=COMMANDS
+    )
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "start.db")
+        # Create the schema first so no command pays for it
+        start("stats", db_path)
+        runs = [_interpreter(args.repeat)] + [
+            bench(command, db_path, args.repeat) for command in args.commands
+        ]
+
+    report = {
+        "benchmark": "cli_coldstart",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "runs": runs,
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Retrieved curriculum sections vs. the full curriculum in the deep read.
+
+For a fixed sample of stored articles (ORDER BY url) this compares the
+deep-read system prompt with the whole curriculum against the one from
+scoring/curriculum.py at `--sections` sections: system and total input
+tokens per call, how many sections each article gets, how often the
+match falls back to the full curriculum, and how many distinct system
+prompts (provider cache entries) the sample needs.
+
+With `--backend` every article is also scored with both prompts by the
+real backend, and the report shows the score drift of the retrieved
+prompt against the full one: overall, per discipline, primary discipline
+and the display threshold. That run costs tokens; without it only prompt
+statistics are computed.
+
+Brug: python scripts/bench_curriculum.py --sample 50 --sections 2 --backend gemini
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime
+
+from samfkurator.config import load_config
+from samfkurator.models import Article
+from samfkurator.scoring.base import SCORE
+from samfkurator.scoring.curriculum import select_sections, system_for
+from samfkurator.scoring.engine import estimate_tokens
+from samfkurator.scoring.prompt import (
+    CURRICULUM_SECTIONS,
+    DEEP_READ_SYSTEM_PROMPT,
+    build_deep_read_prompt,
+    parse_scoring_response,
+)
+from samfkurator.scoring.repair import DISCIPLINES
+from samfkurator.scoring.salient import (
+    DEFAULT_TEXT_BUDGET,
+    SourceBoilerplate,
+    TextSelector,
+)
+
+
+def _load_sample(db_path: str, n: int) -> list[Article]:
+    db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = db.execute(
+        """SELECT url, title, source_name, summary, full_text, language
+           FROM articles WHERE length(full_text) > 200
+           ORDER BY url LIMIT ?""",
+        (n,),
+    ).fetchall()
+    db.close()
+    return [
+        Article(
+            url=url, title=title, source_name=source, summary=summary or "",
+            full_text=text, language=language or "da",
+        )
+        for url, title, source, summary, text, language in rows
+    ]
+
+
+def _mean(values: list[float]) -> float | None:
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def _prompt_stats(prompts: list[tuple[str, str]]) -> dict:
+    return {
+        "system_tokens_per_call": _mean([estimate_tokens(s) for s, _ in prompts]),
+        "input_tokens_per_call": _mean(
+            [estimate_tokens(s) + estimate_tokens(p) for s, p in prompts]
+        ),
+        "distinct_system_prompts": len({s for s, _ in prompts}),
+    }
+
+
+def _score(backend, article: Article, system: str, prompt: str):
+    try:
+        raw = backend._complete(SCORE, system, prompt)
+    except Exception:
+        return None
+    return parse_scoring_response(raw, article.url, backend.name)
+
+
+def _drift(reference: list, variant: list, min_score: int) -> dict:
+    pairs = [(r, v) for r, v in zip(reference, variant) if r and v]
+    if not pairs:
+        return {"compared": 0}
+    diffs = [abs(r.overall_score - v.overall_score) for r, v in pairs]
+    return {
+        "compared": len(pairs),
+        "mean_abs_diff": _mean(diffs),
+        "within_1": round(sum(d <= 1 for d in diffs) / len(pairs), 3),
+        "mean_signed_diff": _mean(
+            [v.overall_score - r.overall_score for r, v in pairs]
+        ),
+        "primary_agreement": round(
+            sum(r.primary_discipline == v.primary_discipline for r, v in pairs)
+            / len(pairs), 3,
+        ),
+        "display_agreement": round(
+            sum(
+                (r.overall_score >= min_score) == (v.overall_score >= min_score)
+                for r, v in pairs
+            ) / len(pairs), 3,
+        ),
+        "discipline_mean_abs_diff": {
+            d: _mean([
+                abs(getattr(r.disciplines, d) - getattr(v.disciplines, d))
+                for r, v in pairs
+            ])
+            for d in DISCIPLINES
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Database med artikler (default: config)")
+    parser.add_argument("--sample", type=int, default=50)
+    parser.add_argument("--sections", type=int, default=2, help="afsnit i fuld længde")
+    parser.add_argument("--budget", type=int, default=DEFAULT_TEXT_BUDGET)
+    parser.add_argument(
+        "--backend", choices=["ollama", "claude", "gemini", "deepseek"],
+        help="Scor også med rigtig backend (koster tokens)",
+    )
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    config = load_config()
+    db_path = args.db or config.database.path
+    articles = _load_sample(db_path, args.sample)
+    if not articles:
+        sys.exit("Ingen artikler med tekst i databasen")
+
+    selector = TextSelector(SourceBoilerplate(db_path))
+    texts = [selector.scoring_text(a, args.budget) for a in articles]
+    prompts = [
+        build_deep_read_prompt(a.title, t, a.source_name, a.language)
+        for a, t in zip(articles, texts)
+    ]
+    selected = [select_sections(t, args.sections) for t in texts]
+    full = [(DEEP_READ_SYSTEM_PROMPT, p) for p in prompts]
+    retrieved = [(system_for([t], args.sections), p) for t, p in zip(texts, prompts)]
+    full_stats, retrieved_stats = _prompt_stats(full), _prompt_stats(retrieved)
+
+    report = {
+        "benchmark": "curriculum_retrieval",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "articles": len(articles),
+        "full": full_stats,
+        "retrieved": {
+            **retrieved_stats,
+            "sections_per_call": _mean([len(s) for s in selected]),
+            "full_curriculum_fallbacks": sum(
+                len(s) == len(CURRICULUM_SECTIONS) for s in selected
+            ),
+            "sections_chosen": dict(Counter(d for s in selected for d in s)),
+        },
+        "input_tokens_saved_per_call": round(
+            full_stats["input_tokens_per_call"]
+            - retrieved_stats["input_tokens_per_call"], 2
+        ),
+    }
+
+    if args.backend:
+        from samfkurator.scoring.registry import create_backend
+
+        backend = create_backend(args.backend, config.ai)
+        reference = [_score(backend, a, *sp) for a, sp in zip(articles, full)]
+        variant = [_score(backend, a, *sp) for a, sp in zip(articles, retrieved)]
+        report["scores"] = _drift(
+            reference, variant, config.scoring.min_score_to_display
+        )
+        report["tokens_used"] = backend.usage.summary()
+
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""End-to-end scoring throughput against local provider and news stand-ins.
+
+Serves a synthetic news site (testing/news_site.py) and the provider
+stand-in (testing/provider_server.py), then runs the real `daily`
+pipeline - cli._fetch_and_score_with: RSS, skim, text extraction, queue
+and deep scoring - into a fresh database, once per provider and
+concurrency level. Every run gets a new stand-in, so its answers, latency
+draws and injected errors are the same at every level.
+
+Reported per run: articles scored, wall time, articles per second, LLM
+requests, injected 429/500 responses and the tokens the stand-in
+accounted, plus the number of HTTP connections the backend opened.
+
+Brug: python scripts/bench_e2e.py --providers ollama deepseek claude --concurrency 1 4 8 --median 0.3 --rate-limit-rate 0.05
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sqlite3
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime
+
+from rich.console import Console
+
+from samfkurator.cli import _fetch_and_score_with
+from samfkurator.config import SourceConfig, load_config
+from samfkurator.db import Database
+from samfkurator.scoring.registry import close_clients
+from samfkurator.testing.news_site import SyntheticNewsSite
+from samfkurator.testing.provider_server import (
+    Cassette,
+    LatencyModel,
+    ProviderStandIn,
+)
+from samfkurator.testing.server import StubServer
+
+# Backend name -> stand-in provider in the stats
+PROVIDERS = {"ollama": "ollama", "deepseek": "openai", "claude": "anthropic"}
+
+
+def _ai(config, provider: str, base_url: str, concurrency: int, args):
+    ai = config.ai
+    overrides = {
+        "max_concurrency": concurrency,
+        "requests_per_minute": 0,
+        "tokens_per_minute": 0,
+        "pack_size": args.pack_size,
+    }
+    if provider == "ollama":
+        overrides.update(base_url=base_url, warm_up=False)
+    else:
+        overrides["base_url"] = base_url
+    return replace(
+        ai,
+        backend=provider,
+        fallback_chain=[],
+        cascade=replace(ai.cascade, enabled=False),
+        resilience=replace(ai.resilience, base_delay=args.retry_delay),
+        **{provider: replace(getattr(ai, provider), **overrides)},
+    )
+
+
+def run(config, provider: str, concurrency: int, args) -> dict:
+    handler = ProviderStandIn(
+        latency=LatencyModel(
+            args.latency, args.median, per_output_token=args.per_token
+        ),
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        cassette=Cassette.load(args.cassette) if args.cassette else None,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as tmp, StubServer(handler) as server:
+        db_path = os.path.join(tmp, "bench.db")
+        run_config = replace(
+            config,
+            ai=_ai(config, provider, server.base_url, concurrency, args),
+            database=replace(config.database, path=db_path),
+        )
+        db = Database(db_path)
+        cli_args = argparse.Namespace(
+            backend=None, no_fetch=args.no_fetch, no_skim=not args.skim,
+            batch=False, max_tokens=None, max_cost=None, deadline=None,
+        )
+        console = Console(file=io.StringIO())
+        start = time.perf_counter()
+        _fetch_and_score_with(cli_args, run_config, db, console, None)
+        seconds = time.perf_counter() - start
+        db.close()
+        close_clients()
+
+        scored = sqlite3.connect(db_path).execute(
+            "SELECT COUNT(*) FROM scores"
+        ).fetchone()[0]
+        stats = handler.stats_dict()[PROVIDERS[provider]]
+    return {
+        "provider": provider,
+        "concurrency": concurrency,
+        "articles_scored": scored,
+        "seconds": round(seconds, 3),
+        "articles_per_second": round(scored / seconds, 2) if seconds else None,
+        "llm_requests": stats["requests"],
+        "rate_limited": stats["rate_limited"],
+        "server_errors": stats["server_errors"],
+        "input_tokens": stats["input_tokens"],
+        "cached_tokens": stats["cached_tokens"],
+        "output_tokens": stats["output_tokens"],
+        "connections": server.stats.connections,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--providers", nargs="+", choices=list(PROVIDERS),
+        default=["ollama", "deepseek", "claude"],
+    )
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--articles", type=int, default=20, help="pr. kilde")
+    parser.add_argument(
+        "--latency", choices=["fixed", "uniform", "exponential", "lognormal"],
+        default="lognormal",
+    )
+    parser.add_argument("--median", type=float, default=0.2, help="sekunder pr. kald")
+    parser.add_argument("--per-token", type=float, default=0.0, help="sekunder")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-delay", type=float, default=0.1, help="sekunder")
+    parser.add_argument("--pack-size", type=int, default=1)
+    parser.add_argument("--skim", action="store_true", help="Skim overskrifter først")
+    parser.add_argument("--no-fetch", action="store_true", help="Ingen tekstudtræk")
+    parser.add_argument("--cassette", help="Afspil optagede svar fra denne fil")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    # The backends only check that a key is set; the stand-in ignores it
+    os.environ.setdefault("DEEPSEEK_API_KEY", "stand-in")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stand-in")
+    # Newer trafilatura blocks loopback addresses (SSRF protection), which is
+    # exactly where the stand-in lives
+    from trafilatura.settings import DEFAULT_CONFIG
+
+    DEFAULT_CONFIG.set("DEFAULT", "SSRF_PROTECTION", "off")
+
+    config = load_config()
+    site = SyntheticNewsSite(args.sources, args.articles, seed=args.seed)
+    with StubServer(site) as news:
+        site.base_url = news.base_url
+        config = replace(
+            config,
+            sources_danish=[
+                SourceConfig(name=f"Kilde {i}", feeds=[f"{news.base_url}/feeds/{i}.xml"])
+                for i in range(args.sources)
+            ],
+            sources_international=[],
+            scrape_sources=[],
+            agent_sources=[],
+            scraping=replace(
+                config.scraping, max_articles_per_feed=args.articles,
+                request_delay_seconds=0,
+            ),
+            scoring=replace(
+                config.scoring, prefilter=False, llm_cache=False, telemetry=False,
+                budget_tokens=0, budget_cost_usd=0.0, budget_minutes=0, deadline="",
+            ),
+        )
+        runs = [
+            run(config, provider, concurrency, args)
+            for provider in args.providers
+            for concurrency in args.concurrency
+        ]
+
+    report = {
+        "benchmark": "e2e_scoring",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "runs": runs,
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Offline ingestion benchmark against a local news-site stand-in.
+
+Starts samfkurator.testing.news_site in a subprocess (so its memory and CPU
+don't pollute our numbers), then drives the real ingestion code:
+
+  feeds     fetch_all_sources, one call per source
+  scrape    scrape_all_sources with front-page scraping (use_sitemap=False)
+  sitemap   scrape_all_sources via the news sitemap
+  extract   extract_full_text per article
+
+and prints one JSON document with throughput, latency percentiles, bytes
+transferred and peak RSS per stage.
+
+Brug: python scripts/bench_ingest.py --latency 0.05 --jitter 0.05 -o bench.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from samfkurator.config import ScrapeSourceConfig, SourceConfig
+from samfkurator.sources.extractors import extract_full_text
+from samfkurator.sources.rss import fetch_all_sources
+from samfkurator.sources.scraper import scrape_all_sources
+from samfkurator.testing.server import fetch_stats, wait_until_up
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _run_stage(name: str, base_url: str, units: list, fn) -> tuple[dict, list]:
+    """Call fn(unit) for each unit, timing every call."""
+    fetch_stats(base_url, reset=True)
+    rss_before = _peak_rss_kb()
+    latencies = []
+    items = 0
+    outputs = []
+    start = time.perf_counter()
+    for unit in units:
+        t0 = time.perf_counter()
+        result = fn(unit)
+        latencies.append(time.perf_counter() - t0)
+        outputs.extend(result)
+        items += len(result)
+    elapsed = time.perf_counter() - start
+    server = fetch_stats(base_url)
+
+    return {
+        "stage": name,
+        "units": len(units),
+        "items": items,
+        "seconds": round(elapsed, 4),
+        "items_per_second": round(items / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p90": round(_percentile(latencies, 90) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+            "max": round(max(latencies, default=0) * 1000, 2),
+        },
+        "requests": server["requests"],
+        "bytes_transferred": server["bytes_sent"] + server["bytes_received"],
+        "errors_injected": server["errors_injected"],
+        "peak_rss_kb": _peak_rss_kb(),
+        "peak_rss_growth_kb": _peak_rss_kb() - rss_before,
+    }, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="sekunder")
+    parser.add_argument("--jitter", type=float, default=0.02, help="sekunder")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", help="Optagede sider i stedet for syntetiske")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    cmd = [
+        sys.executable, "-m", "samfkurator.testing.news_site",
+        "--sources", str(args.sources), "--articles", str(args.articles),
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate), "--seed", str(args.seed),
+    ]
+    if args.fixtures:
+        cmd += ["--fixtures", args.fixtures]
+    server = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+
+    # Newer trafilatura blocks loopback addresses (SSRF protection), which is
+    # exactly where the stand-in lives
+    from trafilatura.settings import DEFAULT_CONFIG
+
+    DEFAULT_CONFIG.set("DEFAULT", "SSRF_PROTECTION", "off")
+    try:
+        base_url = server.stdout.readline().strip()
+        wait_until_up(base_url)
+
+        feeds = [
+            SourceConfig(name=f"Kilde {i}", feeds=[f"{base_url}/feeds/{i}.xml"])
+            for i in range(args.sources)
+        ]
+        scrape_sources = [
+            ScrapeSourceConfig(
+                name=f"Kilde {i}", urls=[f"{base_url}/kilde{i}/"],
+                paywall=False, use_sitemap=False,
+            )
+            for i in range(args.sources)
+        ]
+        sitemap_sources = [
+            ScrapeSourceConfig(
+                name=f"Kilde {i}", urls=[f"{base_url}/kilde{i}/"], paywall=False,
+            )
+            for i in range(args.sources)
+        ]
+
+        stages = []
+        stage, feed_articles = _run_stage(
+            "feeds", base_url, feeds,
+            lambda s: fetch_all_sources([s], args.articles),
+        )
+        stages.append(stage)
+        stage, _ = _run_stage(
+            "scrape", base_url, scrape_sources,
+            lambda s: scrape_all_sources([s], args.articles, delay=0),
+        )
+        stages.append(stage)
+        stage, _ = _run_stage(
+            "sitemap", base_url, sitemap_sources,
+            lambda s: scrape_all_sources([s], args.articles, delay=0),
+        )
+        stages.append(stage)
+        stage, _ = _run_stage(
+            "extract", base_url, feed_articles,
+            lambda a: [a] if extract_full_text(a, delay=0).full_text else [],
+        )
+        stages.append(stage)
+    finally:
+        server.terminate()
+        server.wait(5)
+
+    report = {
+        "benchmark": "ingest",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "stages": stages,
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Ollama throughput mode vs. the old one-request-at-a-time client.
+
+Scores a fixed sample of stored articles (ORDER BY url) `--runs` times
+with an idle gap between runs, against the Ollama stand-in in
+samfkurator/testing/llm_server.py with a CPU-only timing profile (model
+load, prompt evaluation and generation speed, shared cores across
+parallel slots). Two modes:
+
+  baseline    no keep_alive (server default 5m), num_ctx left at the
+              server default 2048, no warm-up, one request at a time
+  throughput  keep_alive, num_ctx sized to the prompt, warm-up that
+              primes the system prompt, max_concurrency = --num-parallel
+
+All times are reported in stand-in seconds (as they would be on the CPU
+box); the run itself is `--time-scale` times shorter. Reported per mode:
+articles per minute including warm-up, time to the first score of each
+run, model loads, prompt tokens evaluated vs. reused from the slot cache,
+and prompts that did not fit num_ctx (silently truncated by Ollama).
+
+Brug: python scripts/bench_ollama.py --sample 24 --runs 3 --num-parallel 2
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from samfkurator.config import load_config
+from samfkurator.models import Article
+from samfkurator.scoring.ollama_backend import OllamaBackend
+from samfkurator.testing.llm_server import CPU_PROFILE, OllamaStandIn
+from samfkurator.testing.server import StubServer
+
+
+def _load_sample(db_path: str, n: int) -> list[Article]:
+    db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = db.execute(
+        """SELECT url, title, source_name, summary, full_text, language
+           FROM articles WHERE length(full_text) > 200
+           ORDER BY url LIMIT ?""",
+        (n,),
+    ).fetchall()
+    db.close()
+    return [
+        Article(
+            url=url, title=title, source_name=source, summary=summary or "",
+            full_text=text, language=language or "da",
+        )
+        for url, title, source, summary, text, language in rows
+    ]
+
+
+def _make_backend(mode: str, base_url: str, args) -> OllamaBackend:
+    if mode == "baseline":
+        backend = OllamaBackend(
+            base_url, "stand-in", keep_alive=None, num_ctx=2048, warm_up=False
+        )
+        backend.set_limits(1)
+    else:
+        backend = OllamaBackend(base_url, "stand-in", keep_alive=args.keep_alive)
+        backend.set_limits(args.num_parallel)
+    backend.set_packing(1, args.context_window)
+    return backend
+
+
+def _run_mode(mode: str, articles: list[Article], args) -> dict:
+    stand_in = OllamaStandIn(
+        **CPU_PROFILE, num_parallel=args.num_parallel, time_scale=args.time_scale
+    )
+    scale = args.time_scale
+    first_scores, scored, total = [], 0, 0.0
+    with StubServer(stand_in) as server:
+        backend = _make_backend(mode, server.base_url, args)
+        for run in range(args.runs):
+            if run:
+                time.sleep(args.idle * scale)
+            start = time.perf_counter()
+            backend.warm_up()
+            first = None
+            for _, result in backend.score_many(articles):
+                if first is None:
+                    first = time.perf_counter() - start
+                scored += result is not None
+            total += time.perf_counter() - start
+            first_scores.append(round(first / scale, 1))
+
+    stats = stand_in.stats
+    n = len(articles) * args.runs
+    minutes = total / scale / 60
+    return {
+        "mode": mode,
+        "articles": n,
+        "scored": scored,
+        "seconds": round(total / scale, 1),
+        "articles_per_minute": round(n / minutes, 2) if minutes else None,
+        "first_score_seconds_per_run": first_scores,
+        "model_loads": stats.loads,
+        "load_seconds": round(stats.load_seconds, 1),
+        "prompt_tokens_evaluated": stats.prompt_tokens,
+        "prompt_tokens_reused": stats.prompt_tokens_reused,
+        "truncated_prompts": stats.truncated,
+        "num_ctx": backend.num_ctx or backend._ctx,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Database med artikler (default: config)")
+    parser.add_argument("--sample", type=int, default=24)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--idle", type=float, default=900, help="sekunder mellem kørsler"
+    )
+    parser.add_argument("--num-parallel", type=int, default=2)
+    parser.add_argument("--keep-alive", default="30m")
+    parser.add_argument("--context-window", type=int, default=8192)
+    parser.add_argument(
+        "--time-scale", type=float, default=0.002,
+        help="realtid pr. stand-in-sekund (0.002 = 500x hurtigere)",
+    )
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    config = load_config()
+    articles = _load_sample(args.db or config.database.path, args.sample)
+    if not articles:
+        sys.exit("Ingen artikler med tekst i databasen")
+
+    modes = [_run_mode(m, articles, args) for m in ("baseline", "throughput")]
+    base, fast = modes
+    report = {
+        "benchmark": "ollama_throughput",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "cpu_profile": CPU_PROFILE,
+        "modes": modes,
+        "speedup": (
+            round(fast["articles_per_minute"] / base["articles_per_minute"], 2)
+            if base["articles_per_minute"] else None
+        ),
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Packed vs. single-article scoring benchmark.
+
+Scores a fixed sample of stored articles (ORDER BY url, so every run sees
+the same texts) twice: one article per request, then `--pack-size` articles
+per request. Reports articles per minute, tokens per article and LLM calls
+for each mode, plus score agreement between the two on the sample.
+
+By default the LLM is an in-process Ollama stand-in with deterministic
+answers and `--latency` per request, so only the request overhead is
+measured. `--backend claude|gemini|deepseek|ollama` uses the configured
+real backend instead (and costs tokens) - that is the run that tells
+whether packing changes the scores.
+
+Brug: python scripts/bench_packed.py --sample 40 --pack-size 8 -o bench.json
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from samfkurator.config import load_config
+from samfkurator.models import Article
+from samfkurator.scoring.engine import pack_articles
+from samfkurator.testing.llm_server import OllamaStandIn
+from samfkurator.testing.server import StubServer
+
+
+def _load_sample(db_path: str, n: int) -> list[Article]:
+    db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = db.execute(
+        """SELECT url, title, source_name, summary, full_text, language
+           FROM articles WHERE length(full_text) > 200
+           ORDER BY url LIMIT ?""",
+        (n,),
+    ).fetchall()
+    db.close()
+    return [
+        Article(
+            url=url, title=title, source_name=source, summary=summary or "",
+            full_text=text, language=language or "da",
+        )
+        for url, title, source, summary, text, language in rows
+    ]
+
+
+def _make_backend(args, config, base_url: str | None):
+    if base_url:
+        from samfkurator.scoring.ollama_backend import OllamaBackend
+
+        return OllamaBackend(base_url, "stand-in", warm_up=False)
+    from samfkurator.scoring.registry import create_backend
+
+    return create_backend(args.backend, config.ai)
+
+
+def _run_mode(backend, articles: list[Article], pack_size: int, args) -> tuple[dict, dict]:
+    backend.set_limits(args.concurrency)
+    backend.set_packing(pack_size, args.context_window)
+    backend.set_cache(None)
+    backend.__dict__.pop("_usage", None)  # fresh token counters per mode
+
+    results = {}
+    start = time.perf_counter()
+    for article, result in backend.score_many(articles):
+        results[article.url] = result
+    elapsed = time.perf_counter() - start
+
+    usage = backend.usage
+    scored = sum(1 for r in results.values() if r)
+    n = len(articles)
+    return {
+        "pack_size": pack_size,
+        "requests_planned": (
+            len(pack_articles(articles, args.context_window, pack_size))
+            if pack_size > 1 else n
+        ),
+        "llm_calls": usage.calls,
+        "articles": n,
+        "scored": scored,
+        "failed": n - scored,
+        "seconds": round(elapsed, 3),
+        "articles_per_minute": round(n / elapsed * 60, 1) if elapsed else None,
+        "input_tokens_per_article": round(usage.input_tokens / n, 1) if n else None,
+        "output_tokens_per_article": round(usage.output_tokens / n, 1) if n else None,
+    }, results
+
+
+def _agreement(single: dict, packed: dict) -> dict:
+    pairs = [
+        (single[url], packed[url])
+        for url in single
+        if single[url] and packed.get(url)
+    ]
+    if not pairs:
+        return {"compared": 0}
+    diffs = [abs(a.overall_score - b.overall_score) for a, b in pairs]
+    return {
+        "compared": len(pairs),
+        "exact": round(sum(d == 0 for d in diffs) / len(pairs), 3),
+        "within_1": round(sum(d <= 1 for d in diffs) / len(pairs), 3),
+        "mean_abs_diff": round(sum(diffs) / len(pairs), 3),
+        "primary_discipline_match": round(
+            sum(a.primary_discipline == b.primary_discipline for a, b in pairs)
+            / len(pairs), 3,
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Database med artikler (default: config)")
+    parser.add_argument("--sample", type=int, default=40)
+    parser.add_argument("--pack-size", type=int, default=8)
+    parser.add_argument("--context-window", type=int, default=32768)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--backend", choices=["ollama", "claude", "gemini", "deepseek"],
+        help="Rigtig backend fra config i stedet for stand-in",
+    )
+    parser.add_argument("--latency", type=float, default=0.5, help="sekunder")
+    parser.add_argument("--jitter", type=float, default=0.1, help="sekunder")
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    config = load_config()
+    articles = _load_sample(args.db or config.database.path, args.sample)
+    if not articles:
+        sys.exit("Ingen artikler med tekst i databasen")
+
+    server = None
+    if not args.backend:
+        server = StubServer(
+            # No prefix reuse: token counts should reflect what a hosted
+            # API bills, which is what packing is meant to cut
+            OllamaStandIn(num_parallel=max(1, args.concurrency), prefix_cache=False),
+            latency=args.latency, jitter=args.jitter, seed=1,
+        ).start()
+    try:
+        backend = _make_backend(args, config, server.base_url if server else None)
+        single_stats, single = _run_mode(backend, articles, 1, args)
+        packed_stats, packed = _run_mode(backend, articles, args.pack_size, args)
+    finally:
+        if server:
+            server.stop()
+
+    report = {
+        "benchmark": "packed_scoring",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "backend": args.backend or "stand-in",
+        "modes": [single_stats, packed_stats],
+        "agreement": _agreement(single, packed),
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Salvage rate of the repairing deep-read parser vs. the old strict one.
+
+Builds the malformed-answer corpus in samfkurator/testing/malformed.py
+from stored scores (ORDER BY article_url; synthetic answers if the
+database has none) and parses every case with
+
+  strict     the old parser: json.loads after stripping a leading code
+             fence, int() on every score, disciplines required
+  repairing  scoring/prompt.parse_scoring_details
+
+Reported per category and in total: answers parsed, answers that would
+need the follow-up request (salvaged, but required fields missing),
+answers lost, and how many parsed results keep the original overall and
+discipline scores (after clamping to 0-10). The salvage rate is the share
+of answers the strict parser loses that the repairing one recovers
+without a follow-up.
+
+Brug: python scripts/bench_parser.py --answers 60 --per-category 60
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+from datetime import datetime
+
+from samfkurator.config import load_config
+from samfkurator.scoring.prompt import _strip_fences, parse_scoring_details
+from samfkurator.testing.malformed import CATEGORIES, answer_from_score, build_corpus
+
+
+def _load_answers(db_path: str, n: int) -> list[dict]:
+    try:
+        db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        # quote and concepts are missing in databases not yet migrated
+        columns = {r[1] for r in db.execute("PRAGMA table_info(scores)")}
+        optional = ", ".join(
+            c if c in columns else "''" for c in ("quote", "concepts")
+        )
+        rows = db.execute(
+            f"""SELECT overall_score, sociologi, politik, okonomi,
+                       international_politik, metode, primary_discipline,
+                       explanation, {optional}
+                FROM scores ORDER BY article_url LIMIT ?""",
+            (n,),
+        ).fetchall()
+        db.close()
+    except sqlite3.Error:
+        return []
+    return [answer_from_score(row) for row in rows]
+
+
+def _strict(raw: str) -> dict | None:
+    """The parser before scoring/repair.py, reduced to the scores."""
+    try:
+        data = json.loads(_strip_fences(raw))
+        return {
+            "overall_score": int(data["overall_score"]),
+            "disciplines": {
+                d: int(data["disciplines"].get(d, 0))
+                for d in ("sociologi", "politik", "okonomi",
+                          "international_politik", "metode")
+            },
+        }
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def _clamp(value: int) -> int:
+    return max(0, min(10, value))
+
+
+def _faithful(scores: dict, expected: dict) -> bool:
+    return scores["overall_score"] == _clamp(expected["overall_score"]) and all(
+        scores["disciplines"][d] == _clamp(s)
+        for d, s in expected["disciplines"].items()
+    )
+
+
+def _empty() -> dict:
+    return {
+        "cases": 0, "strict_parsed": 0, "strict_faithful": 0,
+        "parsed": 0, "faithful": 0, "needs_followup": 0, "lost": 0,
+        "salvaged_from_strict_failures": 0,
+    }
+
+
+def run(corpus: list[dict]) -> dict:
+    by_category = {c: _empty() for c in CATEGORIES}
+    for case in corpus:
+        stats = by_category[case["category"]]
+        stats["cases"] += 1
+        strict = _strict(case["raw"])
+        if strict:
+            stats["strict_parsed"] += 1
+            stats["strict_faithful"] += _faithful(strict, case["expected"])
+
+        parsed = parse_scoring_details(case["raw"], "bench://x", "bench")
+        if parsed.result:
+            stats["parsed"] += 1
+            result = parsed.result
+            stats["faithful"] += _faithful(
+                {"overall_score": result.overall_score,
+                 "disciplines": vars(result.disciplines)},
+                case["expected"],
+            )
+            stats["salvaged_from_strict_failures"] += strict is None
+        elif parsed.data:
+            stats["needs_followup"] += 1
+        else:
+            stats["lost"] += 1
+
+    total = _empty()
+    for stats in by_category.values():
+        for key, value in stats.items():
+            total[key] += value
+    strict_failures = total["cases"] - total["strict_parsed"]
+    total["salvage_rate"] = (
+        round(total["salvaged_from_strict_failures"] / strict_failures, 3)
+        if strict_failures else None
+    )
+    total["followup_rate"] = round(total["needs_followup"] / total["cases"], 3)
+    return {"total": total, "by_category": by_category}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Database med scores (default: config)")
+    parser.add_argument("--answers", type=int, default=60)
+    parser.add_argument("--per-category", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=41)
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    config = load_config()
+    answers = _load_answers(args.db or config.database.path, args.answers)
+    corpus = build_corpus(answers, args.per_category, args.seed)
+    report = {
+        "benchmark": "parser_salvage",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "answers_from_db": len(answers),
+        **run(corpus),
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
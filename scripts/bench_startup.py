@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Backend startup time and connection reuse, registry vs. private clients.
+
+Startup: for each backend a fresh interpreter builds it through
+scoring/registry.py (dummy API keys, no network) and reports the seconds
+from first import to a ready backend and which provider SDKs got
+imported. For reference the same is timed with every backend module
+imported up front, which is what an eager registry would cost.
+
+Connections: `--instances` Ollama backends (the agent's, the feed
+scorer's, fallbacks) each make `--calls` calls per round against the
+Ollama stand-in, with `--idle` seconds between rounds (the agent pauses
+between sites). The stand-in delays the first answer on every new
+connection by `--connect-latency` seconds, standing in for the TCP/TLS
+handshake to a remote API. Two modes:
+
+  private  each backend builds its own httpx client (the old behaviour;
+           httpx's default 5 s keep-alive expiry)
+  pooled   the registry's shared client with ai.http settings
+
+Brug: python scripts/bench_startup.py --instances 3 --rounds 3 --idle 6
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from samfkurator.config import AIConfig
+from samfkurator.models import Article
+from samfkurator.scoring.ollama_backend import OllamaBackend
+from samfkurator.scoring.registry import (
+    BACKEND_NAMES,
+    close_clients,
+    create_single_backend,
+)
+from samfkurator.testing.llm_server import OllamaStandIn
+from samfkurator.testing.server import StubServer
+
+SDKS = ("anthropic", "openai", "google.genai", "httpx")
+DUMMY_KEYS = ("GEMINI_API_KEY", "DEEPSEEK_API_KEY", "ANTHROPIC_API_KEY")
+
+_STARTUP = """
+import json, sys, time
+t = time.perf_counter()
+if sys.argv[2] == "eager":
+    import samfkurator.scoring.claude_backend, samfkurator.scoring.gemini_backend
+    import samfkurator.scoring.deepseek_backend, samfkurator.scoring.ollama_backend
+from samfkurator.config import AIConfig
+from samfkurator.scoring.registry import create_single_backend
+create_single_backend(sys.argv[1], AIConfig())
+print(json.dumps({
+    "seconds": time.perf_counter() - t,
+    "sdks": [m for m in %r if m in sys.modules],
+}))
+""" % (SDKS,)
+
+
+def _startup(name: str, mode: str, repeat: int) -> dict:
+    env = {**os.environ, **{k: os.environ.get(k) or "bench-dummy" for k in DUMMY_KEYS}}
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP, name, mode],
+            capture_output=True, text=True, env=env, check=True,
+        ).stdout
+        runs.append(json.loads(out))
+    return {
+        "backend": name,
+        "mode": mode,
+        "seconds_min": round(min(r["seconds"] for r in runs), 3),
+        "sdks_imported": runs[0]["sdks"],
+    }
+
+
+def _connections(mode: str, args) -> dict:
+    article = Article(
+        url="bench://startup", title="Folketinget vedtager finanslov",
+        source_name="Bench", full_text="Regeringen og støttepartierne " * 40,
+    )
+    with StubServer(OllamaStandIn(), connect_latency=args.connect_latency) as server:
+        if mode == "private":
+            backends = [
+                OllamaBackend(server.base_url, "stand-in", warm_up=False)
+                for _ in range(args.instances)
+            ]
+        else:
+            close_clients()
+            ai = AIConfig()
+            ai.ollama.base_url = server.base_url
+            ai.ollama.model = "stand-in"
+            ai.ollama.warm_up = False
+            backends = [
+                create_single_backend("ollama", ai) for _ in range(args.instances)
+            ]
+        start = time.perf_counter()
+        calls = 0
+        for round_ in range(args.rounds):
+            if round_:
+                time.sleep(args.idle)
+            for backend in backends:
+                for _ in range(args.calls):
+                    calls += backend.score_article(article) is not None
+        busy = time.perf_counter() - start - args.idle * (args.rounds - 1)
+        connections = server.stats.connections
+    close_clients()
+    return {
+        "mode": mode,
+        "calls_scored": calls,
+        "connections_opened": connections,
+        "seconds_excluding_idle": round(busy, 3),
+        "handshake_seconds": round(connections * args.connect_latency, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--idle", type=float, default=6.0, help="sekunder")
+    parser.add_argument(
+        "--connect-latency", type=float, default=0.15,
+        help="sekunder pr. ny forbindelse (TLS-håndtryk)",
+    )
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "backend_startup",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "startup": [
+            _startup(name, mode, args.repeat)
+            for name in BACKEND_NAMES for mode in ("lazy", "eager")
+        ],
+        "connections": [_connections(m, args) for m in ("private", "pooled")],
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
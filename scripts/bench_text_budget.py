@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Token-budgeted salient text vs. the old fixed 2000-character cut.
+
+For a fixed sample of stored articles (ORDER BY url) this compares the
+deep-read prompt built from `Article.scoring_text` (title + first 2000
+characters) with the one built by scoring/salient.py at `--budget` tokens:
+input tokens per call, curriculum terms kept and paragraphs dropped as
+boilerplate.
+
+With `--backend` every article is also scored three times with the real
+backend - full text (reference), old cut and salient selection - and the
+report shows how far each shortened variant lands from the full-text
+score. That run costs tokens; without it only text statistics are
+computed.
+
+Brug: python scripts/bench_text_budget.py --sample 50 --budget 450
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+from datetime import datetime
+
+from samfkurator.config import load_config
+from samfkurator.models import Article
+from samfkurator.scoring.base import SCORE
+from samfkurator.scoring.engine import estimate_tokens
+from samfkurator.scoring.prompt import (
+    DEEP_READ_SYSTEM_PROMPT,
+    build_deep_read_prompt,
+    parse_scoring_response,
+)
+from samfkurator.scoring.salient import (
+    CURRICULUM_MATCHER,
+    SourceBoilerplate,
+    TextSelector,
+    split_paragraphs,
+)
+
+# Budget for the reference variant: effectively the whole stored text
+FULL_TEXT_BUDGET = 100_000
+
+
+def _load_sample(db_path: str, n: int) -> list[Article]:
+    db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = db.execute(
+        """SELECT url, title, source_name, summary, full_text, language
+           FROM articles WHERE length(full_text) > 2000
+           ORDER BY url LIMIT ?""",
+        (n,),
+    ).fetchall()
+    db.close()
+    return [
+        Article(
+            url=url, title=title, source_name=source, summary=summary or "",
+            full_text=text, language=language or "da",
+        )
+        for url, title, source, summary, text, language in rows
+    ]
+
+
+def _prompt(article: Article, text: str) -> str:
+    return build_deep_read_prompt(
+        article.title, text, article.source_name, article.language
+    )
+
+
+def _mean(values: list[float]) -> float | None:
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def _text_stats(articles: list[Article], texts: list[str]) -> dict:
+    tokens = [
+        estimate_tokens(DEEP_READ_SYSTEM_PROMPT) + estimate_tokens(_prompt(a, t))
+        for a, t in zip(articles, texts)
+    ]
+    return {
+        "input_tokens_per_call": _mean(tokens),
+        "text_tokens_per_call": _mean([estimate_tokens(t) for t in texts]),
+        "curriculum_terms_per_call": _mean(
+            [len(CURRICULUM_MATCHER.findall(t)) for t in texts]
+        ),
+    }
+
+
+def _score(backend, article: Article, text: str):
+    try:
+        raw = backend._complete(SCORE, DEEP_READ_SYSTEM_PROMPT, _prompt(article, text))
+    except Exception:
+        return None
+    return parse_scoring_response(raw, article.url, backend.name)
+
+
+def _agreement(reference: list, variant: list) -> dict:
+    pairs = [(r, v) for r, v in zip(reference, variant) if r and v]
+    if not pairs:
+        return {"compared": 0}
+    diffs = [abs(r.overall_score - v.overall_score) for r, v in pairs]
+    return {
+        "compared": len(pairs),
+        "mean_score": _mean([v.overall_score for _, v in pairs]),
+        "exact": round(sum(d == 0 for d in diffs) / len(pairs), 3),
+        "within_1": round(sum(d <= 1 for d in diffs) / len(pairs), 3),
+        "mean_abs_diff_vs_full": _mean(diffs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Database med artikler (default: config)")
+    parser.add_argument("--sample", type=int, default=50)
+    parser.add_argument("--budget", type=int, default=450, help="tokens artikeltekst")
+    parser.add_argument(
+        "--backend", choices=["ollama", "claude", "gemini", "deepseek"],
+        help="Scor også med rigtig backend (koster tokens)",
+    )
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    config = load_config()
+    db_path = args.db or config.database.path
+    articles = _load_sample(db_path, args.sample)
+    if not articles:
+        sys.exit("Ingen artikler med lang tekst i databasen")
+
+    selector = TextSelector(SourceBoilerplate(db_path))
+    old_texts = [a.scoring_text for a in articles]
+    new_texts = [selector.scoring_text(a, args.budget) for a in articles]
+    paragraphs = sum(len(split_paragraphs(a.full_text)) for a in articles)
+    kept = sum(
+        len(selector.clean(a.full_text, a.source_name, a.url)) for a in articles
+    )
+
+    report = {
+        "benchmark": "text_budget",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "articles": len(articles),
+        "paragraphs": paragraphs,
+        "paragraphs_dropped_as_boilerplate": paragraphs - kept,
+        "fixed_cut": _text_stats(articles, old_texts),
+        "salient": _text_stats(articles, new_texts),
+    }
+
+    if args.backend:
+        from samfkurator.scoring.registry import create_backend
+
+        backend = create_backend(args.backend, config.ai)
+        full_selector = TextSelector(SourceBoilerplate(db_path))
+        reference = [
+            _score(backend, a, full_selector.scoring_text(a, FULL_TEXT_BUDGET))
+            for a in articles
+        ]
+        report["scores"] = {
+            "fixed_cut": _agreement(
+                reference, [_score(backend, a, t) for a, t in zip(articles, old_texts)]
+            ),
+            "salient": _agreement(
+                reference, [_score(backend, a, t) for a, t in zip(articles, new_texts)]
+            ),
+        }
+        report["tokens_used"] = backend.usage.summary()
+
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
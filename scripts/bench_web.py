@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Load test of the web app under gunicorn: requests per second per page.
+
+Starts gunicorn with `--app` (the app factory by default) on a copy of the
+database, then `--clients` threads request each of `--paths` back to back
+for `--duration` seconds. Reported per path: requests per second, latency
+p50/p95, status codes and bytes per response. `--gzip` asks for compressed
+pages, `--conditional` revalidates with the ETag of the first response
+(a browser reload).
+
+Before/after: check the older revision out next to this one and point
+`--source` at it, with the target it used:
+
+  git worktree add /tmp/before <rev>
+  python scripts/bench_web.py --source /tmp/before --app samfkurator.web.app:app
+  python scripts/bench_web.py
+
+Brug: python scripts/bench_web.py --workers 2 --clients 8 --duration 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import httpx
+
+from samfkurator.config import load_config
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(base_url + "/login", timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn svarede ikke på {base_url}")
+
+
+def _client(base_url: str, path: str, stop_at: float, args, out: list):
+    headers = {"Accept-Encoding": "gzip, br" if args.gzip else "identity"}
+    with httpx.Client(base_url=base_url, headers=headers) as client:
+        if args.conditional:
+            etag = client.get(path).headers.get("etag")
+            if etag:
+                client.headers["If-None-Match"] = etag
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            response = client.get(path)
+            size = len(response.content)
+            out.append((time.perf_counter() - start, response.status_code, size))
+
+
+def load(base_url: str, path: str, args) -> dict:
+    results: list[tuple[float, int, int]] = []
+    stop_at = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=_client, args=(base_url, path, stop_at, args, results))
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    latencies = sorted(r[0] for r in results)
+    statuses: dict[str, int] = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "path": path,
+        "requests": len(results),
+        "requests_per_second": round(len(results) / seconds, 1),
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 2),
+        "latency_ms_p95": round(
+            latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2
+        ),
+        "statuses": statuses,
+        "bytes_per_response": round(statistics.mean(r[2] for r in results)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="samfkurator.web.app:create_app()")
+    parser.add_argument("--source", help="Kør koden fra denne checkout")
+    parser.add_argument("--db", help="Database (kopieres; default: config.yaml)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=1, help="pr. worker")
+    parser.add_argument("--preload", action="store_true")
+    parser.add_argument("--paths", nargs="+", default=["/", "/must"])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="sekunder pr. side"
+    )
+    parser.add_argument("--gzip", action="store_true", help="Bed om komprimerede sider")
+    parser.add_argument(
+        "--conditional", action="store_true", help="Genvalider med ETag (304)"
+    )
+    parser.add_argument("-o", "--output", help="Skriv JSON hertil (default: stdout)")
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        shutil.copy(args.db or load_config().database.path, db_path)
+        env = {**os.environ, "DATABASE_PATH": db_path}
+        env.pop("FLASK_PASSWORD", None)
+        if args.source:
+            env["PYTHONPATH"] = os.path.abspath(args.source)
+        command = [
+            sys.executable, "-m", "gunicorn", args.app,
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(args.workers), "--threads", str(args.threads),
+            "--log-level", "warning",
+        ]
+        if args.preload:
+            command.append("--preload")
+        server = subprocess.Popen(command, cwd=args.source or None, env=env)
+        try:
+            _wait_ready(base_url)
+            runs = [load(base_url, path, args) for path in args.paths]
+        finally:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "benchmark": "web_load",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "runs": runs,
+    }
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Startup regression check: modules a CLI command must not import.
+
+Starts each command in UNUSED in a fresh interpreter under
+`python -X importtime` (see samfkurator/testing/startup.py: the read-only
+commands run for real against an empty database, the others only import
+what they load) and fails if it imported a module it has no use for, e.g.
+feedparser or trafilatura for `daily --cached`. With `--max-ms` it also
+fails when importing samfkurator.cli takes longer than that; the limit
+depends on the machine, so it is off by default.
+
+Exit code 0 if every command passes, 1 otherwise.
+
+Brug: python scripts/check_importtime.py --max-ms 150
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from samfkurator.testing.startup import start
+
+# The fetch, extraction and scoring stack
+FETCH = ("feedparser", "trafilatura", "bs4", "rich.progress")
+PROVIDERS = ("httpx", "anthropic", "openai", "google.genai", "playwright")
+
+UNUSED = {
+    "daily --cached": FETCH + PROVIDERS + ("flask",),
+    "all --cached": FETCH + PROVIDERS + ("flask",),
+    "stats": FETCH + PROVIDERS + ("flask",),
+    "web": FETCH + PROVIDERS,
+    "estimate": ("trafilatura", "rich.progress") + PROVIDERS + ("flask",),
+}
+
+
+def check(command: str, db_path: str, max_ms: float) -> list[str]:
+    """Problems found for `command`, empty if it passes."""
+    run = start(command, db_path, importtime=True)
+    if run["returncode"]:
+        return [f"afsluttede med {run['returncode']}: {run.get('error', '')}"]
+    imports = run["imports"]
+    problems = [
+        f"importerer {module}" for module in UNUSED[command] if module in imports
+    ]
+    cli_ms = imports.get("samfkurator.cli", 0) / 1000
+    if max_ms and cli_ms > max_ms:
+        problems.append(f"samfkurator.cli tager {cli_ms:.0f} ms (> {max_ms:.0f})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commands", nargs="+", choices=list(UNUSED), default=list(UNUSED)
+    )
+    parser.add_argument(
+        "--max-ms", type=float, default=0.0,
+        help="Grænse for import af samfkurator.cli i ms (default: ingen)",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "start.db")
+        for command in args.commands:
+            problems = check(command, db_path, args.max_ms)
+            failed = failed or bool(problems)
+            status = "FEJL" if problems else "ok"
+            print(f"{status:4}  {command}" + "".join(f"\n      {p}" for p in problems))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
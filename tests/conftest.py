@@ -0,0 +1,30 @@
+"""Shared fixtures: a fresh database and the stand-in servers from
+samfkurator/testing, so no test touches the network or a paid API."""
+
+import pytest
+
+from samfkurator.db import Database
+from samfkurator.testing.batch_server import BatchAPI
+from samfkurator.testing.provider_server import ProviderStandIn
+from samfkurator.testing.server import StubServer
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "test.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def provider_server():
+    """Deterministic LLM answers (testing/responses.py), no errors."""
+    with StubServer(ProviderStandIn()) as server:
+        yield server
+
+
+@pytest.fixture
+def batch_server():
+    """An OpenAI-style batch endpoint whose jobs finish at once."""
+    with StubServer(BatchAPI()) as server:
+        yield server
@@ -0,0 +1,117 @@
+import json
+
+from samfkurator.models import Article
+from samfkurator.scoring.batch import (
+    DONE,
+    PENDING,
+    OpenAIBatchProvider,
+    _custom_id,
+    collect_batches,
+    submit_batch,
+)
+from samfkurator.testing.responses import fake_scoring_response
+
+ANSWER = {
+    "overall_score": 0,
+    "disciplines": {"sociologi": 0, "politik": 0, "okonomi": 0,
+                    "international_politik": 0, "metode": 0},
+    "primary_discipline": "politik",
+    "explanation": "",
+}
+
+
+def _articles(n: int) -> list[Article]:
+    return [
+        Article(
+            url=f"https://example.dk/{i}", title=f"Artikel nummer {i}",
+            source_name="DR Nyheder", summary=f"Resumé af artikel {i}.",
+        )
+        for i in range(n)
+    ]
+
+
+def _scores(db) -> dict[str, int]:
+    return dict(db.db.execute("SELECT article_url, overall_score FROM scores"))
+
+
+class FakeProvider:
+    """Answers each position with overall_score = position + 1, in
+    reverse order, so only the custom_id can tie answers to articles."""
+
+    def __init__(self, status=DONE, skip=(), garbage=()):
+        self.status = status
+        self.skip = set(skip)
+        self.garbage = set(garbage)
+        self.submitted: dict[str, int] = {}
+
+    def submit(self, articles):
+        self.submitted["job"] = len(articles)
+        return "job"
+
+    def poll(self, job_id):
+        return self.status
+
+    def results(self, job_id):
+        out = {}
+        for position in reversed(range(self.submitted[job_id])):
+            if position in self.skip:
+                continue
+            answer = dict(ANSWER, overall_score=position + 1)
+            out[_custom_id(position)] = (
+                "ikke json" if position in self.garbage else json.dumps(answer)
+            )
+        return out
+
+
+def test_results_are_matched_by_custom_id(db):
+    articles = _articles(6)
+    provider = FakeProvider(skip={2}, garbage={4})
+    submit_batch(db, provider, "claude", articles)
+
+    stats = collect_batches(db, provider, "claude")
+
+    assert stats == {"jobs": 1, "scored": 4, "dropped": 0, "failed": 2, "pending": 0}
+    assert _scores(db) == {
+        articles[i].url: i + 1 for i in (0, 1, 3, 5)
+    }
+    # The job is closed
+    assert collect_batches(db, provider, "claude")["jobs"] == 0
+
+
+def test_results_below_min_score_are_dropped(db):
+    articles = _articles(4)
+    provider = FakeProvider()
+    submit_batch(db, provider, "claude", articles, min_score=3)
+
+    stats = collect_batches(db, provider, "claude")
+
+    assert stats["scored"] == 2 and stats["dropped"] == 2
+    assert set(_scores(db)) == {articles[2].url, articles[3].url}
+    assert not db.has_article(articles[0].url)
+
+
+def test_pending_job_is_left_open(db):
+    provider = FakeProvider(status=PENDING)
+    submit_batch(db, provider, "claude", _articles(2))
+    assert collect_batches(db, provider, "claude")["pending"] == 1
+    assert _scores(db) == {}
+    assert db.is_batch_pending("https://example.dk/0")
+
+
+def test_openai_batch_round_trip(db, monkeypatch, batch_server):
+    """Submit and collect through the stand-in batch endpoint."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    provider = OpenAIBatchProvider("deepseek-chat", batch_server.base_url + "/v1")
+    articles = _articles(5)
+
+    assert submit_batch(db, provider, "deepseek", articles)
+    stats = collect_batches(db, provider, "deepseek")
+
+    assert stats["jobs"] == 1 and stats["scored"] == 5
+    # Each article got the answer to its own prompt
+    assert _scores(db) == {
+        a.url: json.loads(
+            fake_scoring_response(provider._deep_read_prompt(a))
+        )["overall_score"]
+        for a in articles
+    }
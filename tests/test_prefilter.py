@@ -0,0 +1,108 @@
+import pytest
+
+from samfkurator.models import Article, DisciplineScore, ScoringResult
+from samfkurator.scoring.prefilter import (
+    MIN_PER_CLASS,
+    Example,
+    Prefilter,
+    audited,
+    evaluate,
+    filter_articles,
+    train,
+)
+
+RELEVANT = [
+    "Folketinget vedtager ny lov om dagpenge",
+    "Regeringen og oppositionen strides om skattelettelser",
+    "Ny måling: vælgerne flytter fra regeringspartierne",
+    "Inflationen stiger, Nationalbanken hæver renten",
+    "Ulighed i uddannelse følger social arv",
+    "EU-topmøde om sanktioner mod Rusland",
+]
+IRRELEVANT = [
+    "FCK vinder derbyet efter straffespark",
+    "Sådan får du den perfekte sprøde svær",
+    "Kendt skuespiller viser nyt hus frem",
+    "Vejret: sol og op til 25 grader i weekenden",
+    "Ny smartphone testet: batteriet holder længe",
+    "Landsholdet klar til kamp i Parken",
+]
+
+
+def _examples(titles: list[str], label: int) -> list[Example]:
+    return [Example(t, "", "Kilde", label) for t in titles]
+
+
+@pytest.fixture
+def model() -> Prefilter:
+    model = Prefilter(target_recall=1.0)
+    model.fit(_examples(RELEVANT, 1) + _examples(IRRELEVANT, 0), epochs=30)
+    return model
+
+
+def test_calibrate_keeps_target_recall(model):
+    examples = _examples(RELEVANT, 1) + _examples(IRRELEVANT, 0)
+    report = model.calibrate(examples)
+    assert report["recall"] == 1.0
+    assert report == evaluate(model, examples)
+    # The highest such threshold: the least likely relevant example
+    lowest = min(
+        model._proba(model.vector(ex.title, ex.summary, ex.source))
+        for ex in examples if ex.label
+    )
+    assert model.threshold == lowest
+
+
+def test_calibrate_lower_recall_raises_threshold(model):
+    examples = _examples(RELEVANT, 1) + _examples(IRRELEVANT, 0)
+    model.calibrate(examples)
+    full = model.threshold
+    model.target_recall = 0.5
+    report = model.calibrate(examples)
+    assert model.threshold >= full
+    assert report["recall"] >= 0.5
+
+
+def test_calibrate_without_positives_leaves_threshold(model):
+    model.threshold = 0.42
+    with pytest.raises(ValueError, match="Ikke kalibreret"):
+        model.calibrate(_examples(IRRELEVANT, 0))
+    assert model.threshold == 0.42
+
+
+def _scored(db, i: int, title: str, score: int):
+    url = f"https://example.dk/{i}"
+    db.save_article(Article(url=url, title=title, source_name="Kilde"))
+    db.save_score(ScoringResult(
+        article_url=url, overall_score=score, disciplines=DisciplineScore(),
+        primary_discipline="politik", explanation="",
+    ))
+
+
+def test_train_refuses_when_held_out_has_no_positives(db):
+    # Scored oldest first: every relevant article before the newest 20%
+    for i in range(MIN_PER_CLASS * 2):
+        _scored(db, i, RELEVANT[i % len(RELEVANT)], 8)
+    for i in range(MIN_PER_CLASS * 2, MIN_PER_CLASS * 5):
+        _scored(db, i, IRRELEVANT[i % len(IRRELEVANT)], 1)
+    with pytest.raises(ValueError, match="Ikke kalibreret"):
+        train(db, min_score=5, skim_negatives=False)
+
+
+def test_audit_is_decided_by_url():
+    urls = [f"https://example.dk/{i}" for i in range(5000)]
+    picked = [u for u in urls if audited(u, 0.1)]
+    assert 0.07 < len(picked) / len(urls) < 0.13
+    assert picked == [u for u in urls if audited(u, 0.1)]
+    assert not any(audited(u, 0.0) for u in urls)
+
+
+def test_filter_articles_keeps_passes_and_the_same_audit(model):
+    model.threshold = 0.5
+    articles = [
+        Article(url=f"https://example.dk/{i}", title=t, source_name="Kilde")
+        for i, t in enumerate(RELEVANT + IRRELEVANT)
+    ]
+    first = filter_articles(articles, model, audit_rate=0.3)
+    assert filter_articles(articles, model, audit_rate=0.3) == first
+    assert all(a in first for a in articles if model.passes(a))
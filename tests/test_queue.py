@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from samfkurator.config import DailyConfig
+from samfkurator.models import Article, DisciplineScore, ScoringResult
+from samfkurator.scoring.queue import (
+    DEFAULT_HIT_RATE,
+    PRIOR_STRENGTH,
+    RECENCY_FLOOR,
+    prioritize,
+    recency,
+    skim_factor,
+    source_priors,
+)
+
+NOW = datetime(2026, 3, 2, 12, 0)
+# Neither language is short of articles, so no boost applies
+NO_MIX = DailyConfig(min_danish=0, min_international=0)
+
+
+def _scored(db, url: str, source: str, score: int):
+    db.save_article(Article(url=url, title=url, source_name=source))
+    db.save_score(ScoringResult(
+        article_url=url, overall_score=score, disciplines=DisciplineScore(),
+        primary_discipline="politik", explanation="",
+    ))
+
+
+def _queued(db, url: str, source: str, hours_old: float, relevance=None):
+    article = Article(
+        url=url, title=url, source_name=source,
+        published=NOW - timedelta(hours=hours_old),
+    )
+    db.save_article(article)
+    if relevance is not None:
+        db.save_skim_decision(article, True, relevance=relevance)
+    db.enqueue([url])
+
+
+def test_source_priors_are_smoothed_toward_the_overall_rate():
+    priors, base = source_priors({"a": (3, 3), "b": (0, 7)})
+    assert base == 0.3
+    assert priors["a"] == (3 + PRIOR_STRENGTH * base) / (3 + PRIOR_STRENGTH)
+    assert priors["b"] < base < priors["a"] < 1
+    assert source_priors({}) == ({}, DEFAULT_HIT_RATE)
+
+
+def test_recency_halves_and_has_a_floor():
+    enqueued = NOW.isoformat()
+    assert recency(NOW.isoformat(), enqueued, NOW) == 1.0
+    day_old = (NOW - timedelta(hours=24)).isoformat()
+    assert recency(day_old, enqueued, NOW) == 0.5
+    month_old = (NOW - timedelta(days=30)).isoformat()
+    assert recency(month_old, enqueued, NOW) == RECENCY_FLOOR
+    # No usable publication date: time since queueing
+    assert recency("i går", day_old, NOW) == 0.5
+
+
+def test_skim_factor():
+    assert skim_factor(1, 0, 9) == 0.9
+    assert skim_factor(1, 0, None) > skim_factor(0, 1, None)
+
+
+def test_prioritize_ranks_and_stores_priorities(db):
+    for i in range(5):
+        _scored(db, f"https://good.dk/{i}", "God", 8)
+        _scored(db, f"https://weak.dk/{i}", "Svag", 2)
+    _queued(db, "https://good.dk/new", "God", hours_old=1, relevance=8)
+    _queued(db, "https://weak.dk/new", "Svag", hours_old=1, relevance=8)
+    _queued(db, "https://good.dk/old", "God", hours_old=72, relevance=8)
+    _queued(db, "https://good.dk/dull", "God", hours_old=1, relevance=2)
+
+    ranked = prioritize(db, min_score=5, daily=NO_MIX, now=NOW)
+
+    # Better source, then the skim's relevance, then three days of age
+    assert [a.url for a, _ in ranked] == [
+        "https://good.dk/new",
+        "https://weak.dk/new",
+        "https://good.dk/dull",
+        "https://good.dk/old",
+    ]
+    # Stored, so the queue reads back best first
+    assert [row[0] for row in db.get_queue()] == [a.url for a, _ in ranked]
+
+
+def test_prioritize_boosts_the_language_short_of_articles(db):
+    _queued(db, "https://dr.dk/a", "DR Nyheder", hours_old=1, relevance=5)
+    _queued(db, "https://bbc.co.uk/a", "BBC", hours_old=1, relevance=5)
+    daily = DailyConfig(min_danish=0, min_international=3)
+
+    ranked = prioritize(db, min_score=5, daily=daily, now=NOW)
+
+    assert ranked[0][0].url == "https://bbc.co.uk/a"
+    assert ranked[0][1] > ranked[1][1]
@@ -0,0 +1,82 @@
+import pytest
+
+from samfkurator.scoring.repair import DISCIPLINES, coerce_score, normalize_scoring
+
+
+@pytest.mark.parametrize("value, expected", [
+    (7, 7),
+    (7.6, 8),
+    ("7", 7),
+    ("7/10", 7),
+    ("4/5", 8),
+    ("8 af 10", 8),
+    ("6,5", 6),
+    (12, 10),
+    (-3, 0),
+    ("ingen", None),
+    (True, None),
+    (None, None),
+])
+def test_coerce_score(value, expected):
+    assert coerce_score(value) == expected
+
+
+def test_valid_answer_is_unchanged():
+    data = {
+        "overall_score": 7,
+        "disciplines": {d: 3 for d in DISCIPLINES},
+        "primary_discipline": "politik",
+        "concepts": ["magt", "framing"],
+        "explanation": "Om magt.",
+        "quote": "Citat.",
+    }
+    fields, missing, changed = normalize_scoring(data)
+    assert missing == []
+    assert not changed
+    assert fields["overall_score"] == 7
+    assert fields["concepts"] == "magt · framing"
+
+
+def test_scores_are_coerced_and_names_normalised():
+    data = {
+        "score": "8/10",
+        "disciplines": {"Økonomi": "6", "International": 9, "politik": 4},
+    }
+    fields, missing, changed = normalize_scoring(data)
+    assert missing == []
+    assert changed
+    assert fields["overall_score"] == 8
+    assert fields["disciplines"] == {
+        "sociologi": 0, "politik": 4, "okonomi": 6,
+        "international_politik": 9, "metode": 0,
+    }
+    # Unknown primary_discipline is derived from the highest score
+    assert fields["primary_discipline"] == "international_politik"
+
+
+def test_disciplines_at_top_level():
+    fields, missing, _ = normalize_scoring(
+        {"overall_score": 5, "sociologi": 5, "metode": 2}
+    )
+    assert missing == []
+    assert fields["disciplines"]["sociologi"] == 5
+    assert fields["primary_discipline"] == "sociologi"
+
+
+def test_truncated_answer_with_partial_disciplines_is_missing_them():
+    data = {"overall_score": 6, "disciplines": {"sociologi": 4, "politik": 6}}
+    fields, missing, _ = normalize_scoring(data, truncated=True)
+    assert missing == ["disciplines"]
+    assert fields["overall_score"] == 6
+    # Not truncated: the left-out disciplines score 0
+    _, missing, _ = normalize_scoring(data)
+    assert missing == []
+
+
+def test_missing_overall_score():
+    _, missing, _ = normalize_scoring({"disciplines": {"politik": 5}})
+    assert missing == ["overall_score"]
+
+
+def test_not_an_object():
+    assert normalize_scoring([1, 2]) == ({}, ["overall_score", "disciplines"], True)
@@ -0,0 +1,138 @@
+import pytest
+
+from samfkurator.models import Article
+from samfkurator.scoring.deepseek_backend import DeepSeekBackend
+from samfkurator.scoring.resilience import (
+    CLOSED,
+    FATAL,
+    OPEN,
+    RATE_LIMIT,
+    TRANSIENT,
+    UNUSABLE,
+    BackendHealth,
+    BackendUnavailable,
+    CircuitBreaker,
+    RetryPolicy,
+    call_with_retries,
+    classify,
+)
+from samfkurator.testing.server import StubServer
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+
+def _failing(*errors):
+    """fn() that raises `errors` in turn, then returns "ok"."""
+    errors = list(errors)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return fn, calls
+
+
+@pytest.mark.parametrize("status, kind", [
+    (400, FATAL),
+    (422, FATAL),
+    (401, UNUSABLE),
+    (403, UNUSABLE),
+    (404, UNUSABLE),
+    (429, RATE_LIMIT),
+    (500, TRANSIENT),
+    (503, TRANSIENT),
+    (529, TRANSIENT),
+])
+def test_classify_status(status, kind):
+    assert classify(StatusError(status))[0] == kind
+
+
+def test_classify_without_status():
+    assert classify(TimeoutError())[0] == TRANSIENT
+    assert classify(ValueError("bad json"))[0] == FATAL
+
+
+def test_transient_errors_are_retried():
+    fn, calls = _failing(StatusError(503), StatusError(500))
+    health = BackendHealth()
+    assert call_with_retries(fn, NO_WAIT, CircuitBreaker(), health) == "ok"
+    assert len(calls) == 3
+    assert health.retries == 2 and health.successes == 1
+
+
+def test_retries_exhausted_raise_backend_unavailable():
+    fn, calls = _failing(*[StatusError(429)] * 3)
+    with pytest.raises(BackendUnavailable):
+        call_with_retries(fn, NO_WAIT, CircuitBreaker(), BackendHealth())
+    assert len(calls) == 3
+
+
+def test_bad_request_propagates_and_keeps_breaker_closed():
+    fn, calls = _failing(StatusError(400))
+    breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(StatusError):
+        call_with_retries(fn, NO_WAIT, breaker, BackendHealth())
+    assert len(calls) == 1
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.parametrize("status", [401, 403, 404])
+def test_unusable_backend_opens_breaker_without_retrying(status):
+    fn, calls = _failing(StatusError(status))
+    breaker = CircuitBreaker(failure_threshold=5)
+    health = BackendHealth()
+    with pytest.raises(BackendUnavailable):
+        call_with_retries(fn, NO_WAIT, breaker, health)
+    assert len(calls) == 1
+    assert breaker.state == OPEN
+    assert health.unusable_errors == 1
+    # Later calls fail fast
+    with pytest.raises(BackendUnavailable):
+        call_with_retries(fn, NO_WAIT, breaker, health)
+    assert len(calls) == 1 and health.short_circuited == 1
+
+
+def test_breaker_opens_after_threshold_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    # reset_timeout passed: one trial call at a time
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_rejected_key_falls_back(monkeypatch, provider_server):
+    """A primary answering 401 hands the article to its fallback."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    with StubServer(
+        lambda *_: (200, {}, b""), error_rate=1.0, error_statuses=(401,)
+    ) as revoked:
+        primary = DeepSeekBackend(base_url=revoked.base_url + "/v1")
+        fallback = DeepSeekBackend(base_url=provider_server.base_url + "/v1")
+        primary.set_resilience(NO_WAIT, CircuitBreaker(), fallback)
+        fallback.set_resilience(NO_WAIT, CircuitBreaker())
+
+        article = Article(
+            url="https://example.dk/a", title="Folketinget vedtager ny lov",
+            source_name="DR Nyheder", summary="Et flertal i Folketinget ...",
+        )
+        result = primary.score_article(article)
+
+    assert result is not None and result.article_url == article.url
+    assert primary.breaker.state == OPEN
+    assert primary.health.fallbacks == 1
+    assert revoked.stats.requests == 1